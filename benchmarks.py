@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the simulation, AI and rendering hot paths.
+
+Measures movement ticks per second (update_with_collision_check), AI
+decision latency (ai_move) by policy, snake length and board size, the
+cost of a whole AI tick with and without a shared food distance field,
+arena ticks with hundreds of snakes, food spawning cost on crowded boards,
+the cost of one MCTS simulation, transposition table lookups and
+NeonRenderer frames per second to an offscreen surface. Results are
+compared against a stored baseline so a regression shows up as a number
+instead of a feeling.
+
+Each benchmark is timed several times and the fastest run is kept, which
+filters out scheduler noise; compare baselines from the same machine only.
+
+Usage:
+    python benchmarks.py                  # run and compare with the baseline
+    python benchmarks.py --save           # run and store a new baseline
+    python benchmarks.py --only ai_move   # run a subset by name prefix
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, List, Tuple
+
+from snake_engine import Board, ComputerSnakeLogic, FoodLogic, GameState, SnakeLogic
+from snake_ai import (POLICIES, FloodFillPolicy, FoodDistanceField, TranspositionTable,
+                      hamiltonian_cycle, step_direction)
+from snake_arena import Arena
+from snake_mcts import MCTS_ITERATIONS, MCTSPolicy
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'benchmark_baseline.json')
+DEFAULT_TOLERANCE = 0.15  # Fractional slowdown reported as a regression
+
+# name -> (value, unit, higher is better)
+Result = Tuple[float, str, bool]
+
+
+def best_of(fn: Callable[[], None], repeat: int) -> float:
+    """
+    Time a callable several times.
+
+    Args:
+        fn: Work to time
+        repeat: Number of runs
+
+    Returns:
+        Fastest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def coiled_snake(snake: SnakeLogic, n: int, length: int) -> List[int]:
+    """
+    Lay a snake of the given length along the board's Hamiltonian cycle on
+    a fresh n x n board, so the body is valid and has no gaps.
+
+    Args:
+        snake: Snake to place; it is attached to the new board
+        n: Board size
+        length: Body length in cells
+
+    Returns:
+        The cycle (flat cell indices), with the head at cycle[length - 1]
+    """
+    cycle = hamiltonian_cycle(n)
+    board = Board(n)
+    snake.attach(board, 1)
+    board.vacate(snake.get_head_position(), 1)
+    body = [cycle[i] for i in range(length - 1, -1, -1)]
+    snake.positions = deque((c % n, c // n) for c in body)
+    snake.length = length
+    for c in body:
+        board.occupy_index(c, 1)
+    snake.direction = step_direction(body[1], body[0], n)
+    return list(cycle)
+
+
+def bench_move(n: int, ticks: int, repeat: int) -> Result:
+    """Ticks per second of one long snake circling the Hamiltonian cycle."""
+    snake = SnakeLogic()
+    cycle = coiled_snake(snake, n, len(hamiltonian_cycle(n)) // 2)
+    steer = [None] * (n * n)
+    for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+        steer[a] = step_direction(a, b, n)
+
+    def run():
+        move = snake.update_with_collision_check
+        others = [snake]
+        for _ in range(ticks):
+            x, y = snake.positions[0]
+            snake.direction = steer[y * n + x]
+            if not move(others):
+                raise RuntimeError('benchmark snake collided')
+
+    return ticks / best_of(run, repeat), 'ticks/s', True
+
+
+def bench_ai_move(policy: str, n: int, length: int, calls: int, repeat: int) -> Result:
+    """Microseconds per ai_move decision, with the food moved between calls."""
+    snake = ComputerSnakeLogic(policy=POLICIES[policy]())
+    coiled_snake(snake, n, length)
+    board = snake.board
+    rng = random.Random(0)
+    foods = [board.random_free_cell(rng) for _ in range(calls)]
+    snakes = [snake]
+    direction = snake.direction
+
+    def run():
+        for food in foods:
+            snake.direction = direction
+            snake.ai_move(food, snakes)
+
+    return best_of(run, repeat) / calls * 1e6, 'us/call', False
+
+
+def bench_ai_tick(shared: bool, snakes: int, n: int, ticks: int, repeat: int) -> Result:
+    """
+    Microseconds per AI tick (every snake's decision) of flood-fill snakes
+    competing for food, with or without a shared FoodDistanceField.
+    """
+    def run():
+        game = GameState(seed=0, grid_count=n)
+        field = FoodDistanceField() if shared else None
+        rng = random.Random(0)
+        for _ in range(snakes):
+            start = (rng.randrange(2, n - 2), rng.randrange(2, n - 2))
+            game.add_snake(ComputerSnakeLogic(start, policy=FloodFillPolicy(field=field)))
+        game.spawn_food()
+        ais = game.snakes
+        for _ in range(ticks):
+            food = game.food.position
+            if field is not None:
+                field.update(game.board, food, ais)
+            for snake in ais:
+                snake.ai_move(food, ais)
+            for dead in game.move_simultaneous(ais):
+                game.reset_snake(dead)
+            game.check_food()
+
+    # Movement is included in the time; it is small next to the decisions
+    return best_of(run, repeat) / ticks * 1e6, 'us/tick', False
+
+
+def bench_arena(snakes: int, n: int, ticks: int, repeat: int) -> Result:
+    """Microseconds per arena tick, after a warm-up that lets the snakes grow."""
+    arena = Arena(snakes, snakes // 5, n, seed=0)
+    for _ in range(200):
+        arena.step()
+
+    def run():
+        step = arena.step
+        for _ in range(ticks):
+            step()
+
+    return best_of(run, repeat) / ticks * 1e6, 'us/tick', False
+
+
+def bench_food(n: int, fill: float, calls: int, repeat: int) -> Result:
+    """Nanoseconds per randomize_position on a board with the given fill ratio."""
+    board = Board(n)
+    rng = random.Random(0)
+    size = n * n
+    for i in rng.sample(range(size), int(size * fill)):
+        board.occupy_index(i, 1)
+    food = FoodLogic(rng)
+    food.board = board
+
+    def run():
+        place = food.randomize_position
+        for _ in range(calls):
+            place()
+
+    return best_of(run, repeat) / calls * 1e9, 'ns/call', False
+
+
+def bench_mcts(n: int, length: int, calls: int, repeat: int) -> Result:
+    """
+    Microseconds per MCTS simulation, with a fixed simulation count per
+    decision so the figure tracks how many fit in the time budget.
+    """
+    policy = MCTSPolicy(budget=None, iterations=MCTS_ITERATIONS, seed=0)
+    snake = ComputerSnakeLogic(policy=policy)
+    coiled_snake(snake, n, length)
+    rng = random.Random(0)
+    foods = [snake.board.random_free_cell(rng) for _ in range(calls)]
+    snakes = [snake]
+    direction = snake.direction
+
+    def run():
+        for food in foods:
+            snake.direction = direction
+            snake.ai_move(food, snakes)
+
+    return best_of(run, repeat) / (calls * MCTS_ITERATIONS) * 1e6, 'us/sim', False
+
+
+def bench_tt(bits: int, keys: int, calls: int, repeat: int) -> Result:
+    """Nanoseconds per probe plus store on a table smaller than the key set."""
+    table = TranspositionTable(bits)
+    rng = random.Random(0)
+    pool = [rng.getrandbits(64) for _ in range(keys)]
+    stream = [(pool[rng.randrange(keys)], rng.randrange(8)) for _ in range(calls)]
+
+    def run():
+        probe = table.probe
+        store = table.store
+        for key, depth in stream:
+            if probe(key, depth) is None:
+                store(key, 0.5, depth)
+
+    return best_of(run, repeat) / calls * 1e9, 'ns/call', False
+
+
+def bench_neon(frames: int, repeat: int) -> Result:
+    """Frames per second of a busy NeonRenderer scene drawn offscreen."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import main_neon as neon
+
+    pygame.init()
+    surface = pygame.Surface((neon.WINDOW_SIZE, neon.WINDOW_SIZE))
+    renderer = neon.NeonRenderer(surface)
+    particles = neon.ParticleSystem()
+    n = neon.GRID_COUNT
+    snakes = []
+    for length, colors in ((200, (neon.PLAYER_NEON, neon.PLAYER_HEAD)),
+                           (60, (neon.AI1_NEON, neon.AI1_HEAD))):
+        snake = SnakeLogic()
+        cycle = coiled_snake(snake, n, length)
+        trail = neon.TrailManager(colors[0])
+        for c in cycle[length:length + neon.TRAIL_LENGTH]:
+            trail.record_move((c % n, c // n))
+        snakes.append((snake, colors, trail))
+    trails = [trail for _, _, trail in snakes]
+
+    def run():
+        for frame in range(frames):
+            if frame % 10 == 0:
+                particles.explode((frame % n, n // 2), neon.AI2_NEON)
+            renderer.begin_frame()
+            renderer.draw_trails(trails)
+            for snake, (body, head), _ in snakes:
+                renderer.draw_snake(snake.positions, body, head,
+                                    snake.interpolated_ends(0.5))
+            renderer.draw_food((3, 3))
+            renderer.draw_particles(particles)
+            renderer.commit_glow()
+            renderer.draw_text(f'Score: {frame}', (10, 10), size=28,
+                               color=neon.PLAYER_NEON)
+            renderer.commit_scanlines()
+
+    return frames / best_of(run, repeat), 'frames/s', True
+
+
+def build_suite(quick: bool) -> Dict[str, Callable[[], Result]]:
+    """
+    Name every benchmark with its parameters.
+
+    Args:
+        quick: Use fewer iterations (noisier, for a fast sanity check)
+
+    Returns:
+        Mapping of benchmark name to a zero-argument runner
+    """
+    # Many short runs rather than a few long ones: the fastest of them is
+    # the least likely to have been interrupted
+    scale = 0.2 if quick else 1.0
+    repeat = 5 if quick else 15
+
+    def it(count):
+        return max(1, int(count * scale))
+
+    suite = {}
+    for n in (25, 50, 100):
+        suite[f'move/{n}'] = lambda n=n: bench_move(n, it(50_000), repeat)
+    for policy in ('greedy', 'floodfill', 'floodfill-path', 'hamiltonian'):
+        for n in (25, 50, 100):
+            for fraction in (0.1, 0.5):
+                length = max(4, int(n * n * fraction))
+                suite[f'ai_move/{policy}/{n}/len{length}'] = (
+                    lambda p=policy, n=n, length=length:
+                    bench_ai_move(p, n, length, it(400_000 // (n * n)), repeat))
+    for snakes, n in ((2, 25), (12, 40)):
+        for mode, shared in (('manhattan', False), ('shared-field', True)):
+            suite[f'ai_tick/{mode}/{n}/snakes{snakes}'] = (
+                lambda s=shared, k=snakes, n=n: bench_ai_tick(s, k, n, it(1_000), repeat))
+    for snakes, n in ((200, 120), (1000, 300)):
+        suite[f'arena/{n}/snakes{snakes}'] = (
+            lambda k=snakes, n=n: bench_arena(k, n, it(200_000 // k), repeat))
+    for fill in (0.5, 0.9, 0.99):
+        suite[f'food/25/fill{fill}'] = lambda f=fill: bench_food(25, f, it(50_000), repeat)
+    for n in (25, 50):
+        length = n * n // 10
+        suite[f'mcts/{n}/len{length}'] = (
+            lambda n=n, length=length: bench_mcts(n, length, it(20), min(repeat, 5)))
+    suite['tt/16bits/keys262144'] = lambda: bench_tt(16, 1 << 18, it(100_000), repeat)
+    suite['neon/frame'] = lambda: bench_neon(it(60), repeat)
+    return suite
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, dict],
+            tolerance: float) -> List[str]:
+    """
+    Print results next to the baseline.
+
+    Args:
+        results: Fresh measurements
+        baseline: Stored measurements by name
+        tolerance: Fractional slowdown that counts as a regression
+
+    Returns:
+        Names of benchmarks that regressed
+    """
+    regressions = []
+    print(f"{'benchmark':<40}{'value':>14}{'baseline':>14}{'change':>9}")
+    for name, (value, unit, higher_better) in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40}{value:>14.2f}{'-':>14}{'-':>9}  {unit}")
+            continue
+        ratio = value / base['value'] if higher_better else base['value'] / value
+        change = ratio - 1
+        flag = ''
+        if change < -tolerance:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<40}{value:>14.2f}{base['value']:>14.2f}{change:>+9.1%}  {unit}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the performance benchmarks.')
+    parser.add_argument('--only', nargs='+', metavar='PREFIX',
+                        help='run only benchmarks whose name starts with a prefix')
+    parser.add_argument('--quick', action='store_true',
+                        help='fewer iterations, for a fast sanity check')
+    parser.add_argument('--save', action='store_true',
+                        help='store the results as the new baseline')
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help='baseline file (default: benchmark_baseline.json)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='slowdown reported as a regression (default: 0.15)')
+    args = parser.parse_args()
+
+    suite = build_suite(args.quick)
+    if args.only:
+        suite = {name: run for name, run in suite.items()
+                 if name.startswith(tuple(args.only))}
+
+    results = {}
+    for name, run in suite.items():
+        print(f"running {name}...", end='\r', file=sys.stderr, flush=True)
+        results[name] = run()
+    print(' ' * 60, end='\r', file=sys.stderr)
+
+    if args.save:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                stored = json.load(f)['results']
+        stored.update({name: {'value': float(f'{value:.4g}'), 'unit': unit,
+                              'higher_is_better': hb}
+                       for name, (value, unit, hb) in results.items()})
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': platform.platform(),
+                       'python': platform.python_version(),
+                       'results': stored}, f, indent=1, sort_keys=True)
+        compare(results, {}, args.tolerance)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    else:
+        print(f"No baseline at {args.baseline}; run with --save to create one.\n")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,25 +3,35 @@ Python Snake Game with Single Player and AI Multiplayer Modes
 A pygame-based implementation with intelligent AI opponents
 """
 import pygame
-import random
 import sys
-from typing import List, Tuple, Optional
-
-# Directional constants (must be defined before use)
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Deque, Dict, List, Tuple, Optional
+
+from snake_engine import (UP, DOWN, LEFT, RIGHT, GRID_COUNT, GameState,
+                          SnakeLogic, ComputerSnakeLogic, FoodLogic,
+                          FixedTimestep, Position)
+from snake_ai import FloodFillPolicy, FoodDistanceField
+from snake_mcts import MCTSPolicy
+from snake_profile import FrameProfiler
+from snake_replay import ReplayRecorder, record_path
+from snake_text import render_text
+from snake_viewport import Viewport
 
 # Game speed constants
-FPS = 30  # Display refresh rate
-PLAYER_MOVE_DELAY = 3  # Player moves every 3 frames (~10 moves/sec)
-AI_MOVE_DELAY = 5  # AI moves every 5 frames (~6 moves/sec)
+FPS = 60  # Display refresh rate
+TICK_RATE = 30  # Simulation ticks per second, independent of FPS
+PLAYER_MOVE_DELAY = 3  # Player moves every 3 ticks (~10 moves/sec)
+AI_MOVE_DELAY = 5  # AI moves every 5 ticks (~6 moves/sec)
 
 # Grid constants
-WINDOW_SIZE = 500  # Window size in pixels
-GRID_SIZE = 20  # Size of each grid cell
-GRID_COUNT = WINDOW_SIZE // GRID_SIZE  # Number of cells per dimension
+GRID_SIZE = 20  # Size of each grid cell on the default board
+WINDOW_SIZE = GRID_COUNT * GRID_SIZE  # Window size in pixels
+OUTLINE_MIN_CELL = 8  # Smaller cells are drawn without the white outline
+
+# Camera of the default board: fits the window exactly and never scrolls
+DEFAULT_VIEW = Viewport(GRID_COUNT, WINDOW_SIZE, WINDOW_SIZE)
 
 # Colors
 BLACK = (0, 0, 0)
@@ -37,111 +47,255 @@ PURPLE = (255, 0, 255)
 DARK_PURPLE = (200, 0, 200)
 GRAY = (128, 128, 128)
 
-# Initialize Pygame with error handling
-try:
-    pygame.init()
-except Exception as e:
-    print(f"ERROR: Failed to initialize Pygame: {e}")
-    sys.exit(1)
+# Display handles, created by init_display() so importing this module stays headless
+screen: Optional[pygame.Surface] = None
+clock: Optional[pygame.time.Clock] = None
+
+
+def init_display():
+    """Initialize pygame and open the game window."""
+    global screen, clock
 
-# Set up the display
-screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
-pygame.display.set_caption('Snake Game')
-clock = pygame.time.Clock()
+    # Initialize Pygame with error handling
+    try:
+        pygame.init()
+    except Exception as e:
+        print(f"ERROR: Failed to initialize Pygame: {e}")
+        sys.exit(1)
 
-class Snake:
+    # Set up the display
+    screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
+    pygame.display.set_caption('Snake Game')
+    clock = pygame.time.Clock()
+
+def draw_cell(surface: pygame.Surface, color: Tuple[int, int, int],
+              x: float, y: float, view: Viewport = DEFAULT_VIEW) -> pygame.Rect:
     """
-    Base Snake class representing a snake entity in the game.
-    Handles movement, collision detection, and rendering.
+    Draw one outlined grid cell at a (possibly fractional) grid position.
+
+    Args:
+        surface: Pygame surface to draw on
+        color: RGB fill color
+        x, y: Grid coordinates of the cell
+        view: Camera mapping cells to pixels
+
+    Returns:
+        The screen rect that was drawn
     """
+    r = view.cell_rect(x, y)
+    pygame.draw.rect(surface, color, r)
+    if r.width >= OUTLINE_MIN_CELL:
+        pygame.draw.rect(surface, WHITE, r, 1)
+    return r
 
-    def __init__(self):
-        """Initialize a new snake with default values."""
-        self.reset()
+class DirtyRenderer:
+    """
+    Incremental renderer for the classic modes.
+
+    Body cells (everything behind a snake's head) are a persistent layer
+    updated from the moves themselves: the renderer keeps each snake's body
+    as last drawn and its move count (SnakeLogic.moves), and per frame only
+    draws the cells the head has left since then and erases the cells the
+    tail has let go, so a frame costs the number of moves made, not the
+    snakes' length. Heads, tail ghosts,
+    food and HUD text are redrawn every frame and erased on the next one.
+    Only the rects that changed are passed to pygame.display.update().
+    On boards larger than the window only the cells inside the viewport
+    are drawn, and a camera jump redraws the screen in full.
+    """
 
-    def get_head_position(self) -> Tuple[int, int]:
+    def __init__(self, surface: pygame.Surface, view: Viewport = DEFAULT_VIEW):
         """
-        Get the current position of the snake's head.
+        Initialize the renderer; the first frame is drawn in full.
 
-        Returns:
-            Tuple of (x, y) grid coordinates
+        Args:
+            surface: Display surface to draw on
+            view: Camera mapping board cells to pixels
         """
-        return self.positions[0]
-
-    def update(self) -> bool:
+        self.surface = surface
+        self.view = view
+        self.cells: Dict[Position, SnakeLogic] = {}  # Body cell -> snake drawn there
+        # Per snake: its positions deque, its move count and its body as last drawn
+        self.trails: Dict[SnakeLogic, Tuple[Deque[Position], int, Deque[Position]]] = {}
+        self.dynamic: List[pygame.Rect] = []  # Drawn this frame, erased next frame
+        self.dirty: List[pygame.Rect] = []
+        self.full = True
+        self.draw_calls = 0  # Fills, cells and blits issued this frame
+
+    def invalidate(self):
+        """Redraw the whole screen on the next frame, e.g. after an overlay."""
+        self.full = True
+
+    def begin_frame(self, snakes: List[SnakeLogic], focus: Optional[Position] = None):
         """
-        Update snake position (single player mode without multi-snake collision).
+        Erase last frame's dynamic items and bring the body layer up to date.
 
-        Returns:
-            True if move was successful, False if collision occurred
+        Args:
+            snakes: Snakes on the board; each needs color and dark_color
+            focus: Cell the camera should keep in view, e.g. the player's head
         """
-        return self.update_with_collision_check([])
-
-    def update_with_collision_check(self, all_snakes: List['Snake']) -> bool:
+        surface = self.surface
+        view = self.view
+        if focus is not None and view.follow(focus):
+            self.full = True
+
+        # Tails first for every snake, so a cell one snake leaves and another
+        # enters in the same frame ends up drawn
+        removed: List[Position] = []
+        added: List[Tuple[SnakeLogic, int]] = []
+        for snake in self.trails.keys() - set(snakes):
+            self._drop(snake, removed)
+        for snake in snakes:
+            added.append((snake, self._trim(snake, removed)))
+        cells = self.cells
+        new_cells: List[Position] = []
+        for snake, k in added:
+            if k:
+                body = self.trails[snake][2]
+                for p in reversed(list(islice(snake.positions, 1, k + 1))):
+                    body.appendleft(p)
+                    cells[p] = snake
+                    new_cells.append(p)
+
+        visible = view.visible
+        if self.full:
+            self.full = False
+            surface.fill(BLACK)
+            self.draw_calls = 1
+            for (x, y), snake in cells.items():
+                if visible(x, y):
+                    draw_cell(surface, snake.color, x, y, view)
+                    self.draw_calls += 1
+            self.dirty = [surface.get_rect()]
+        else:
+            dirty = self.dirty = []
+            self.draw_calls = 0
+            for rect in self.dynamic:
+                surface.fill(BLACK, rect)
+                self._repair(rect)
+                dirty.append(rect)
+            for x, y in removed:
+                if visible(x, y) and (x, y) not in cells:
+                    rect = view.cell_rect(x, y)
+                    surface.fill(BLACK, rect)
+                    dirty.append(rect)
+            for x, y in removed + new_cells:
+                snake = cells.get((x, y))
+                if snake is not None and visible(x, y):
+                    dirty.append(draw_cell(surface, snake.color, x, y, view))
+            self.draw_calls += len(dirty)
+        self.dynamic = []
+
+    def _trim(self, snake: SnakeLogic, removed: List[Position]) -> int:
         """
-        Update snake position with full collision checking.
-        Checks for wall collisions, self-collisions, and collisions with other snakes.
+        Pop the cells a snake's tail has left since the last frame.
 
         Args:
-            all_snakes: List of all snakes to check for collisions
+            snake: Snake to bring up to date
+            removed: Collects the cells no longer covered by its body
 
         Returns:
-            True if move was successful, False if collision occurred
+            How many cells behind the head are new body cells
         """
-        cur = self.get_head_position()
-        x, y = self.direction
-        new = (cur[0] + x, cur[1] + y)
-
-        # Check for wall collision
-        if (new[0] < 0 or new[0] >= GRID_COUNT or
-            new[1] < 0 or new[1] >= GRID_COUNT):
-            return False
-
-        # Check for self collision (skip first 3 segments to allow tight turns)
-        if new in self.positions[3:]:
-            return False
-
-        # Check for collision with other snakes
-        for other_snake in all_snakes:
-            if other_snake != self and new in other_snake.positions:
-                return False
-
-        # Move snake
-        self.positions.insert(0, new)
-        if len(self.positions) > self.length:
-            self.positions.pop()
-        return True
-
-    def reset(self):
-        """Reset snake to initial state."""
-        self.length = 1
-        self.positions = [(GRID_COUNT // 2, GRID_COUNT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
-        self.score = 0
-        self.color = GREEN
-
-    def render(self, surface: pygame.Surface):
+        positions = snake.positions
+        trail = self.trails.get(snake)
+        body_length = len(positions) - 1
+        k = -1
+        if trail is not None and trail[0] is positions:
+            # Cells past the body's length were entered and left again
+            k = min(snake.moves - trail[1], body_length)
+            body = trail[2]
+            pops = len(body) + k - body_length
+            if k < 0 or pops < 0:
+                k = -1
+        if k < 0:
+            # New, reset or reloaded snake: redraw its whole body
+            self._drop(snake, removed)
+            body = deque()
+            k = max(body_length, 0)
+            pops = 0
+        cells = self.cells
+        for _ in range(pops):
+            p = body.pop()
+            if cells.get(p) is snake:
+                del cells[p]
+            removed.append(p)
+        if positions:
+            self.trails[snake] = (positions, snake.moves, body)
+        return k
+
+    def _drop(self, snake: SnakeLogic, removed: List[Position]):
+        """Forget a snake's drawn body, collecting its cells in removed."""
+        trail = self.trails.pop(snake, None)
+        if trail is None:
+            return
+        cells = self.cells
+        for p in trail[2]:
+            if cells.get(p) is snake:
+                del cells[p]
+            removed.append(p)
+
+    def _repair(self, rect: pygame.Rect):
+        """Redraw body cells overlapping a rect that was just erased."""
+        xs, ys = self.view.cells_in(rect)
+        cells = self.cells
+        for y in ys:
+            for x in xs:
+                snake = cells.get((x, y))
+                if snake is not None:
+                    draw_cell(self.surface, snake.color, x, y, self.view)
+                    self.draw_calls += 1
+
+    def draw_snake_ends(self, snake: SnakeLogic, t: float):
         """
-        Render the snake on the given surface.
+        Draw a snake's head and vacated tail interpolated between moves.
 
         Args:
-            surface: Pygame surface to draw on
+            snake: Snake to draw
+            t: Progress from the previous move (0.0) to the last one (1.0)
         """
-        for i, p in enumerate(self.positions):
-            color = DARK_GREEN if i == 0 else self.color
-            r = pygame.Rect((p[0] * GRID_SIZE, p[1] * GRID_SIZE),
-                          (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(surface, color, r)
-            pygame.draw.rect(surface, WHITE, r, 1)
-
-class ComputerSnake(Snake):
+        head, tail = snake.interpolated_ends(t)
+        view = self.view
+        if tail is not None and view.visible(*tail):
+            self.dynamic.append(draw_cell(self.surface, snake.color, *tail, view))
+            self.draw_calls += 1
+        if view.visible(*head):
+            self.dynamic.append(draw_cell(self.surface, snake.dark_color, *head, view))
+            self.draw_calls += 1
+
+    def mark(self, rect: pygame.Rect):
+        """Record a rect drawn this frame so it is shown and later erased."""
+        self.dynamic.append(rect)
+        self.draw_calls += 1
+
+    def blit(self, source: pygame.Surface, pos: Tuple[int, int]):
+        """Blit a HUD surface and record its rect."""
+        self.dynamic.append(self.surface.blit(source, pos))
+        self.draw_calls += 1
+
+    def present(self):
+        """Push this frame's changed rects to the display."""
+        pygame.display.update(self.dirty + self.dynamic)
+
+class Snake(SnakeLogic):
+    """
+    Player snake: engine movement and collision logic plus display colors.
+    """
+
+    def __init__(self):
+        """Initialize a new snake with default values."""
+        super().__init__()
+        self.color = GREEN
+        self.dark_color = DARK_GREEN
+
+class ComputerSnake(ComputerSnakeLogic):
     """
     AI-controlled snake with pathfinding and collision avoidance.
-    Inherits from Snake and adds intelligent movement behavior.
+    Uses the engine's AI logic and adds custom display colors.
     """
 
     def __init__(self, color: Tuple[int, int, int], dark_color: Tuple[int, int, int],
-                 start_pos: Tuple[int, int]):
+                 start_pos: Tuple[int, int], policy=None):
         """
         Initialize an AI snake with custom colors and starting position.
 
@@ -149,160 +303,49 @@ class ComputerSnake(Snake):
             color: RGB tuple for snake body color
             dark_color: RGB tuple for snake head color
             start_pos: Starting (x, y) grid position
+            policy: Optional snake_ai policy, greedy one-step AI if None
         """
-        super().__init__()
+        super().__init__(start_pos, policy=policy)
         self.color = color
         self.dark_color = dark_color
-        self.positions = [start_pos]
-
-    def render(self, surface: pygame.Surface):
-        """
-        Render the AI snake with its custom colors.
-
-        Args:
-            surface: Pygame surface to draw on
-        """
-        for i, p in enumerate(self.positions):
-            color = self.dark_color if i == 0 else self.color
-            r = pygame.Rect((p[0] * GRID_SIZE, p[1] * GRID_SIZE),
-                          (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(surface, color, r)
-            pygame.draw.rect(surface, WHITE, r, 1)
-
-    def ai_move(self, food_pos: Tuple[int, int], all_snakes: List['Snake']):
-        """
-        Calculate and execute AI movement toward food while avoiding collisions.
-        Uses Manhattan distance heuristic to choose the best safe move.
-
-        Args:
-            food_pos: Target food position (x, y)
-            all_snakes: List of all snakes to avoid
-        """
-        head = self.get_head_position()
-        food_x, food_y = food_pos
-        head_x, head_y = head
-
-        # Get all occupied positions from all snakes (excluding self)
-        occupied_positions = set()
-        for snake in all_snakes:
-            if snake != self:
-                occupied_positions.update(snake.positions)
-
-        # Calculate possible moves
-        possible_moves = [UP, DOWN, LEFT, RIGHT]
-        safe_moves = []
-
-        for move in possible_moves:
-            # Don't reverse direction (would cause instant self-collision)
-            if move == (-self.direction[0], -self.direction[1]):
-                continue
-
-            new_x = head_x + move[0]
-            new_y = head_y + move[1]
-
-            # Check boundaries
-            if new_x < 0 or new_x >= GRID_COUNT or new_y < 0 or new_y >= GRID_COUNT:
-                continue
-
-            # Check collision with other snakes and self
-            if (new_x, new_y) in occupied_positions or (new_x, new_y) in self.positions[1:]:
-                continue
-
-            safe_moves.append(move)
-
-        if not safe_moves:
-            # No safe moves available, keep current direction
-            return
 
-        # Choose move that minimizes Manhattan distance to food
-        best_move = safe_moves[0]
-        best_distance = float('inf')
-
-        for move in safe_moves:
-            new_x = head_x + move[0]
-            new_y = head_y + move[1]
-            distance = abs(new_x - food_x) + abs(new_y - food_y)
-
-            if distance < best_distance:
-                best_distance = distance
-                best_move = move
-
-        self.direction = best_move
-
-class Food:
+class Food(FoodLogic):
     """
     Food item that snakes can eat to grow.
-    Handles random spawning and rendering.
+    Spawning comes from the engine; this class adds rendering.
     """
 
     def __init__(self):
         """Initialize food with default position and color."""
-        self.position = (0, 0)
+        super().__init__()
         self.color = RED
 
-    def randomize_position(self, snakes: Optional[List[Snake]] = None):
-        """
-        Randomize food position, avoiding occupied snake positions.
-
-        Args:
-            snakes: Optional list of snakes to avoid when spawning
-
-        Note:
-            If all positions are occupied (rare), falls back to random placement
-        """
-        if snakes is None:
-            snakes = []
-
-        # Get all occupied positions
-        occupied = set()
-        for snake in snakes:
-            occupied.update(snake.positions)
-
-        # Find valid positions
-        max_attempts = 100
-        for _ in range(max_attempts):
-            new_pos = (random.randint(0, GRID_COUNT-1),
-                      random.randint(0, GRID_COUNT-1))
-            if new_pos not in occupied:
-                self.position = new_pos
-                return
-
-        # Fallback: if we can't find a free spot after max_attempts, place randomly
-        self.position = (random.randint(0, GRID_COUNT-1),
-                        random.randint(0, GRID_COUNT-1))
-
-    def render(self, surface: pygame.Surface):
+    def render(self, surface: pygame.Surface, view: Viewport = DEFAULT_VIEW) -> pygame.Rect:
         """
         Render the food item on the given surface.
 
         Args:
             surface: Pygame surface to draw on
-        """
-        r = pygame.Rect((self.position[0] * GRID_SIZE,
-                        self.position[1] * GRID_SIZE),
-                       (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(surface, self.color, r)
-        pygame.draw.rect(surface, WHITE, r, 1)
+            view: Camera mapping cells to pixels
 
-def show_menu(screen: pygame.Surface):
-    """
-    Display the game mode selection menu.
-
-    Args:
-        screen: Pygame surface to render the menu on
-    """
-    font = pygame.font.Font(None, 74)
-    medium_font = pygame.font.Font(None, 48)
-    small_font = pygame.font.Font(None, 36)
-
-    title_text = font.render('Snake Game', True, WHITE)
-    subtitle_text = medium_font.render('Choose Game Mode', True, WHITE)
-    single_text = small_font.render('1 - Single Player (Classic)', True, GREEN)
-    ai_text = small_font.render('2 - Play Against Computer', True, BLUE)
-    neon_text = small_font.render('3 - Neon Mode', True, (0, 229, 255))
-    quit_text = small_font.render('Q - Quit', True, GRAY)
+        Returns:
+            The screen rect that was drawn
+        """
+        return draw_cell(surface, self.color, *self.position, view)
+
+@lru_cache(maxsize=1)
+def _menu_surface() -> pygame.Surface:
+    """Compose the static menu screen once."""
+    title_text = render_text('Snake Game', 74, WHITE)
+    subtitle_text = render_text('Choose Game Mode', 48, WHITE)
+    single_text = render_text('1 - Single Player (Classic)', 36, GREEN)
+    ai_text = render_text('2 - Play Against Computer', 36, BLUE)
+    neon_text = render_text('3 - Neon Mode', 36, (0, 229, 255))
+    arena_text = render_text('4 - AI Arena', 36, YELLOW)
+    quit_text = render_text('Q - Quit', 36, GRAY)
 
     # Center the text
+    screen = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE))
     screen.fill(BLACK)
     screen.blit(title_text,
                 (WINDOW_SIZE//2 - title_text.get_width()//2, 100))
@@ -314,25 +357,34 @@ def show_menu(screen: pygame.Surface):
                 (WINDOW_SIZE//2 - ai_text.get_width()//2, 290))
     screen.blit(neon_text,
                 (WINDOW_SIZE//2 - neon_text.get_width()//2, 330))
+    screen.blit(arena_text,
+                (WINDOW_SIZE//2 - arena_text.get_width()//2, 370))
     screen.blit(quit_text,
-                (WINDOW_SIZE//2 - quit_text.get_width()//2, 390))
+                (WINDOW_SIZE//2 - quit_text.get_width()//2, 430))
+    return screen
+
+def show_menu(screen: pygame.Surface):
+    """
+    Display the game mode selection menu.
 
+    Args:
+        screen: Pygame surface to render the menu on
+    """
+    screen.blit(_menu_surface(), (0, 0))
     pygame.display.update()
 
-def show_game_over(screen: pygame.Surface, score: int):
+def show_game_over(screen: pygame.Surface, score: int, title: str = 'Game Over!'):
     """
     Display the game over screen with final score.
 
     Args:
         screen: Pygame surface to render on
         score: Final score to display
+        title: Headline, e.g. a win message when the board is full
     """
-    font = pygame.font.Font(None, 74)
-    small_font = pygame.font.Font(None, 36)
-
-    game_over_text = font.render('Game Over!', True, WHITE)
-    score_text = small_font.render(f'Final Score: {score}', True, WHITE)
-    restart_text = small_font.render('Press SPACE to restart', True, GRAY)
+    game_over_text = render_text(title, 74, WHITE)
+    score_text = render_text(f'Final Score: {score}', 36, WHITE)
+    restart_text = render_text('Press SPACE to restart', 36, GRAY)
 
     screen.blit(game_over_text,
                 (WINDOW_SIZE//2 - game_over_text.get_width()//2,
@@ -358,11 +410,8 @@ def show_pause_screen(screen: pygame.Surface):
     overlay.fill(BLACK)
     screen.blit(overlay, (0, 0))
 
-    font = pygame.font.Font(None, 74)
-    small_font = pygame.font.Font(None, 36)
-
-    pause_text = font.render('PAUSED', True, WHITE)
-    continue_text = small_font.render('Press P to continue', True, GRAY)
+    pause_text = render_text('PAUSED', 74, WHITE)
+    continue_text = render_text('Press P to continue', 36, GRAY)
 
     screen.blit(pause_text,
                 (WINDOW_SIZE//2 - pause_text.get_width()//2,
@@ -372,29 +421,44 @@ def show_pause_screen(screen: pygame.Surface):
                  WINDOW_SIZE//2 + 20))
     pygame.display.update()
 
-def single_player_mode():
+def single_player_mode(record_dir: Optional[str] = None, grid_count: int = GRID_COUNT):
     """
     Classic single player Snake game mode.
     Control a snake to eat food and grow as long as possible.
+
+    Args:
+        record_dir: If set, the session's replay is saved there at every game over
+        grid_count: Board size in cells; boards too big for the window scroll
     """
-    player_snake = Snake()
     food = Food()
-    food.randomize_position([player_snake])
-    font = pygame.font.Font(None, 36)
+    game = GameState(food=food, grid_count=grid_count)
+    recorder = (ReplayRecorder(game, record_path(record_dir, 'single'))
+                if record_dir else None)
+    player_snake = game.add_snake(Snake())
+    game.spawn_food()
+    font_size = 36
     game_over = False
     paused = False
     move_counter = 0
+    scheduler = FixedTimestep(TICK_RATE)
+    dt = 0.0
+    renderer = DirtyRenderer(screen, Viewport(grid_count, WINDOW_SIZE, WINDOW_SIZE))
+    overlay_shown = False
+    profiler = FrameProfiler('single', FPS)
 
     while True:
+        profiler.begin_frame()
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if game_over:
                     if event.key == pygame.K_SPACE:
-                        player_snake.reset()
-                        food.randomize_position([player_snake])
+                        game.reset_snake(player_snake)
+                        game.spawn_food()
                         game_over = False
                     elif event.key == pygame.K_ESCAPE:
                         return  # Return to menu
@@ -415,63 +479,119 @@ def single_player_mode():
                     elif event.key == pygame.K_ESCAPE:
                         return  # Return to menu
 
-        # Update game state
+        profiler.lap('input')
+
+        # Update game state at a fixed tick rate
         if not game_over and not paused:
-            move_counter += 1
-            if move_counter >= PLAYER_MOVE_DELAY:
-                move_counter = 0
-
-                if not player_snake.update():
-                    game_over = True
-                    continue
-
-                # Check food collision
-                if player_snake.get_head_position() == food.position:
-                    player_snake.length += 1
-                    player_snake.score += 1
-                    food.randomize_position([player_snake])
-
-        # Draw everything
-        screen.fill(BLACK)
-        player_snake.render(screen)
-        food.render(screen)
-
-        score_text = font.render(f'Score: {player_snake.score}', True, WHITE)
-        mode_text = font.render('Single Player - P:Pause ESC:Menu', True, GRAY)
-        screen.blit(score_text, (10, 10))
-        screen.blit(mode_text, (10, WINDOW_SIZE - 25))
-
-        if game_over:
-            show_game_over(screen, player_snake.score)
-        elif paused:
-            show_pause_screen(screen)
-
-        pygame.display.update()
-        clock.tick(FPS)
+            for _ in scheduler.ticks(dt):
+                game.tick += 1
+                move_counter += 1
+                if move_counter >= PLAYER_MOVE_DELAY:
+                    move_counter = 0
+
+                    if game.move_snakes([player_snake]):
+                        game_over = True
+                        break
+                    profiler.lap('move')
 
-def ai_mode():
+                    # Check food collision
+                    game.check_food()
+                    profiler.lap('food')
+                    if game.won:
+                        game_over = True
+                        break
+            if game_over and recorder is not None:
+                recorder.save()
+            profiler.lap('update')
+
+        # Draw what changed; overlays are drawn once and then left on screen
+        if overlay_shown and not (game_over or paused):
+            overlay_shown = False
+        if not overlay_shown:
+            renderer.begin_frame(game.snakes, player_snake.get_head_position())
+            player_t = 1.0 if game_over else min(
+                1.0, (move_counter + scheduler.alpha) / PLAYER_MOVE_DELAY)
+            renderer.draw_snake_ends(player_snake, player_t)
+            renderer.mark(food.render(screen, renderer.view))
+
+            score_text = render_text(f'Score: {player_snake.score}', font_size, WHITE)
+            mode_text = render_text('Single Player - P:Pause ESC:Menu', font_size, GRAY)
+            renderer.blit(score_text, (10, 10))
+            renderer.blit(mode_text, (10, WINDOW_SIZE - 25))
+
+            if game_over or paused:
+                if game_over:
+                    show_game_over(screen, player_snake.score,
+                                   'Board Full!' if game.won else 'Game Over!')
+                else:
+                    show_pause_screen(screen)
+                overlay_shown = True
+                renderer.invalidate()
+            else:
+                overlay_rect = profiler.draw_overlay(screen)
+                if overlay_rect is not None:
+                    renderer.mark(overlay_rect)
+                profiler.lap('draw')
+                renderer.present()
+                profiler.lap('present')
+
+        dt = clock.tick(FPS) / 1000.0
+        profiler.lap('idle')
+        profiler.end_frame(0 if overlay_shown else renderer.draw_calls)
+
+def ai_mode(record_dir: Optional[str] = None, grid_count: int = GRID_COUNT,
+            mcts_budget: Optional[float] = None):
     """
     Multiplayer mode with AI opponents.
     Compete against 2 computer-controlled snakes for food.
+
+    Args:
+        record_dir: If set, the session's replay is saved there at every game over
+        grid_count: Board size in cells; boards too big for the window scroll
+        mcts_budget: If set, the opponents plan with Monte Carlo tree search
+            for this many seconds per move instead of flood fill
     """
-    # Initialize snakes
-    player_snake = Snake()
-    ai_snakes = [
-        ComputerSnake(BLUE, DARK_BLUE, (5, 5)),
-        ComputerSnake(YELLOW, DARK_YELLOW, (GRID_COUNT-6, 5))
-    ]
-    all_snakes = [player_snake] + ai_snakes
+    def ai_policy():
+        if mcts_budget is not None:
+            return MCTSPolicy(budget=mcts_budget, field=food_field)
+        return FloodFillPolicy(field=food_field)
+
+    def spawn_ai_snakes() -> List[ComputerSnake]:
+        return [
+            game.add_snake(ComputerSnake(BLUE, DARK_BLUE, (5, 5), ai_policy())),
+            game.add_snake(ComputerSnake(YELLOW, DARK_YELLOW, (grid_count-6, 5),
+                                         ai_policy()))
+        ]
+
+    # Food distances computed once per AI tick and shared by every AI snake
+    food_field = FoodDistanceField()
 
+    # Initialize snakes
     food = Food()
-    food.randomize_position(all_snakes)
-    font = pygame.font.Font(None, 24)
+    game = GameState(food=food, grid_count=grid_count)
+    recorder = (ReplayRecorder(game, record_path(record_dir, 'ai_mode'))
+                if record_dir else None)
+    player_snake = game.add_snake(Snake())
+    ai_snakes = spawn_ai_snakes()
+    all_snakes = game.snakes
+
+    game.spawn_food()
+    font_size = 24
     game_over = False
     paused = False
     move_counter = 0
     ai_move_counter = 0
+    scheduler = FixedTimestep(TICK_RATE)
+    dt = 0.0
+    renderer = DirtyRenderer(screen, Viewport(grid_count, WINDOW_SIZE, WINDOW_SIZE))
+    overlay_shown = False
+    profiler = FrameProfiler('ai_mode', FPS)
 
     while True:
+        profiler.begin_frame()
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -479,13 +599,11 @@ def ai_mode():
                 if game_over:
                     if event.key == pygame.K_SPACE:
                         # Reset all snakes
-                        player_snake.reset()
-                        ai_snakes = [
-                            ComputerSnake(BLUE, DARK_BLUE, (5, 5)),
-                            ComputerSnake(YELLOW, DARK_YELLOW, (GRID_COUNT-6, 5))
-                        ]
-                        all_snakes = [player_snake] + ai_snakes
-                        food.randomize_position(all_snakes)
+                        for ai_snake in ai_snakes:
+                            game.remove_snake(ai_snake)
+                        game.reset_snake(player_snake)
+                        ai_snakes = spawn_ai_snakes()
+                        game.spawn_food()
                         game_over = False
                     elif event.key == pygame.K_ESCAPE:
                         return  # Return to menu
@@ -506,80 +624,112 @@ def ai_mode():
                     elif event.key == pygame.K_ESCAPE:
                         return  # Return to menu
 
-        # Update game state
+        profiler.lap('input')
+
+        # Update game state at a fixed tick rate
         if not game_over and not paused:
-            move_counter += 1
-            ai_move_counter += 1
-
-            player_should_move = move_counter >= PLAYER_MOVE_DELAY
-            if player_should_move:
-                move_counter = 0
-                if not player_snake.update_with_collision_check(all_snakes):
-                    game_over = True
-                    continue
-
-            ai_should_move = ai_move_counter >= AI_MOVE_DELAY
-            if ai_should_move:
-                ai_move_counter = 0
-
-                # AI decision making
-                for ai_snake in ai_snakes:
-                    ai_snake.ai_move(food.position, all_snakes)
-
-                # Update AI positions and remove dead snakes
-                snakes_to_remove = []
-                for ai_snake in ai_snakes:
-                    if not ai_snake.update_with_collision_check(all_snakes):
-                        snakes_to_remove.append(ai_snake)
-
-                for dead_snake in snakes_to_remove:
-                    ai_snakes.remove(dead_snake)
-                    all_snakes.remove(dead_snake)
-
-                # Respawn AI snakes if all died
-                if len(ai_snakes) == 0:
-                    ai_snakes = [
-                        ComputerSnake(BLUE, DARK_BLUE, (5, 5)),
-                        ComputerSnake(YELLOW, DARK_YELLOW, (GRID_COUNT-6, 5))
-                    ]
-                    all_snakes = [player_snake] + ai_snakes
-
-            # Check food collision (only when snakes have moved)
-            if player_should_move or ai_should_move:
-                for snake in all_snakes:
-                    if snake.get_head_position() == food.position:
-                        snake.length += 1
-                        if snake == player_snake:
-                            snake.score += 1
-                        food.randomize_position(all_snakes)
+            for _ in scheduler.ticks(dt):
+                game.tick += 1
+                move_counter += 1
+                ai_move_counter += 1
+
+                movers = []
+                player_should_move = move_counter >= PLAYER_MOVE_DELAY
+                if player_should_move:
+                    move_counter = 0
+                    movers.append(player_snake)
+
+                ai_should_move = ai_move_counter >= AI_MOVE_DELAY
+                if ai_should_move:
+                    ai_move_counter = 0
+
+                    # AI decision making
+                    food_field.update(game.board, food.position, ai_snakes)
+                    for ai_snake in ai_snakes:
+                        ai_snake.ai_move(food.position, all_snakes)
+                    profiler.lap('ai')
+                    movers.extend(ai_snakes)
+
+                if movers:
+                    # Everyone due this tick moves at once, so the outcome
+                    # does not depend on who is first in the list
+                    dead = game.move_simultaneous(movers)
+                    profiler.lap('move')
+                    if player_snake in dead:
+                        game_over = True
                         break
 
-        # Draw everything
-        screen.fill(BLACK)
-        for snake in all_snakes:
-            snake.render(screen)
-        food.render(screen)
-
-        score_text = font.render(f'Score: {player_snake.score}', True, WHITE)
-        snakes_text = font.render(f'AI Snakes: {len(ai_snakes)}', True, WHITE)
-        mode_text = font.render('VS Computer - P:Pause ESC:Menu', True, GRAY)
-        screen.blit(score_text, (10, 10))
-        screen.blit(snakes_text, (10, 30))
-        screen.blit(mode_text, (10, WINDOW_SIZE - 25))
-
-        if game_over:
-            show_game_over(screen, player_snake.score)
-        elif paused:
-            show_pause_screen(screen)
-
-        pygame.display.update()
-        clock.tick(FPS)
+                    # Remove dead AI snakes, respawning them if all died
+                    for dead_snake in dead:
+                        ai_snakes.remove(dead_snake)
+                        game.remove_snake(dead_snake)
+                    if len(ai_snakes) == 0:
+                        ai_snakes = spawn_ai_snakes()
+
+                    # Check food collision (only when snakes have moved)
+                    game.check_food()
+                    profiler.lap('food')
+                    if game.won:
+                        game_over = True
+                        break
+            if game_over and recorder is not None:
+                recorder.save()
+            profiler.lap('update')
+
+        # Draw what changed; overlays are drawn once and then left on screen
+        if overlay_shown and not (game_over or paused):
+            overlay_shown = False
+        if not overlay_shown:
+            renderer.begin_frame(all_snakes, player_snake.get_head_position())
+            player_t = 1.0 if game_over else min(
+                1.0, (move_counter + scheduler.alpha) / PLAYER_MOVE_DELAY)
+            ai_t = 1.0 if game_over else min(
+                1.0, (ai_move_counter + scheduler.alpha) / AI_MOVE_DELAY)
+            renderer.draw_snake_ends(player_snake, player_t)
+            for ai_snake in ai_snakes:
+                renderer.draw_snake_ends(ai_snake, ai_t)
+            renderer.mark(food.render(screen, renderer.view))
+
+            score_text = render_text(f'Score: {player_snake.score}', font_size, WHITE)
+            snakes_text = render_text(f'AI Snakes: {len(ai_snakes)}', font_size, WHITE)
+            mode_text = render_text('VS Computer - P:Pause ESC:Menu', font_size, GRAY)
+            renderer.blit(score_text, (10, 10))
+            renderer.blit(snakes_text, (10, 30))
+            renderer.blit(mode_text, (10, WINDOW_SIZE - 25))
+
+            if game_over or paused:
+                if game_over:
+                    show_game_over(screen, player_snake.score,
+                                   'Board Full!' if game.won else 'Game Over!')
+                else:
+                    show_pause_screen(screen)
+                overlay_shown = True
+                renderer.invalidate()
+            else:
+                overlay_rect = profiler.draw_overlay(screen)
+                if overlay_rect is not None:
+                    renderer.mark(overlay_rect)
+                profiler.lap('draw')
+                renderer.present()
+                profiler.lap('present')
+
+        dt = clock.tick(FPS) / 1000.0
+        profiler.lap('idle')
+        profiler.end_frame(0 if overlay_shown else renderer.draw_calls)
 
 def main():
     """
     Main menu loop and game mode selection.
     Displays menu and handles user input for mode selection.
+    Pass --record DIR to save a replay of every classic game into DIR,
+    --grid N to play on an N x N board and --mcts MS to face Monte Carlo
+    tree search opponents that think for MS milliseconds per move.
     """
+    record_dir = sys.argv[sys.argv.index('--record') + 1] if '--record' in sys.argv else None
+    grid_count = int(sys.argv[sys.argv.index('--grid') + 1]) if '--grid' in sys.argv else GRID_COUNT
+    mcts_budget = (float(sys.argv[sys.argv.index('--mcts') + 1]) / 1000
+                   if '--mcts' in sys.argv else None)
+    init_display()
     while True:
         show_menu(screen)
 
@@ -590,12 +740,15 @@ def main():
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_1:
-                    single_player_mode()
+                    single_player_mode(record_dir, grid_count)
                 elif event.key == pygame.K_2:
-                    ai_mode()
+                    ai_mode(record_dir, grid_count, mcts_budget)
                 elif event.key == pygame.K_3:
                     import main_neon
-                    main_neon.neon_single_player(screen, clock)
+                    main_neon.neon_single_player(screen, clock, grid_count)
+                elif event.key == pygame.K_4:
+                    import main_arena
+                    main_arena.arena_mode(screen, clock)
                 elif event.key == pygame.K_q:
                     pygame.quit()
                     sys.exit()
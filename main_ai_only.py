@@ -4,24 +4,30 @@ A pygame-based implementation with a single AI-controlled snake
 Watch the AI navigate and collect food autonomously
 """
 import pygame
-import random
 import sys
-from typing import List, Tuple, Optional
+from itertools import islice
+from typing import Tuple, Optional
 
-# Directional constants (must be defined before use)
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+from snake_engine import (GRID_COUNT, GameState, ComputerSnakeLogic, FoodLogic,
+                          FixedTimestep)
+from snake_ai import FloodFillPolicy, HamiltonianPolicy, PathfindingPolicy
+from snake_profile import FrameProfiler
+from snake_replay import ReplayRecorder, record_path
+from snake_text import render_text
+from snake_viewport import Viewport
 
 # Game speed constants
-FPS = 30  # Display refresh rate
-AI_MOVE_DELAY = 5  # AI moves every 5 frames (~6 moves/sec)
+FPS = 60  # Display refresh rate
+TICK_RATE = 30  # Simulation ticks per second, independent of FPS
+AI_MOVE_DELAY = 5  # AI moves every 5 ticks (~6 moves/sec)
 
 # Grid constants
-WINDOW_SIZE = 500  # Window size in pixels
-GRID_SIZE = 20  # Size of each grid cell
-GRID_COUNT = WINDOW_SIZE // GRID_SIZE  # Number of cells per dimension
+GRID_SIZE = 20  # Size of each grid cell on the default board
+WINDOW_SIZE = GRID_COUNT * GRID_SIZE  # Window size in pixels
+OUTLINE_MIN_CELL = 8  # Smaller cells are drawn without the white outline
+
+# Camera of the default board: fits the window exactly and never scrolls
+DEFAULT_VIEW = Viewport(GRID_COUNT, WINDOW_SIZE, WINDOW_SIZE)
 
 # Colors
 BLACK = (0, 0, 0)
@@ -33,93 +39,35 @@ CYAN = (0, 255, 255)
 DARK_CYAN = (0, 200, 200)
 GRAY = (128, 128, 128)
 
-# Initialize Pygame with error handling
-try:
-    pygame.init()
-except Exception as e:
-    print(f"ERROR: Failed to initialize Pygame: {e}")
-    sys.exit(1)
-
-# Set up the display
-screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
-pygame.display.set_caption('Snake Game - AI Only')
-clock = pygame.time.Clock()
-
-class Snake:
-    """
-    Base Snake class representing a snake entity in the game.
-    Handles movement, collision detection, and rendering.
-    """
+# Display handles, created by init_display() so importing this module stays headless
+screen: Optional[pygame.Surface] = None
+clock: Optional[pygame.time.Clock] = None
 
-    def __init__(self):
-        """Initialize a new snake with default values."""
-        self.reset()
 
-    def get_head_position(self) -> Tuple[int, int]:
-        """
-        Get the current position of the snake's head.
+def init_display():
+    """Initialize pygame and open the game window."""
+    global screen, clock
 
-        Returns:
-            Tuple of (x, y) grid coordinates
-        """
-        return self.positions[0]
-
-    def update(self) -> bool:
-        """
-        Update snake position (single snake mode without multi-snake collision).
-
-        Returns:
-            True if move was successful, False if collision occurred
-        """
-        cur = self.get_head_position()
-        x, y = self.direction
-        new = (cur[0] + x, cur[1] + y)
-
-        # Check for wall collision
-        if (new[0] < 0 or new[0] >= GRID_COUNT or
-            new[1] < 0 or new[1] >= GRID_COUNT):
-            return False
-
-        # Check for self collision (skip first 3 segments to allow tight turns)
-        if new in self.positions[3:]:
-            return False
-
-        # Move snake
-        self.positions.insert(0, new)
-        if len(self.positions) > self.length:
-            self.positions.pop()
-        return True
-
-    def reset(self):
-        """Reset snake to initial state."""
-        self.length = 1
-        self.positions = [(GRID_COUNT // 2, GRID_COUNT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
-        self.score = 0
-        self.color = GREEN
-
-    def render(self, surface: pygame.Surface):
-        """
-        Render the snake on the given surface.
+    # Initialize Pygame with error handling
+    try:
+        pygame.init()
+    except Exception as e:
+        print(f"ERROR: Failed to initialize Pygame: {e}")
+        sys.exit(1)
 
-        Args:
-            surface: Pygame surface to draw on
-        """
-        for i, p in enumerate(self.positions):
-            color = DARK_GREEN if i == 0 else self.color
-            r = pygame.Rect((p[0] * GRID_SIZE, p[1] * GRID_SIZE),
-                          (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(surface, color, r)
-            pygame.draw.rect(surface, WHITE, r, 1)
+    # Set up the display
+    screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
+    pygame.display.set_caption('Snake Game - AI Only')
+    clock = pygame.time.Clock()
 
-class AISnake(Snake):
+class AISnake(ComputerSnakeLogic):
     """
     AI-controlled snake with pathfinding and collision avoidance.
-    Inherits from Snake and adds intelligent movement behavior.
+    Uses the engine's AI logic and adds custom-colored rendering.
     """
 
     def __init__(self, color: Tuple[int, int, int], dark_color: Tuple[int, int, int],
-                 start_pos: Tuple[int, int]):
+                 start_pos: Tuple[int, int], policy=None):
         """
         Initialize an AI snake with custom colors and starting position.
 
@@ -127,148 +75,88 @@ class AISnake(Snake):
             color: RGB tuple for snake body color
             dark_color: RGB tuple for snake head color
             start_pos: Starting (x, y) grid position
+            policy: Optional snake_ai policy, greedy one-step AI if None
         """
-        super().__init__()
+        super().__init__(start_pos, policy=policy)
         self.color = color
         self.dark_color = dark_color
-        self.positions = [start_pos]
 
-    def render(self, surface: pygame.Surface):
+    def render(self, surface: pygame.Surface, t: float = 1.0,
+               view: Viewport = DEFAULT_VIEW) -> int:
         """
-        Render the AI snake with its custom colors.
+        Render the AI snake with its custom colors. The head and tail are
+        interpolated between moves; body cells stay on the grid. Cells
+        outside the viewport are skipped.
 
         Args:
             surface: Pygame surface to draw on
-        """
-        for i, p in enumerate(self.positions):
-            color = self.dark_color if i == 0 else self.color
-            r = pygame.Rect((p[0] * GRID_SIZE, p[1] * GRID_SIZE),
-                          (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(surface, color, r)
-            pygame.draw.rect(surface, WHITE, r, 1)
+            t: Progress from the previous move (0.0) to the last one (1.0)
+            view: Camera mapping cells to pixels
 
-    def ai_move(self, food_pos: Tuple[int, int]):
-        """
-        Calculate and execute AI movement toward food while avoiding collisions.
-        Uses Manhattan distance heuristic to choose the best safe move.
-
-        Args:
-            food_pos: Target food position (x, y)
+        Returns:
+            Number of cells drawn
         """
-        head = self.get_head_position()
-        food_x, food_y = food_pos
-        head_x, head_y = head
-
-        # Calculate possible moves
-        possible_moves = [UP, DOWN, LEFT, RIGHT]
-        safe_moves = []
-
-        for move in possible_moves:
-            # Don't reverse direction (would cause instant self-collision)
-            if move == (-self.direction[0], -self.direction[1]):
-                continue
-
-            new_x = head_x + move[0]
-            new_y = head_y + move[1]
-
-            # Check boundaries
-            if new_x < 0 or new_x >= GRID_COUNT or new_y < 0 or new_y >= GRID_COUNT:
-                continue
-
-            # Check collision with self
-            if (new_x, new_y) in self.positions[1:]:
-                continue
-
-            safe_moves.append(move)
-
-        if not safe_moves:
-            # No safe moves available, keep current direction
-            return
-
-        # Choose move that minimizes Manhattan distance to food
-        best_move = safe_moves[0]
-        best_distance = float('inf')
-
-        for move in safe_moves:
-            new_x = head_x + move[0]
-            new_y = head_y + move[1]
-            distance = abs(new_x - food_x) + abs(new_y - food_y)
-
-            if distance < best_distance:
-                best_distance = distance
-                best_move = move
-
-        self.direction = best_move
+        head, tail = self.interpolated_ends(t)
+        drawn = 0
+        if tail is not None and view.visible(*tail):
+            self._draw_cell(surface, self.color, *tail, view)
+            drawn += 1
+        x0, y0 = view.x0, view.y0
+        x1, y1 = x0 + view.cols, y0 + view.rows
+        for x, y in islice(self.positions, 1, None):
+            if x0 <= x < x1 and y0 <= y < y1:
+                self._draw_cell(surface, self.color, x, y, view)
+                drawn += 1
+        if view.visible(*head):
+            self._draw_cell(surface, self.dark_color, *head, view)
+            drawn += 1
+        return drawn
+
+    @staticmethod
+    def _draw_cell(surface: pygame.Surface, color: Tuple[int, int, int],
+                   x: float, y: float, view: Viewport):
+        """Draw one outlined cell at a (possibly fractional) grid position."""
+        r = view.cell_rect(x, y)
+        pygame.draw.rect(surface, color, r)
+        if r.width >= OUTLINE_MIN_CELL:
+            pygame.draw.rect(surface, WHITE, r, 1)
 
-class Food:
+class Food(FoodLogic):
     """
     Food item that snakes can eat to grow.
-    Handles random spawning and rendering.
+    Spawning comes from the engine; this class adds rendering.
     """
 
     def __init__(self):
         """Initialize food with default position and color."""
-        self.position = (0, 0)
+        super().__init__()
         self.color = RED
 
-    def randomize_position(self, snake: Optional[Snake] = None):
-        """
-        Randomize food position, avoiding occupied snake positions.
-
-        Args:
-            snake: Optional snake to avoid when spawning
-
-        Note:
-            If all positions are occupied (rare), falls back to random placement
-        """
-        if snake is None:
-            self.position = (random.randint(0, GRID_COUNT-1),
-                            random.randint(0, GRID_COUNT-1))
-            return
-
-        # Get all occupied positions
-        occupied = set(snake.positions)
-
-        # Find valid positions
-        max_attempts = 100
-        for _ in range(max_attempts):
-            new_pos = (random.randint(0, GRID_COUNT-1),
-                      random.randint(0, GRID_COUNT-1))
-            if new_pos not in occupied:
-                self.position = new_pos
-                return
-
-        # Fallback: if we can't find a free spot after max_attempts, place randomly
-        self.position = (random.randint(0, GRID_COUNT-1),
-                        random.randint(0, GRID_COUNT-1))
-
-    def render(self, surface: pygame.Surface):
+    def render(self, surface: pygame.Surface, view: Viewport = DEFAULT_VIEW):
         """
         Render the food item on the given surface.
 
         Args:
             surface: Pygame surface to draw on
+            view: Camera mapping cells to pixels
         """
-        r = pygame.Rect((self.position[0] * GRID_SIZE,
-                        self.position[1] * GRID_SIZE),
-                       (GRID_SIZE, GRID_SIZE))
+        r = view.cell_rect(*self.position)
         pygame.draw.rect(surface, self.color, r)
-        pygame.draw.rect(surface, WHITE, r, 1)
+        if r.width >= OUTLINE_MIN_CELL:
+            pygame.draw.rect(surface, WHITE, r, 1)
 
-def show_game_over(screen: pygame.Surface, score: int):
+def show_game_over(screen: pygame.Surface, score: int, title: str = 'AI Crashed!'):
     """
     Display the game over screen with final score.
 
     Args:
         screen: Pygame surface to render on
         score: Final score to display
+        title: Headline, e.g. a win message when the board is full
     """
-    font = pygame.font.Font(None, 74)
-    small_font = pygame.font.Font(None, 36)
-
-    game_over_text = font.render('AI Crashed!', True, WHITE)
-    score_text = small_font.render(f'Final Score: {score}', True, WHITE)
-    restart_text = small_font.render('Press SPACE to restart', True, GRAY)
+    game_over_text = render_text(title, 74, WHITE)
+    score_text = render_text(f'Final Score: {score}', 36, WHITE)
+    restart_text = render_text('Press SPACE to restart', 36, GRAY)
 
     screen.blit(game_over_text,
                 (WINDOW_SIZE//2 - game_over_text.get_width()//2,
@@ -294,11 +182,8 @@ def show_pause_screen(screen: pygame.Surface):
     overlay.fill(BLACK)
     screen.blit(overlay, (0, 0))
 
-    font = pygame.font.Font(None, 74)
-    small_font = pygame.font.Font(None, 36)
-
-    pause_text = font.render('PAUSED', True, WHITE)
-    continue_text = small_font.render('Press P to continue', True, GRAY)
+    pause_text = render_text('PAUSED', 74, WHITE)
+    continue_text = render_text('Press P to continue', 36, GRAY)
 
     screen.blit(pause_text,
                 (WINDOW_SIZE//2 - pause_text.get_width()//2,
@@ -308,24 +193,44 @@ def show_pause_screen(screen: pygame.Surface):
                  WINDOW_SIZE//2 + 20))
     pygame.display.update()
 
-def ai_only_mode():
+def ai_only_mode(hamiltonian: bool = False, record_dir: Optional[str] = None,
+                 grid_count: int = GRID_COUNT):
     """
     AI-only mode where you watch a single AI snake play the game.
     The AI navigates autonomously to collect food and grow.
+
+    Args:
+        hamiltonian: Use the board-filling Hamiltonian-cycle AI instead of
+            the flood-fill guarded shortest-path AI
+        record_dir: If set, the session's replay is saved there at every game over
+        grid_count: Board size in cells; boards too big for the window scroll
     """
     # Initialize AI snake
-    ai_snake = AISnake(CYAN, DARK_CYAN, (GRID_COUNT // 2, GRID_COUNT // 2))
-
+    if hamiltonian:
+        policy = HamiltonianPolicy()
+    else:
+        policy = FloodFillPolicy(PathfindingPolicy())
     food = Food()
-    food.randomize_position(ai_snake)
-    font = pygame.font.Font(None, 36)
-    small_font = pygame.font.Font(None, 24)
+    game = GameState(food=food, grid_count=grid_count)
+    recorder = (ReplayRecorder(game, record_path(record_dir, 'ai_only'))
+                if record_dir else None)
+    ai_snake = game.add_snake(AISnake(CYAN, DARK_CYAN, (grid_count // 2, grid_count // 2),
+                                      policy))
+    view = Viewport(grid_count, WINDOW_SIZE, WINDOW_SIZE)
+    game.spawn_food()
     game_over = False
+    board_full = False
     paused = False
     ai_move_counter = 0
+    scheduler = FixedTimestep(TICK_RATE, turbo_budget=0.75 / FPS)
+    dt = 0.0
+    profiler = FrameProfiler('ai_only', FPS)
 
     while True:
+        profiler.begin_frame()
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -333,9 +238,10 @@ def ai_only_mode():
                 if game_over:
                     if event.key == pygame.K_SPACE:
                         # Reset AI snake
-                        ai_snake = AISnake(CYAN, DARK_CYAN, (GRID_COUNT // 2, GRID_COUNT // 2))
-                        food.randomize_position(ai_snake)
+                        game.reset_snake(ai_snake)
+                        game.spawn_food()
                         game_over = False
+                        board_full = False
                     elif event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
                         pygame.quit()
                         sys.exit()
@@ -345,60 +251,100 @@ def ai_only_mode():
                 else:  # Game is running
                     if event.key == pygame.K_p:
                         paused = True
+                    elif event.key == pygame.K_t:
+                        scheduler.turbo = not scheduler.turbo
+                        scheduler.reset()
                     elif event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
                         pygame.quit()
                         sys.exit()
 
-        # Update game state
-        if not game_over and not paused:
-            ai_move_counter += 1
-
-            if ai_move_counter >= AI_MOVE_DELAY:
-                ai_move_counter = 0
+        profiler.lap('input')
 
-                # AI decision making
-                ai_snake.ai_move(food.position)
-
-                # Update AI position
-                if not ai_snake.update():
-                    game_over = True
-                    continue
-
-                # Check food collision
-                if ai_snake.get_head_position() == food.position:
-                    ai_snake.length += 1
-                    ai_snake.score += 1
-                    food.randomize_position(ai_snake)
+        # Update game state at a fixed tick rate; in turbo the AI moves
+        # every tick and runs as many ticks as fit in the frame budget
+        move_delay = 1 if scheduler.turbo else AI_MOVE_DELAY
+        if not game_over and not paused:
+            for _ in scheduler.ticks(dt):
+                game.tick += 1
+                ai_move_counter += 1
+
+                if ai_move_counter >= move_delay:
+                    ai_move_counter = 0
+
+                    # AI decision making
+                    ai_snake.ai_move(food.position, game.snakes)
+                    profiler.lap('ai')
+
+                    # Update AI position
+                    if game.move_snakes([ai_snake]):
+                        # On odd boards the cycle misses one cell, so a
+                        # Hamiltonian snake stops one short of filling it
+                        board_full = hamiltonian and policy.board_filled(game.board)
+                        game_over = True
+                        break
+                    profiler.lap('move')
+
+                    # Check food collision
+                    game.check_food()
+                    profiler.lap('food')
+                    if game.won:
+                        board_full = True
+                        game_over = True
+                        break
+            if game_over and recorder is not None:
+                recorder.save()
+            profiler.lap('update')
 
         # Draw everything
         screen.fill(BLACK)
-        ai_snake.render(screen)
-        food.render(screen)
+        ai_t = 1.0 if game_over else min(
+            1.0, (ai_move_counter + scheduler.alpha) / move_delay)
+        view.follow(ai_snake.get_head_position())
+        draw_calls = ai_snake.render(screen, ai_t, view) + 2
+        food.render(screen, view)
 
         # Display stats
-        score_text = font.render(f'Score: {ai_snake.score}', True, WHITE)
-        length_text = small_font.render(f'Length: {ai_snake.length}', True, WHITE)
-        mode_text = small_font.render('AI Only Mode - P:Pause ESC/Q:Quit', True, GRAY)
-        watch_text = font.render('Watch the AI Play!', True, CYAN)
+        score_text = render_text(f'Score: {ai_snake.score}', 36, WHITE)
+        length_text = render_text(f'Length: {ai_snake.length}', 24, WHITE)
+        mode_text = render_text('AI Only Mode - P:Pause T:Turbo ESC/Q:Quit', 24, GRAY)
+        watch_text = render_text('Watch the AI Play!', 36, CYAN)
 
         screen.blit(score_text, (10, 10))
         screen.blit(length_text, (10, 45))
+        if scheduler.turbo:
+            turbo_text = render_text('TURBO', 24, RED)
+            screen.blit(turbo_text, (WINDOW_SIZE - turbo_text.get_width() - 10, 45))
         screen.blit(watch_text, (WINDOW_SIZE//2 - watch_text.get_width()//2, 10))
         screen.blit(mode_text, (10, WINDOW_SIZE - 25))
+        draw_calls += 4 + scheduler.turbo
 
         if game_over:
-            show_game_over(screen, ai_snake.score)
+            show_game_over(screen, ai_snake.score,
+                           'Board Full!' if board_full else 'AI Crashed!')
         elif paused:
             show_pause_screen(screen)
+        profiler.draw_overlay(screen)
+        profiler.lap('draw')
 
         pygame.display.update()
-        clock.tick(FPS)
+        profiler.lap('present')
+        dt = clock.tick(FPS) / 1000.0
+        profiler.lap('idle')
+        profiler.end_frame(draw_calls)
 
 def main():
     """
     Main entry point - directly starts AI-only mode.
+    Pass --hamiltonian to watch the board-filling Hamiltonian-cycle AI
+    (on odd boards it fills every cell but one, which counts as full),
+    --record DIR to save a replay of every game into DIR and --grid N to
+    play on an N x N board.
     """
-    ai_only_mode()
+    record_dir = sys.argv[sys.argv.index('--record') + 1] if '--record' in sys.argv else None
+    grid_count = int(sys.argv[sys.argv.index('--grid') + 1]) if '--grid' in sys.argv else GRID_COUNT
+    init_display()
+    ai_only_mode(hamiltonian='--hamiltonian' in sys.argv, record_dir=record_dir,
+                 grid_count=grid_count)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,221 @@
+"""
+Python Snake Game - AI Arena
+Hundreds of AI snakes compete for several food items on a large board.
+
+The board is drawn straight from the engine's occupancy grid: visible
+cells are mapped to palette indices with NumPy, written into an 8-bit
+surface of one pixel per cell and scaled up to the window in a single blit.
+Drawing costs the same however many snakes there are and however long they
+grow; only the heads and the food are placed one by one.
+
+Usage:
+    python main_arena.py [--snakes N] [--foods N] [--grid N]
+"""
+import colorsys
+import pygame
+import sys
+from typing import List, Tuple
+
+import numpy as np
+
+import main as classic
+from main import FPS, TICK_RATE, WINDOW_SIZE, BLACK, WHITE, RED, GRAY, init_display
+from snake_arena import ARENA_FOODS, ARENA_GRID, ARENA_SNAKES, Arena
+from snake_engine import MAX_SNAKE_ID, FixedTimestep
+from snake_profile import FrameProfiler
+from snake_text import render_text
+from snake_viewport import Viewport
+
+ARENA_MOVE_DELAY = 3  # Snakes move every 3 ticks (~10 moves/sec)
+
+# Palette indices of the 8-bit board surface: empty, food, then a band of
+# body colors and the same hues darkened for the heads
+EMPTY_INDEX = 0
+FOOD_INDEX = 1
+BODY_INDEX = 2
+HUES = 127
+HEAD_INDEX = BODY_INDEX + HUES
+
+
+def _palette() -> List[Tuple[int, int, int]]:
+    """Board colors by palette index."""
+    colors = [BLACK, RED]
+    for value in (1.0, 0.6):  # Bodies, then heads
+        for i in range(HUES):
+            # Golden-ratio hue steps keep consecutive ids far apart; the red
+            # end of the wheel is left to the food
+            hue = 0.08 + (i * 0.618034) % 0.84
+            r, g, b = colorsys.hsv_to_rgb(hue, 0.85, value)
+            colors.append((int(r * 255), int(g * 255), int(b * 255)))
+    return colors
+
+
+class GridRenderer:
+    """Draws an arena's visible cells from its occupancy grid."""
+
+    def __init__(self, surface: pygame.Surface, view: Viewport):
+        """
+        Initialize the renderer.
+
+        Args:
+            surface: Display surface to draw on
+            view: Camera mapping board cells to pixels
+        """
+        self.surface = surface
+        self.view = view
+        self.pixels = pygame.Surface((view.cols, view.rows), depth=8)
+        self.pixels.set_palette(_palette())
+        # Owner id -> body palette index
+        self.lut = np.zeros(MAX_SNAKE_ID + 1, dtype=np.uint8)
+        self.lut[1:] = BODY_INDEX + np.arange(MAX_SNAKE_ID) % HUES
+
+    def draw(self, arena: Arena) -> pygame.Rect:
+        """
+        Draw the board, the heads and the food.
+
+        Args:
+            arena: Game to draw
+
+        Returns:
+            The screen rect covered by the board
+        """
+        view = self.view
+        n = arena.grid_count
+        x0, y0 = view.x0, view.y0
+        x1, y1 = x0 + view.cols, y0 + view.rows
+        grid = np.frombuffer(arena.board.cells, dtype=np.uint16).reshape(n, n)
+        index = self.lut[grid[y0:y1, x0:x1]]
+
+        snakes = arena.snakes
+        if snakes:
+            heads = np.array([(*s.positions[0], s.id) for s in snakes], dtype=np.int64)
+            self._put(index, heads[:, 0], heads[:, 1],
+                      self.lut[heads[:, 2]] + (HEAD_INDEX - BODY_INDEX))
+        food = np.array([f.position for f in arena.foods], dtype=np.int64)
+        self._put(index, food[:, 0], food[:, 1], FOOD_INDEX)
+
+        pygame.surfarray.blit_array(self.pixels, index.T)
+        size = (view.cols * view.cell, view.rows * view.cell)
+        return self.surface.blit(pygame.transform.scale(self.pixels, size), (0, 0))
+
+    def _put(self, index: np.ndarray, xs: np.ndarray, ys: np.ndarray, values):
+        """Write palette values at the board cells that are in view."""
+        view = self.view
+        xs = xs - view.x0
+        ys = ys - view.y0
+        keep = (xs >= 0) & (xs < view.cols) & (ys >= 0) & (ys < view.rows)
+        if not isinstance(values, int):
+            values = values[keep]
+        index[ys[keep], xs[keep]] = values
+
+
+def arena_mode(screen: pygame.Surface, clock: pygame.time.Clock,
+               num_snakes: int = ARENA_SNAKES, num_foods: int = ARENA_FOODS,
+               grid_count: int = ARENA_GRID):
+    """
+    Watch an AI arena. P pauses, T toggles turbo, the arrow keys scroll
+    boards larger than the window and ESC returns.
+
+    Args:
+        screen: Display surface
+        clock: Frame clock
+        num_snakes: Number of AI snakes
+        num_foods: Number of food items
+        grid_count: Board size in cells
+    """
+    arena = Arena(num_snakes, num_foods, grid_count)
+    view = Viewport(grid_count, WINDOW_SIZE, WINDOW_SIZE)
+    renderer = GridRenderer(screen, view)
+    pan = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0),
+           pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+    paused = False
+    move_counter = 0
+    deaths = 0
+    scheduler = FixedTimestep(TICK_RATE, turbo_budget=0.75 / FPS)
+    dt = 0.0
+    profiler = FrameProfiler('arena', FPS)
+
+    while True:
+        profiler.begin_frame()
+        for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return
+                elif event.key == pygame.K_p:
+                    paused = not paused
+                elif event.key == pygame.K_t:
+                    scheduler.turbo = not scheduler.turbo
+                    scheduler.reset()
+                elif event.key in pan:
+                    dx, dy = pan[event.key]
+                    view.pan(dx * view.cols // 4, dy * view.rows // 4)
+
+        profiler.lap('input')
+
+        move_delay = 1 if scheduler.turbo else ARENA_MOVE_DELAY
+        if not paused:
+            for _ in scheduler.ticks(dt):
+                arena.tick += 1
+                move_counter += 1
+                if move_counter < move_delay:
+                    continue
+                move_counter = 0
+                arena.decide()
+                profiler.lap('ai')
+                deaths += len(arena.advance())
+                profiler.lap('move')
+                arena.check_food()
+                profiler.lap('food')
+            profiler.lap('update')
+
+        screen.fill(BLACK)
+        renderer.draw(arena)
+        profiler.lap('draw')
+
+        longest = max((s.length for s in arena.snakes), default=0)
+        stats_text = render_text(f'Snakes: {len(arena.snakes)}  Longest: {longest}  '
+                                 f'Deaths: {deaths}', 24, WHITE)
+        mode_text = render_text('AI Arena - P:Pause T:Turbo Arrows:Scroll ESC:Back',
+                                24, GRAY)
+        screen.blit(stats_text, (10, 10))
+        screen.blit(mode_text, (10, WINDOW_SIZE - 25))
+        draw_calls = 4
+        if scheduler.turbo:
+            turbo_text = render_text('TURBO', 24, RED)
+            screen.blit(turbo_text, (WINDOW_SIZE - turbo_text.get_width() - 10, 10))
+            draw_calls += 1
+        elif paused:
+            paused_text = render_text('PAUSED', 24, WHITE)
+            screen.blit(paused_text, (WINDOW_SIZE - paused_text.get_width() - 10, 10))
+            draw_calls += 1
+        profiler.draw_overlay(screen)
+        profiler.lap('hud')
+
+        pygame.display.update()
+        profiler.lap('present')
+        dt = clock.tick(FPS) / 1000.0
+        profiler.lap('idle')
+        profiler.end_frame(draw_calls)
+
+
+def _flag(name: str, default: int) -> int:
+    """Integer value following a command-line flag, or the default."""
+    return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+
+def main():
+    """Start the arena; --snakes, --foods and --grid set its size."""
+    init_display()
+    pygame.display.set_caption('Snake Game - AI Arena')
+    arena_mode(classic.screen, classic.clock, _flag('--snakes', ARENA_SNAKES),
+               _flag('--foods', ARENA_FOODS), _flag('--grid', ARENA_GRID))
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,25 +3,31 @@ Tron-Style Neon Snake — standalone variant of the Snake game.
 All visuals rendered procedurally with pygame (no external assets).
 """
 import pygame
-import pygame.freetype
-import random
 import sys
 import math
 from collections import deque
+from functools import lru_cache
+from itertools import islice
 
-# ── Constants ──────────────────────────────────────────────────────────────────
-UP    = (0, -1)
-DOWN  = (0,  1)
-LEFT  = (-1, 0)
-RIGHT = (1,  0)
+import numpy as np
+
+from snake_engine import (UP, DOWN, LEFT, RIGHT, GRID_COUNT, GameState,
+                          SnakeLogic, ComputerSnakeLogic, FixedTimestep)
+from snake_ai import FloodFillPolicy, FoodDistanceField
+from snake_mcts import MCTSPolicy
+from snake_profile import FrameProfiler
+from snake_text import GLOW_PAD, render_glow_text
+from snake_viewport import Viewport
 
+# ── Constants ──────────────────────────────────────────────────────────────────
 FPS              = 30
-PLAYER_MOVE_DELAY = 3   # frames between player moves (~10/s)
-AI_MOVE_DELAY    = 5    # frames between AI moves (~6/s)
+TICK_RATE        = 30   # simulation ticks per second, independent of FPS
+PLAYER_MOVE_DELAY = 3   # ticks between player moves (~10/s)
+AI_MOVE_DELAY    = 5    # ticks between AI moves (~6/s)
 
-WINDOW_SIZE = 500
-GRID_SIZE   = 20
-GRID_COUNT  = WINDOW_SIZE // GRID_SIZE
+GRID_SIZE   = 20   # cell size in pixels; larger boards scroll instead of shrinking
+WINDOW_SIZE = GRID_COUNT * GRID_SIZE
+GRID_MAJOR  = 100  # spacing of the brighter grid lines
 
 # ── Neon Palette ───────────────────────────────────────────────────────────────
 NEON_BG       = (5,   5,   15)
@@ -38,180 +44,157 @@ GRID_LINE_COL = (0,   80,  120)
 TRAIL_LENGTH  = 15
 TRAIL_START_ALPHA = 160
 TRAIL_FADE_PER_FRAME = 6
+TRAIL_FADE_PER_MS = TRAIL_FADE_PER_FRAME * FPS / 1000   # same fade, frame-rate independent
+TRAIL_ALPHA_STEP  = 8    # alpha quantization of baked trail sprites
 
 GLOW_LAYERS   = 4
 BORDER_RADIUS = 5
+GLOW_CACHE_SIZE = 64   # baked glow sprites kept, least recently used dropped
 
-# ── Logic classes (no rendering) ───────────────────────────────────────────────
-
-class SnakeLogic:
-    def __init__(self):
-        self.reset()
-
-    def get_head_position(self):
-        return self.positions[0]
-
-    def reset(self):
-        self.length    = 1
-        self.positions = [(GRID_COUNT // 2, GRID_COUNT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
-        self.score     = 0
-
-    def update(self):
-        return self._move([])
-
-    def update_with_collision_check(self, all_snakes):
-        return self._move(all_snakes)
-
-    def _move(self, all_snakes):
-        cur = self.get_head_position()
-        nx = cur[0] + self.direction[0]
-        ny = cur[1] + self.direction[1]
-        new = (nx, ny)
-
-        if nx < 0 or nx >= GRID_COUNT or ny < 0 or ny >= GRID_COUNT:
-            return False
-        if new in self.positions[3:]:
-            return False
-        for other in all_snakes:
-            if other is not self and new in other.positions:
-                return False
-
-        self.positions.insert(0, new)
-        if len(self.positions) > self.length:
-            self.positions.pop()
-        return True
-
-
-class ComputerSnakeLogic(SnakeLogic):
-    def __init__(self, start_pos):
-        super().__init__()
-        self.positions = [start_pos]
-
-    def ai_move(self, food_pos, all_snakes):
-        head_x, head_y = self.get_head_position()
-        food_x, food_y = food_pos
-
-        occupied = set()
-        for s in all_snakes:
-            if s is not self:
-                occupied.update(s.positions)
-
-        candidates = []
-        for move in [UP, DOWN, LEFT, RIGHT]:
-            if move == (-self.direction[0], -self.direction[1]):
-                continue
-            nx, ny = head_x + move[0], head_y + move[1]
-            if nx < 0 or nx >= GRID_COUNT or ny < 0 or ny >= GRID_COUNT:
-                continue
-            if (nx, ny) in occupied or (nx, ny) in self.positions[1:]:
-                continue
-            candidates.append(move)
-
-        if not candidates:
-            return
-
-        best = min(candidates, key=lambda m: (
-            abs(head_x + m[0] - food_x) + abs(head_y + m[1] - food_y)
-        ))
-        self.direction = best
-
-
-class FoodLogic:
-    def __init__(self):
-        self.position = (0, 0)
-
-    def randomize_position(self, snakes):
-        occupied = set()
-        for s in snakes:
-            occupied.update(s.positions)
-        for _ in range(100):
-            p = (random.randint(0, GRID_COUNT - 1), random.randint(0, GRID_COUNT - 1))
-            if p not in occupied:
-                self.position = p
-                return
-        self.position = (random.randint(0, GRID_COUNT - 1), random.randint(0, GRID_COUNT - 1))
-
+PARTICLE_CAPACITY = 2048   # live particles; the oldest are recycled beyond this
+PARTICLE_ALPHA_STEP = 8    # alpha quantization of baked particle sprites
 
 # ── Visual helpers ─────────────────────────────────────────────────────────────
 
 class TrailManager:
-    """Stores recent grid positions for a snake and fades them each display frame."""
+    """
+    Stores recent grid positions for a snake, newest first, each stamped
+    with the time it was recorded. Alpha is derived from the stamp when
+    drawing, so nothing is touched between moves.
+    """
 
     def __init__(self, color):
-        self.color  = color
-        self._trail = deque(maxlen=TRAIL_LENGTH)   # each entry: [grid_pos, alpha]
+        self.color    = color
+        self.segments = deque(maxlen=TRAIL_LENGTH)   # each entry: (grid_pos, ms)
 
     def record_move(self, grid_pos):
-        self._trail.appendleft([grid_pos, TRAIL_START_ALPHA])
-
-    def tick_fade(self):
-        for entry in self._trail:
-            entry[1] = max(0, entry[1] - TRAIL_FADE_PER_FRAME)
-
-    def get_segments(self):
-        return list(self._trail)  # [(pos, alpha), ...]
+        self.segments.appendleft((grid_pos, pygame.time.get_ticks()))
 
     def clear(self):
-        self._trail.clear()
+        self.segments.clear()
 
 
-class Particle:
-    __slots__ = ('x', 'y', 'vx', 'vy', 'alpha', 'color', 'radius', 'life')
+@lru_cache(maxsize=256)
+def _trail_sprite(color, alpha):
+    """Bake one trail outline; alpha is pre-quantized to TRAIL_ALPHA_STEP."""
+    surf = pygame.Surface((GRID_SIZE - 4, GRID_SIZE - 4), pygame.SRCALPHA)
+    pygame.draw.rect(surf, (*color, alpha), surf.get_rect(),
+                     width=2, border_radius=BORDER_RADIUS)
+    return surf
 
-    def __init__(self, x, y, color):
-        angle   = random.uniform(0, 2 * math.pi)
-        speed   = random.uniform(1.5, 4.5)
-        self.x      = float(x)
-        self.y      = float(y)
-        self.vx     = math.cos(angle) * speed
-        self.vy     = math.sin(angle) * speed
-        self.alpha  = 255
-        self.color  = color
-        self.radius = random.randint(2, 5)
-        self.life   = random.randint(20, 40)
 
-    def update(self):
-        self.x  += self.vx
-        self.y  += self.vy
-        self.vx *= 0.93
-        self.vy *= 0.93
-        self.alpha = max(0, self.alpha - 255 // self.life)
-        self.life -= 1
-        return self.life > 0
+@lru_cache(maxsize=512)
+def _particle_sprite(color, radius, alpha):
+    """Bake one particle circle; alpha is pre-quantized to keep the cache small."""
+    surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (*color, alpha), (radius, radius), radius)
+    return surf
 
 
 class ParticleSystem:
-    def __init__(self):
-        self._particles = []
+    """
+    Fixed-capacity particle pool stored as NumPy arrays (structure of
+    arrays). Live particles occupy slots [0, count); each frame they are
+    integrated in one vectorized step, dead ones are compacted out, and the
+    survivors are stamped as cached circle sprites with one Surface.blits.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count    = 0
+        self.rng      = np.random.default_rng()
+        self.x        = np.zeros(capacity, dtype=np.float32)
+        self.y        = np.zeros(capacity, dtype=np.float32)
+        self.vx       = np.zeros(capacity, dtype=np.float32)
+        self.vy       = np.zeros(capacity, dtype=np.float32)
+        self.alpha    = np.zeros(capacity, dtype=np.int32)
+        self.life     = np.zeros(capacity, dtype=np.int32)
+        self.radius   = np.zeros(capacity, dtype=np.int32)
+        self.color_id = np.zeros(capacity, dtype=np.int32)
+        self._colors  = []   # palette, indexed by color_id
+        self._fields  = (self.x, self.y, self.vx, self.vy, self.alpha,
+                         self.life, self.radius, self.color_id)
+
+    def _color_id(self, color):
+        color = tuple(min(255, c) for c in color)
+        if color not in self._colors:
+            self._colors.append(color)
+        return self._colors.index(color)
 
     def explode(self, grid_pos, color, count=18):
-        px = grid_pos[0] * GRID_SIZE + GRID_SIZE // 2
-        py = grid_pos[1] * GRID_SIZE + GRID_SIZE // 2
-        for _ in range(count):
-            self._particles.append(Particle(px, py, color))
-
-    def update_and_draw(self, surface):
-        surviving = []
-        for p in self._particles:
-            if p.update():
-                surviving.append(p)
-                r, g, b = p.color
-                col = (min(255, r), min(255, g), min(255, b), int(p.alpha))
-                pygame.draw.circle(surface, col, (int(p.x), int(p.y)), p.radius)
-        self._particles = surviving
+        count = min(count, self.capacity)
+        overflow = self.count + count - self.capacity
+        if overflow > 0:
+            # Recycle the oldest slots, which sit at the front of the pool
+            keep = self.count - overflow
+            for a in self._fields:
+                a[:keep] = a[overflow:self.count]
+            self.count = keep
+
+        n, rng = self.count, self.rng
+        s = slice(n, n + count)
+        angle = rng.uniform(0, 2 * math.pi, count)
+        speed = rng.uniform(1.5, 4.5, count)
+        self.x[s]        = grid_pos[0] * GRID_SIZE + GRID_SIZE // 2
+        self.y[s]        = grid_pos[1] * GRID_SIZE + GRID_SIZE // 2
+        self.vx[s]       = np.cos(angle) * speed
+        self.vy[s]       = np.sin(angle) * speed
+        self.alpha[s]    = 255
+        self.radius[s]   = rng.integers(2, 6, count)
+        self.life[s]     = rng.integers(20, 41, count)
+        self.color_id[s] = self._color_id(color)
+        self.count = n + count
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        life, alpha = self.life[:n], self.alpha[:n]
+        x += vx
+        y += vy
+        vx *= 0.93
+        vy *= 0.93
+        np.maximum(alpha - 255 // life, 0, out=alpha)
+        life -= 1
+
+        alive = np.flatnonzero(life > 0)
+        if len(alive) < n:
+            for a in self._fields:
+                a[:len(alive)] = a[alive]
+            self.count = len(alive)
+
+    def update_and_draw(self, surface, offset=(0, 0)):
+        """Advance and draw all particles shifted by -offset; returns the number drawn."""
+        self.update()
+        n = self.count
+        if not n:
+            return 0
+        step   = PARTICLE_ALPHA_STEP
+        alpha  = (self.alpha[:n] // step * step).tolist()
+        radius = self.radius[:n].tolist()
+        left   = (self.x[:n].astype(np.int32) - self.radius[:n] - offset[0]).tolist()
+        top    = (self.y[:n].astype(np.int32) - self.radius[:n] - offset[1]).tolist()
+        colors = [self._colors[i] for i in self.color_id[:n].tolist()]
+        flags  = pygame.BLEND_RGBA_MAX
+        surface.blits([(_particle_sprite(c, r, a), (lx, ty), None, flags)
+                       for c, r, a, lx, ty in zip(colors, radius, alpha, left, top)],
+                      doreturn=False)
+        return n
 
 
 # ── Pre-built static surfaces ──────────────────────────────────────────────────
 
 def _build_grid_surface():
-    surf = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE), pygame.SRCALPHA)
-    for x in range(0, WINDOW_SIZE, GRID_SIZE):
-        alpha = 55 if x % 100 == 0 else 35
-        pygame.draw.line(surf, (*GRID_LINE_COL, alpha), (x, 0), (x, WINDOW_SIZE))
-    for y in range(0, WINDOW_SIZE, GRID_SIZE):
-        alpha = 55 if y % 100 == 0 else 35
-        pygame.draw.line(surf, (*GRID_LINE_COL, alpha), (0, y), (WINDOW_SIZE, y))
+    # one major spacing larger than the window, so a scrolled view is a sub-rect
+    size = WINDOW_SIZE + GRID_MAJOR
+    surf = pygame.Surface((size, size), pygame.SRCALPHA)
+    for x in range(0, size, GRID_SIZE):
+        alpha = 55 if x % GRID_MAJOR == 0 else 35
+        pygame.draw.line(surf, (*GRID_LINE_COL, alpha), (x, 0), (x, size))
+    for y in range(0, size, GRID_SIZE):
+        alpha = 55 if y % GRID_MAJOR == 0 else 35
+        pygame.draw.line(surf, (*GRID_LINE_COL, alpha), (0, y), (size, y))
     return surf
 
 
@@ -222,69 +205,121 @@ def _build_scanline_surface():
     return surf
 
 
+@lru_cache(maxsize=GLOW_CACHE_SIZE)
+def _glow_sprite(color, layers, br):
+    """
+    Bake one glowing cell (halo layers plus bright core) into an SRCALPHA
+    sprite. Returns (sprite, offset of the sprite from the cell's corner).
+    """
+    r, g, b = color
+    pad  = layers * 3
+    core = GRID_SIZE - 2
+    surf = pygame.Surface((core + 2 * pad, core + 2 * pad), pygame.SRCALPHA)
+    rect = pygame.Rect(pad, pad, core, core)
+    for i in range(layers, 0, -1):
+        alpha   = int(180 / (i * 1.8))
+        inflate = i * 3
+        inflated = rect.inflate(inflate * 2, inflate * 2)
+        pygame.draw.rect(surf, (r, g, b, alpha), inflated,
+                         border_radius=br + inflate)
+    pygame.draw.rect(surf, (r, g, b, 240), rect, border_radius=br)
+    return surf, 1 - pad
+
+
 # ── NeonRenderer ──────────────────────────────────────────────────────────────
 
 class NeonRenderer:
-    """Owns the glow surface and drives all draw calls."""
+    """
+    Owns the glow surface and drives all draw calls. Positions are board
+    cells; a Viewport scrolls boards larger than the window, and world
+    pixels are shifted by its offset (ox, oy) when drawn.
+    """
 
-    def __init__(self, screen):
+    def __init__(self, screen, grid_count=GRID_COUNT):
         self.screen       = screen
+        self.view         = Viewport(grid_count, WINDOW_SIZE, WINDOW_SIZE, cell_size=GRID_SIZE)
+        self.ox = self.oy = 0
         self.glow_surf    = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE), pygame.SRCALPHA)
         self.grid_surf    = _build_grid_surface()
         self.scanline_surf = _build_scanline_surface()
-        pygame.freetype.init()
-        self._ft = pygame.freetype.Font(None, 36)
+        self.draw_calls    = 0   # fills, blits and shapes issued this frame
 
     # ── Public frame lifecycle ──────────────────────────────────────────────
 
-    def begin_frame(self):
+    def begin_frame(self, focus=None):
+        """focus: optional cell the camera keeps in view, e.g. the player's head."""
+        view = self.view
+        if focus is not None:
+            view.follow(focus)
+        self.ox, self.oy = ox, oy = view.offset
+        board = view.grid_count * GRID_SIZE
         self.screen.fill(NEON_BG)
-        self.screen.blit(self.grid_surf, (0, 0))
+        self.screen.blit(self.grid_surf, (0, 0),
+                         (ox % GRID_MAJOR, oy % GRID_MAJOR,
+                          min(WINDOW_SIZE, board - ox), min(WINDOW_SIZE, board - oy)))
         self.glow_surf.fill((0, 0, 0, 0))
+        self.draw_calls = 3
 
     def commit_glow(self):
         self.screen.blit(self.glow_surf, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        self.draw_calls += 1
 
     def commit_scanlines(self):
         self.screen.blit(self.scanline_surf, (0, 0))
+        self.draw_calls += 1
 
     # ── Glow drawing helpers ────────────────────────────────────────────────
 
-    def draw_glow_rect(self, surface, color, grid_pos, layers=GLOW_LAYERS, br=BORDER_RADIUS):
-        r, g, b = color
-        rect = pygame.Rect(
-            grid_pos[0] * GRID_SIZE + 1,
-            grid_pos[1] * GRID_SIZE + 1,
-            GRID_SIZE - 2,
-            GRID_SIZE - 2,
-        )
-        for i in range(layers, 0, -1):
-            alpha   = int(180 / (i * 1.8))
-            inflate = i * 3
-            inflated = rect.inflate(inflate * 2, inflate * 2)
-            pygame.draw.rect(surface, (r, g, b, alpha), inflated,
-                             border_radius=br + inflate)
-        # bright core
-        pygame.draw.rect(surface, (r, g, b, 240), rect, border_radius=br)
+    # Glow sprites are combined with BLEND_RGBA_MAX so overlapping halos
+    # brighten towards the stronger one instead of covering a neighbour's core.
 
-    def draw_trail(self, trail_segments, color):
-        r, g, b = color
-        for pos, alpha in trail_segments:
-            if alpha <= 0:
-                continue
-            rect = pygame.Rect(
-                pos[0] * GRID_SIZE + 2,
-                pos[1] * GRID_SIZE + 2,
-                GRID_SIZE - 4,
-                GRID_SIZE - 4,
-            )
-            pygame.draw.rect(self.glow_surf, (r, g, b, alpha), rect,
-                             width=2, border_radius=BORDER_RADIUS)
-
-    def draw_snake(self, positions, body_color, head_color):
-        for i, pos in enumerate(positions):
-            col = head_color if i == 0 else body_color
-            self.draw_glow_rect(self.glow_surf, col, pos)
+    def _glow_blit(self, color, grid_pos, layers=GLOW_LAYERS, br=BORDER_RADIUS):
+        sprite, offset = _glow_sprite(tuple(color), layers, br)
+        return (sprite,
+                (round(grid_pos[0] * GRID_SIZE) + offset - self.ox,
+                 round(grid_pos[1] * GRID_SIZE) + offset - self.oy),
+                None, pygame.BLEND_RGBA_MAX)
+
+    def draw_glow_rect(self, surface, color, grid_pos, layers=GLOW_LAYERS, br=BORDER_RADIUS):
+        surface.blit(*self._glow_blit(color, grid_pos, layers, br))
+        self.draw_calls += 1
+
+    def draw_trails(self, trails):
+        """Draw every trail's fading outlines with one batched blit."""
+        now   = pygame.time.get_ticks()
+        step  = TRAIL_ALPHA_STEP
+        flags = pygame.BLEND_RGBA_MAX
+        ox, oy = self.ox - 2, self.oy - 2
+        batch = []
+        for trail in trails:
+            color = tuple(trail.color)
+            for pos, stamp in trail.segments:
+                alpha = int(TRAIL_START_ALPHA - (now - stamp) * TRAIL_FADE_PER_MS)
+                if alpha < step:
+                    break   # newest first, so the rest have faded too
+                batch.append((_trail_sprite(color, alpha // step * step),
+                              (pos[0] * GRID_SIZE - ox, pos[1] * GRID_SIZE - oy),
+                              None, flags))
+        self.glow_surf.blits(batch, doreturn=False)
+        self.draw_calls += len(batch)
+
+    def draw_snake(self, positions, body_color, head_color, ends=None):
+        """ends: optional (head, vacated tail) from SnakeLogic.interpolated_ends."""
+        head, tail = ends if ends is not None else (positions[0], None)
+        blit = self._glow_blit
+        view = self.view
+        if view.scrolls:   # skip body cells off screen (halos reach one cell out)
+            x0, y0 = view.x0 - 1, view.y0 - 1
+            x1, y1 = view.x0 + view.cols + 1, view.y0 + view.rows + 1
+            batch = [blit(body_color, pos) for pos in islice(positions, 1, None)
+                     if x0 <= pos[0] < x1 and y0 <= pos[1] < y1]
+        else:
+            batch = [blit(body_color, pos) for pos in islice(positions, 1, None)]
+        if tail is not None:
+            batch.append(blit(body_color, tail))
+        batch.append(blit(head_color, head))
+        self.glow_surf.blits(batch, doreturn=False)
+        self.draw_calls += len(batch)
 
     def draw_food(self, position):
         t      = pygame.time.get_ticks() % 1000
@@ -292,8 +327,8 @@ class NeonRenderer:
         radius = int(GRID_SIZE // 2 + pulse * 4)
         bright = int(180 + pulse * 37.5)
         r, g, b = FOOD_CORE
-        cx = position[0] * GRID_SIZE + GRID_SIZE // 2
-        cy = position[1] * GRID_SIZE + GRID_SIZE // 2
+        cx = position[0] * GRID_SIZE + GRID_SIZE // 2 - self.ox
+        cy = position[1] * GRID_SIZE + GRID_SIZE // 2 - self.oy
 
         # glow rings
         for layer in range(4, 0, -1):
@@ -304,28 +339,22 @@ class NeonRenderer:
         # bright core
         core_col = (min(255, bright), min(255, bright), min(255, int(b * 0.8)), 240)
         pygame.draw.circle(self.glow_surf, core_col, (cx, cy), radius)
+        self.draw_calls += 5
 
     def draw_particles(self, particle_system):
-        particle_system.update_and_draw(self.glow_surf)
+        self.draw_calls += particle_system.update_and_draw(self.glow_surf, (self.ox, self.oy))
 
     # ── HUD text (freetype, drawn above glow) ──────────────────────────────
 
     def draw_text(self, text, pos, size=30, color=(255, 255, 255)):
-        self._ft.size = size
-        # glow offsets
-        offsets = [(-1, -1), (1, -1), (-1, 1), (1, 1),
-                   (-2, 0), (2, 0), (0, -2), (0, 2)]
-        r, g, b = color
-        for ox, oy in offsets:
-            self._ft.render_to(self.screen, (pos[0] + ox, pos[1] + oy),
-                               text, (min(255, r), min(255, g), min(255, b), 60))
-        self._ft.render_to(self.screen, pos, text, color)
+        surf = render_glow_text(text, size, color)
+        self.screen.blit(surf, (pos[0] - GLOW_PAD, pos[1] - GLOW_PAD))
+        self.draw_calls += 1
 
     def draw_text_centered(self, text, cy, size=36, color=(255, 255, 255)):
-        self._ft.size = size
-        rect, _ = self._ft.render(text, color)
-        x = WINDOW_SIZE // 2 - rect.get_width() // 2
-        self.draw_text(text, (x, cy), size=size, color=color)
+        surf = render_glow_text(text, size, color)
+        self.screen.blit(surf, (WINDOW_SIZE // 2 - surf.get_width() // 2, cy - GLOW_PAD))
+        self.draw_calls += 1
 
 
 # ── Menu ───────────────────────────────────────────────────────────────────────
@@ -365,8 +394,8 @@ def show_neon_menu(screen, clock):
 
 # ── Overlay helpers ────────────────────────────────────────────────────────────
 
-def _draw_game_over(renderer, score):
-    renderer.draw_text_centered('GAME OVER', WINDOW_SIZE // 2 - 60,
+def _draw_game_over(renderer, score, title='GAME OVER'):
+    renderer.draw_text_centered(title, WINDOW_SIZE // 2 - 60,
                                 size=60, color=UI_GAMEOVER)
     renderer.draw_text_centered(f'Score: {score}', WINDOW_SIZE // 2,
                                 size=36, color=(255, 200, 200))
@@ -383,29 +412,36 @@ def _draw_pause(renderer):
 
 # ── Single-player neon mode ────────────────────────────────────────────────────
 
-def neon_single_player(screen, clock):
-    renderer  = NeonRenderer(screen)
+def neon_single_player(screen, clock, grid_count=GRID_COUNT):
+    renderer  = NeonRenderer(screen, grid_count)
     particles = ParticleSystem()
     trail     = TrailManager(PLAYER_NEON)
 
-    snake = SnakeLogic()
-    food  = FoodLogic()
-    food.randomize_position([snake])
+    game  = GameState(grid_count=grid_count)
+    snake = game.add_snake(SnakeLogic())
+    food  = game.food
+    game.spawn_food()
 
     game_over   = False
     paused      = False
     move_counter = 0
     last_head   = snake.get_head_position()
+    scheduler   = FixedTimestep(TICK_RATE)
+    dt          = 0.0
+    profiler    = FrameProfiler('neon_single', FPS)
 
     while True:
+        profiler.begin_frame()
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if game_over:
                     if event.key == pygame.K_SPACE:
                         snake.reset()
-                        food.randomize_position([snake])
+                        game.spawn_food()
                         trail.clear()
                         game_over    = False
                         move_counter = 0
@@ -429,60 +465,89 @@ def neon_single_player(screen, clock):
                     elif event.key == pygame.K_ESCAPE:
                         return
 
+        profiler.lap('input')
+
         if not game_over and not paused:
-            move_counter += 1
-            if move_counter >= PLAYER_MOVE_DELAY:
+            for _ in scheduler.ticks(dt):
+                move_counter += 1
+                if move_counter < PLAYER_MOVE_DELAY:
+                    continue
                 move_counter = 0
                 trail.record_move(last_head)
-                if not snake.update():
+                if game.move_snakes([snake]):
                     particles.explode(snake.get_head_position(), PLAYER_NEON)
                     game_over = True
-                else:
-                    last_head = snake.get_head_position()
-                    if snake.get_head_position() == food.position:
-                        snake.length += 1
-                        snake.score  += 1
-                        food.randomize_position([snake])
-
-        trail.tick_fade()
-
-        renderer.begin_frame()
-        renderer.draw_trail(trail.get_segments(), PLAYER_NEON)
-        renderer.draw_snake(snake.positions, PLAYER_NEON, PLAYER_HEAD)
+                    break
+                last_head = snake.get_head_position()
+                profiler.lap('move')
+                game.check_food()
+                profiler.lap('food')
+                game_over = game.won
+                if game_over:
+                    break
+        profiler.lap('update')
+
+        renderer.begin_frame(snake.get_head_position())
+        renderer.draw_trails((trail,))
+        t = 1.0 if game_over else min(
+            1.0, (move_counter + scheduler.alpha) / PLAYER_MOVE_DELAY)
+        renderer.draw_snake(snake.positions, PLAYER_NEON, PLAYER_HEAD,
+                            snake.interpolated_ends(t))
         renderer.draw_food(food.position)
+        profiler.lap('draw')
         renderer.draw_particles(particles)
+        profiler.lap('particles')
         renderer.commit_glow()
+        profiler.lap('glow')
 
         renderer.draw_text(f'Score: {snake.score}', (10, 10), size=28, color=PLAYER_NEON)
         renderer.draw_text('P:Pause  ESC:Menu', (10, WINDOW_SIZE - 30),
                            size=20, color=(100, 100, 150))
 
         if game_over:
-            _draw_game_over(renderer, snake.score)
+            _draw_game_over(renderer, snake.score,
+                            'BOARD FULL' if game.won else 'GAME OVER')
         elif paused:
             _draw_pause(renderer)
 
         renderer.commit_scanlines()
+        profiler.draw_overlay(screen)
+        profiler.lap('hud')
         pygame.display.update()
-        clock.tick(FPS)
+        profiler.lap('present')
+        dt = clock.tick(FPS) / 1000.0
+        profiler.lap('idle')
+        profiler.end_frame(renderer.draw_calls)
 
 
 # ── AI / multiplayer neon mode ─────────────────────────────────────────────────
 
-def neon_ai_mode(screen, clock):
-    renderer  = NeonRenderer(screen)
+def neon_ai_mode(screen, clock, grid_count=GRID_COUNT, mcts_budget=None):
+    """mcts_budget: seconds of tree search per AI move; flood-fill AIs if None."""
+    renderer  = NeonRenderer(screen, grid_count)
     particles = ParticleSystem()
 
+    food_field = FoodDistanceField()  # Shared by the AI snakes, updated once per AI tick
+
     def _make_snakes():
-        player = SnakeLogic()
-        ai1    = ComputerSnakeLogic((5, 5))
-        ai2    = ComputerSnakeLogic((GRID_COUNT - 6, 5))
-        return player, [ai1, ai2]
+        game   = GameState(grid_count=grid_count)
+        player = game.add_snake(SnakeLogic())
+        return game, player, _make_ai(game)
+
+    def _policy():
+        if mcts_budget is not None:
+            return MCTSPolicy(budget=mcts_budget, field=food_field)
+        return FloodFillPolicy(field=food_field)
 
-    player_snake, ai_snakes = _make_snakes()
-    all_snakes   = [player_snake] + ai_snakes
-    food         = FoodLogic()
-    food.randomize_position(all_snakes)
+    def _make_ai(game):
+        ai1 = game.add_snake(ComputerSnakeLogic((5, 5), policy=_policy()))
+        ai2 = game.add_snake(ComputerSnakeLogic((grid_count - 6, 5), policy=_policy()))
+        return [ai1, ai2]
+
+    game, player_snake, ai_snakes = _make_snakes()
+    all_snakes   = game.snakes
+    food         = game.food
+    game.spawn_food()
 
     ai_colors = [(AI1_NEON, AI1_HEAD), (AI2_NEON, AI2_HEAD)]
 
@@ -494,17 +559,24 @@ def neon_ai_mode(screen, clock):
     move_counter   = 0
     ai_move_counter = 0
     player_last    = player_snake.get_head_position()
+    scheduler      = FixedTimestep(TICK_RATE)
+    dt             = 0.0
+    profiler       = FrameProfiler('neon_ai', FPS)
 
     while True:
+        profiler.begin_frame()
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if game_over:
                     if event.key == pygame.K_SPACE:
-                        player_snake, ai_snakes = _make_snakes()
-                        all_snakes = [player_snake] + ai_snakes
-                        food.randomize_position(all_snakes)
+                        game, player_snake, ai_snakes = _make_snakes()
+                        all_snakes = game.snakes
+                        food       = game.food
+                        game.spawn_food()
                         player_trail.clear()
                         for t in ai_trails:
                             t.clear()
@@ -531,76 +603,87 @@ def neon_ai_mode(screen, clock):
                     elif event.key == pygame.K_ESCAPE:
                         return
 
-        if not game_over and not paused:
-            move_counter    += 1
-            ai_move_counter += 1
+        profiler.lap('input')
 
-            player_moved = move_counter >= PLAYER_MOVE_DELAY
-            if player_moved:
-                move_counter = 0
-                player_trail.record_move(player_last)
-                if not player_snake.update_with_collision_check(all_snakes):
+        if not game_over and not paused:
+            for _ in scheduler.ticks(dt):
+                move_counter    += 1
+                ai_move_counter += 1
+
+                movers       = []
+                player_moved = move_counter >= PLAYER_MOVE_DELAY
+                if player_moved:
+                    move_counter = 0
+                    player_trail.record_move(player_last)
+                    movers.append(player_snake)
+
+                ai_moved = ai_move_counter >= AI_MOVE_DELAY
+                if ai_moved:
+                    ai_move_counter = 0
+                    food_field.update(game.board, food.position, ai_snakes)
+                    for ai in ai_snakes:
+                        ai.ai_move(food.position, all_snakes)
+                    profiler.lap('ai')
+                    for idx, ai in enumerate(ai_snakes):
+                        ai_trails[idx].record_move(ai.get_head_position())
+                    movers.extend(ai_snakes)
+
+                # Everyone due this tick moves at once, independent of list order
+                dead = set(game.move_simultaneous(movers)) if movers else set()
+                profiler.lap('move')
+                if player_snake in dead:
                     particles.explode(player_snake.get_head_position(), PLAYER_NEON)
                     game_over = True
-                    continue
-                player_last = player_snake.get_head_position()
-
-            ai_moved = ai_move_counter >= AI_MOVE_DELAY
-            if ai_moved:
-                ai_move_counter = 0
-                for ai in ai_snakes:
-                    ai.ai_move(food.position, all_snakes)
-
-                dead_ai = []
-                for idx, ai in enumerate(ai_snakes):
-                    ai_trails[idx].record_move(ai.get_head_position())
-                    if not ai.update_with_collision_check(all_snakes):
+                    break
+                if player_moved:
+                    player_last = player_snake.get_head_position()
+
+                if ai_moved:
+                    for idx in range(len(ai_snakes) - 1, -1, -1):
+                        ai = ai_snakes[idx]
+                        if ai not in dead:
+                            continue
                         neon_col = ai_colors[idx % len(ai_colors)][0]
                         particles.explode(ai.get_head_position(), neon_col)
-                        dead_ai.append((idx, ai))
-
-                for idx, ai in reversed(dead_ai):
-                    ai_snakes.pop(idx)
-                    all_snakes.remove(ai)
-                    ai_trails.pop(idx)
-                    ai_colors.pop(idx)
-
-                if not ai_snakes:
-                    a1 = ComputerSnakeLogic((5, 5))
-                    a2 = ComputerSnakeLogic((GRID_COUNT - 6, 5))
-                    ai_snakes = [a1, a2]
-                    ai_trails = [TrailManager(AI1_NEON), TrailManager(AI2_NEON)]
-                    ai_colors = [(AI1_NEON, AI1_HEAD), (AI2_NEON, AI2_HEAD)]
-                    all_snakes = [player_snake] + ai_snakes
-
-            if player_moved or ai_moved:
-                for snake in all_snakes:
-                    if snake.get_head_position() == food.position:
-                        snake.length += 1
-                        if snake is player_snake:
-                            snake.score += 1
-                        food.randomize_position(all_snakes)
+                        ai_snakes.pop(idx)
+                        game.remove_snake(ai)
+                        ai_trails.pop(idx)
+                        ai_colors.pop(idx)
+
+                    if not ai_snakes:
+                        ai_snakes = _make_ai(game)
+                        ai_trails = [TrailManager(AI1_NEON), TrailManager(AI2_NEON)]
+                        ai_colors = [(AI1_NEON, AI1_HEAD), (AI2_NEON, AI2_HEAD)]
+                    profiler.lap('move')
+
+                if player_moved or ai_moved:
+                    game.check_food()
+                    profiler.lap('food')
+                    game_over = game.won
+                    if game_over:
                         break
+        profiler.lap('update')
 
-        player_trail.tick_fade()
-        for t in ai_trails:
-            t.tick_fade()
+        renderer.begin_frame(player_snake.get_head_position())
 
-        renderer.begin_frame()
-
-        renderer.draw_trail(player_trail.get_segments(), PLAYER_NEON)
-        for idx, ai in enumerate(ai_snakes):
-            renderer.draw_trail(ai_trails[idx].get_segments(),
-                                ai_colors[idx % len(ai_colors)][0])
+        renderer.draw_trails([player_trail, *ai_trails])
 
-        renderer.draw_snake(player_snake.positions, PLAYER_NEON, PLAYER_HEAD)
+        player_t = 1.0 if game_over else min(
+            1.0, (move_counter + scheduler.alpha) / PLAYER_MOVE_DELAY)
+        ai_t = 1.0 if game_over else min(
+            1.0, (ai_move_counter + scheduler.alpha) / AI_MOVE_DELAY)
+        renderer.draw_snake(player_snake.positions, PLAYER_NEON, PLAYER_HEAD,
+                            player_snake.interpolated_ends(player_t))
         for idx, ai in enumerate(ai_snakes):
             nc, hc = ai_colors[idx % len(ai_colors)]
-            renderer.draw_snake(ai.positions, nc, hc)
+            renderer.draw_snake(ai.positions, nc, hc, ai.interpolated_ends(ai_t))
 
         renderer.draw_food(food.position)
+        profiler.lap('draw')
         renderer.draw_particles(particles)
+        profiler.lap('particles')
         renderer.commit_glow()
+        profiler.lap('glow')
 
         renderer.draw_text(f'Score: {player_snake.score}', (10, 10),
                            size=28, color=PLAYER_NEON)
@@ -610,18 +693,28 @@ def neon_ai_mode(screen, clock):
                            size=20, color=(100, 100, 150))
 
         if game_over:
-            _draw_game_over(renderer, player_snake.score)
+            _draw_game_over(renderer, player_snake.score,
+                            'BOARD FULL' if game.won else 'GAME OVER')
         elif paused:
             _draw_pause(renderer)
 
         renderer.commit_scanlines()
+        profiler.draw_overlay(screen)
+        profiler.lap('hud')
         pygame.display.update()
-        clock.tick(FPS)
+        profiler.lap('present')
+        dt = clock.tick(FPS) / 1000.0
+        profiler.lap('idle')
+        profiler.end_frame(renderer.draw_calls)
 
 
 # ── Standalone entry point ─────────────────────────────────────────────────────
 
 def main():
+    """Pass --grid N to play on an N x N board and --mcts MS for tree search AIs."""
+    grid_count  = int(sys.argv[sys.argv.index('--grid') + 1]) if '--grid' in sys.argv else GRID_COUNT
+    mcts_budget = (float(sys.argv[sys.argv.index('--mcts') + 1]) / 1000
+                   if '--mcts' in sys.argv else None)
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
     pygame.display.set_caption('Neon Snake')
@@ -630,9 +723,9 @@ def main():
     while True:
         mode = show_neon_menu(screen, clock)
         if mode == 'single':
-            neon_single_player(screen, clock)
+            neon_single_player(screen, clock, grid_count)
         elif mode == 'ai':
-            neon_ai_mode(screen, clock)
+            neon_ai_mode(screen, clock, grid_count, mcts_budget)
         else:
             pygame.quit()
             sys.exit()
@@ -0,0 +1,117 @@
+"""
+Python Snake Game - Replay Viewer
+Plays back a game recorded with --record (see snake_replay) at any speed,
+with seeking.
+
+Usage:
+    python main_replay.py replays/ai_mode-20240101-120000.snkr
+"""
+import pygame
+import sys
+
+import main as classic
+from main import (FPS, TICK_RATE, WINDOW_SIZE, WHITE, GRAY, RED, GREEN, DARK_GREEN,
+                  BLUE, DARK_BLUE, YELLOW, DARK_YELLOW, PURPLE, DARK_PURPLE,
+                  DirtyRenderer, draw_cell, init_display)
+from snake_engine import FixedTimestep, SnakeLogic
+from snake_replay import ReplayPlayer
+from snake_text import render_text
+from snake_viewport import Viewport
+
+# Colors by snake id; ids are handed out in spawn order, so the player of
+# the classic modes is green and the AI snakes blue and yellow as in ai_mode
+PALETTE = [(GREEN, DARK_GREEN), (BLUE, DARK_BLUE), (YELLOW, DARK_YELLOW),
+           (PURPLE, DARK_PURPLE)]
+SEEK_TICKS = 5 * TICK_RATE  # LEFT/RIGHT jump five seconds of game time
+MAX_SPEED = 64
+
+
+class ReplaySnake(SnakeLogic):
+    """Snake rebuilt from a replay, colored by its id."""
+
+    @property
+    def color(self):
+        return PALETTE[(self.id - 1) % len(PALETTE)][0]
+
+    @property
+    def dark_color(self):
+        return PALETTE[(self.id - 1) % len(PALETTE)][1]
+
+
+def replay_mode(player: ReplayPlayer):
+    """
+    Play a replay on screen.
+    SPACE pauses, UP/DOWN double or halve the speed, LEFT/RIGHT seek,
+    HOME restarts and ESC/Q quits.
+
+    Args:
+        player: Replay to show
+    """
+    renderer = DirtyRenderer(classic.screen,
+                             Viewport(player.grid_count, WINDOW_SIZE, WINDOW_SIZE))
+    speed = 1
+    scheduler = FixedTimestep(TICK_RATE)
+    paused = False
+    dt = 0.0
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+            elif event.type == pygame.KEYDOWN:
+                tick = player.game.tick
+                if event.key in (pygame.K_ESCAPE, pygame.K_q):
+                    return
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                    if event.key == pygame.K_UP:
+                        speed = min(MAX_SPEED, speed * 2)
+                    else:
+                        speed = max(1, speed // 2)
+                    rate = TICK_RATE * speed
+                    scheduler = FixedTimestep(rate, max_ticks_per_frame=rate // FPS + 5)
+                elif event.key == pygame.K_LEFT:
+                    player.seek(max(0, tick - SEEK_TICKS))
+                elif event.key == pygame.K_RIGHT:
+                    player.seek(tick + SEEK_TICKS)
+                elif event.key == pygame.K_HOME:
+                    player.seek(0)
+
+        finished = player.next_tick() is None
+        if not paused and not finished:
+            for _ in scheduler.ticks(dt):
+                player.seek(player.game.tick + 1)
+
+        game = player.game
+        focus = game.snakes[0].get_head_position() if game.snakes else None
+        renderer.begin_frame(game.snakes, focus)
+        for snake in game.snakes:
+            renderer.draw_snake_ends(snake, 1.0)
+        renderer.mark(draw_cell(classic.screen, RED, *game.food.position, renderer.view))
+
+        scores = '  '.join(str(snake.score) for snake in game.snakes)
+        state = 'END' if finished else 'PAUSED' if paused else f'x{speed}'
+        renderer.blit(render_text(f'Tick {game.tick}  {state}', 24, WHITE), (10, 10))
+        renderer.blit(render_text(f'Scores: {scores}', 24, WHITE), (10, 30))
+        renderer.blit(render_text('SPACE:Pause UP/DOWN:Speed LEFT/RIGHT:Seek ESC:Quit',
+                                  24, GRAY), (10, WINDOW_SIZE - 25))
+        renderer.present()
+
+        dt = classic.clock.tick(FPS) / 1000.0
+
+
+def main():
+    """Load the replay named on the command line and show it."""
+    if len(sys.argv) < 2:
+        print('Usage: python main_replay.py REPLAY_FILE')
+        sys.exit(1)
+    player = ReplayPlayer.from_file(sys.argv[1], snake_factory=ReplaySnake)
+    init_display()
+    pygame.display.set_caption('Snake Game - Replay')
+    replay_mode(player)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,832 @@
+"""
+AI policies for headless engine snakes.
+A policy instance belongs to one ComputerSnakeLogic; its choose() method
+returns the direction the snake should take next, or None to let the snake
+fall back to its built-in greedy move.
+"""
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Deque, List, Optional, Tuple
+
+from snake_engine import EMPTY, Board, Position, SnakeLogic
+
+Direction = Tuple[int, int]
+
+
+def neighbours(i: int, n: int) -> List[int]:
+    """
+    Get the flat indices of the in-bounds orthogonal neighbours of a cell.
+
+    Args:
+        i: Flat cell index (y * n + x)
+        n: Number of cells per dimension
+
+    Returns:
+        List of neighbouring flat indices
+    """
+    x = i % n
+    result = []
+    if i >= n:
+        result.append(i - n)
+    if i + n < n * n:
+        result.append(i + n)
+    if x > 0:
+        result.append(i - 1)
+    if x < n - 1:
+        result.append(i + 1)
+    return result
+
+
+def step_direction(src: int, dst: int, n: int) -> Direction:
+    """
+    Get the direction that moves from one cell to an adjacent one.
+
+    Args:
+        src: Flat index of the current cell
+        dst: Flat index of an orthogonally adjacent cell
+        n: Number of cells per dimension
+
+    Returns:
+        (dx, dy) direction tuple
+    """
+    return (dst % n - src % n, dst // n - src // n)
+
+
+class SearchBuffer:
+    """
+    Reusable scratch space for grid searches. Cells are marked visited by
+    writing the current generation number into a stamp array, so starting
+    a new search is a counter increment rather than a clear or allocation.
+    Buffers are sized lazily and only reallocated when the board size
+    changes.
+    """
+
+    def __init__(self):
+        """Initialize empty buffers; they are sized on first use."""
+        self.size = 0
+        self.stamp = array('I')
+        self.parent = array('i')
+        self.stack = array('i')
+        self.generation = 0
+
+    def begin(self, size: int) -> int:
+        """
+        Start a new search over a board with the given number of cells.
+
+        Args:
+            size: Total number of cells (grid_count squared)
+
+        Returns:
+            Generation number that marks a cell as visited in this search
+        """
+        if size != self.size:
+            self.size = size
+            self.stamp = array('I', bytes(4 * size))
+            self.parent = array('i', bytes(4 * size))
+            self.stack = array('i', bytes(4 * size))
+            self.generation = 0
+        self.generation += 1
+        if self.generation == 0xFFFFFFFF:
+            self.stamp = array('I', bytes(4 * size))
+            self.generation = 1
+        return self.generation
+
+
+def reachable_area(board: Board, start: int, limit: int,
+                   buffer: SearchBuffer) -> int:
+    """
+    Count the free cells reachable from a cell with an iterative flood fill,
+    stopping early once the count exceeds a limit.
+
+    Args:
+        board: Occupancy grid to search
+        start: Flat index of a free cell to start from
+        limit: Stop counting once more than this many cells are found
+        buffer: Scratch buffers to reuse
+
+    Returns:
+        Number of reachable free cells, at most limit + 1
+    """
+    n = board.grid_count
+    size = n * n
+    gen = buffer.begin(size)
+    stamp = buffer.stamp
+    stack = buffer.stack
+    cells = board.cells
+
+    stamp[start] = gen
+    stack[0] = start
+    top = 1
+    count = 0
+    while top:
+        top -= 1
+        i = stack[top]
+        count += 1
+        if count > limit:
+            break
+        x = i % n
+        for j in (i - n if i >= n else -1,
+                  i + n if i + n < size else -1,
+                  i - 1 if x > 0 else -1,
+                  i + 1 if x < n - 1 else -1):
+            if j >= 0 and stamp[j] != gen and cells[j] == EMPTY:
+                stamp[j] = gen
+                stack[top] = j
+                top += 1
+    return count
+
+
+UNREACHED = 0x7FFFFFFF  # Distance of cells the food field did not reach
+FIELD_REFRESH = 8  # Updates a food field is reused for while the food stays put
+FIELD_MAX_CELLS = 20_000  # Cells a food field search visits at most
+
+
+class FoodDistanceField:
+    """
+    Breadth-first distances from the food to the free cells around the AI
+    snakes, shared by all the AI snakes of a game. The front-end calls
+    update() once per AI tick and each snake's policy then ranks its moves
+    with table lookups instead of evaluating the board on its own.
+
+    The search stops as soon as it has reached every AI head: a head's best
+    move is settled by then, and cells further out keep UNREACHED and fall
+    back to Manhattan distance. While the food stays put the field is reused
+    for FIELD_REFRESH updates, since between them only snake heads and tails
+    have moved; it is searched again earlier if a head has left the area it
+    covers, unless the last search already labelled everything it could
+    reach (heads walled off from the food stay uncovered until the refresh).
+    Searches also stop after FIELD_MAX_CELLS cells so a new food costs the
+    same on a huge board, and each one unlabels only the cells the previous
+    one labelled instead of clearing the whole board.
+    """
+
+    def __init__(self, refresh: int = FIELD_REFRESH, max_cells: int = FIELD_MAX_CELLS):
+        """
+        Initialize an empty field; it is computed on the first update().
+
+        Args:
+            refresh: Updates to reuse the field for while the food stays put
+            max_cells: Cells a search visits at most
+        """
+        self.refresh = refresh
+        self.max_cells = max_cells
+        self.board: Optional[Board] = None
+        self.food: Optional[Position] = None
+        self.dist = array('i')
+        self.labelled = 0  # Cells the last search labelled, at the front of its queue
+        # True if the last search labelled every cell it could reach within
+        # max_cells, so heads it missed would be missed by a new one too
+        self.exhausted = False
+        self.age = 0
+        self.buffer = SearchBuffer()
+
+    def update(self, board: Board, food_pos: Position, snakes: List[SnakeLogic]) -> bool:
+        """
+        Bring the field up to date for this tick.
+
+        Args:
+            board: Occupancy grid the snakes move on
+            food_pos: Current food position (x, y)
+            snakes: AI snakes that will read the field this tick
+
+        Returns:
+            True if the distances were recomputed
+        """
+        n = board.grid_count
+        heads = [y * n + x for x, y in (s.get_head_position() for s in snakes)
+                 if 0 <= x < n and 0 <= y < n]
+        if (board is self.board and food_pos == self.food and self.age < self.refresh
+                and (self.exhausted or all(self._covered(h, n) for h in heads))):
+            self.age += 1
+            return False
+        self.board = board
+        self.food = food_pos
+        self.age = 1
+        self._search(board, food_pos, heads)
+        return True
+
+    def covers(self, board: Board, food_pos: Position) -> bool:
+        """True if the field was last updated for this board and food."""
+        return board is self.board and food_pos == self.food
+
+    def _covered(self, head: int, n: int) -> bool:
+        """True if the search reached a neighbour of the head."""
+        dist = self.dist
+        return any(dist[j] != UNREACHED for j in neighbours(head, n))
+
+    def _search(self, board: Board, food_pos: Position, heads: List[int]):
+        """Breadth-first search from the food over free cells, out to the heads."""
+        n = board.grid_count
+        size = n * n
+        buffer = self.buffer
+        dist = self.dist
+        if len(dist) != size:
+            dist = self.dist = array('i', [UNREACHED]) * size
+        else:
+            # Unlabel only what the last search labelled: the front of its queue
+            queue = buffer.stack
+            for k in range(self.labelled):
+                dist[queue[k]] = UNREACHED
+        gen = buffer.begin(size)
+        stamp = buffer.stamp  # Marks heads not reached yet
+        queue = buffer.stack  # Used as a FIFO: a BFS enqueues each cell once
+        cells = board.cells
+        for h in heads:
+            stamp[h] = gen
+        remaining = len(set(heads))
+
+        fx, fy = food_pos
+        start = fy * n + fx
+        dist[start] = 0
+        queue[0] = start
+        head = 0
+        tail = 1
+        limit = self.max_cells
+        while head < tail and tail < limit and remaining:
+            i = queue[head]
+            head += 1
+            d = dist[i] + 1
+            x = i % n
+            for j in (i - n if i >= n else -1,
+                      i + n if i + n < size else -1,
+                      i - 1 if x > 0 else -1,
+                      i + 1 if x < n - 1 else -1):
+                if j < 0:
+                    continue
+                if cells[j] == EMPTY:
+                    if dist[j] == UNREACHED:
+                        dist[j] = d
+                        queue[tail] = j
+                        tail += 1
+                elif stamp[j] == gen:
+                    # Neighbours of this head at distance d - 1 or less are
+                    # already labelled, so its best move is known
+                    stamp[j] = 0
+                    remaining -= 1
+        self.labelled = tail
+        self.exhausted = remaining > 0
+
+
+TT_BITS = 16  # Default transposition table size: 2 ** 16 entries (~1.3 MB)
+
+
+class TranspositionTable:
+    """
+    Bounded cache of position evaluations keyed by GameState.zobrist, for
+    lookahead planners that reach the same position by different move
+    orders. Entries live in preallocated flat arrays, two slots per bucket
+    picked by the hash folded to its low bits (the low bits of body keys do
+    not depend on the owner); the full 64-bit key is stored so index
+    collisions are rejected rather than returned.
+
+    A store goes to the slot already holding its key, else to an empty
+    slot, else it evicts: first an entry left from an older search (see
+    new_search()), then the one searched to the shallower depth. Deep
+    results of the current search survive floods of shallow ones, and the
+    memory used never grows.
+    """
+
+    def __init__(self, bits: int = TT_BITS):
+        """
+        Allocate an empty table.
+
+        Args:
+            bits: log2 of the number of entries (at least 1)
+        """
+        size = 1 << max(1, bits)
+        self.mask = size - 2  # First slot of a bucket
+        self.keys = array('Q', bytes(8 * size))
+        self.values = array('d', bytes(8 * size))
+        self.depths = array('h', [-1]) * size  # -1 marks an empty slot
+        self.ages = array('H', bytes(2 * size))  # Search generation that wrote each slot
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_search(self):
+        """Start a new search; entries from earlier ones become first to evict."""
+        self.generation = (self.generation + 1) & 0xFFFF
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self.depths[:] = array('h', [-1]) * len(self.depths)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, key: int, depth: int = 0) -> Optional[float]:
+        """
+        Look up a position.
+
+        Args:
+            key: Zobrist hash of the position
+            depth: Minimum search depth the stored value must come from
+
+        Returns:
+            The stored value, or None if absent or too shallow
+        """
+        i = (key ^ key >> 32) & self.mask
+        keys = self.keys
+        depths = self.depths
+        for slot in (i, i + 1):
+            if keys[slot] == key and depths[slot] >= depth:
+                self.ages[slot] = self.generation  # Still in use: keep it
+                self.hits += 1
+                return self.values[slot]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, value: float, depth: int = 0):
+        """
+        Remember a position's value. A deeper value already stored for the
+        same position in the current search is kept.
+
+        Args:
+            key: Zobrist hash of the position
+            value: Evaluation to cache
+            depth: Search depth the value was computed with (0 - 32767)
+        """
+        i = (key ^ key >> 32) & self.mask
+        keys = self.keys
+        depths = self.depths
+        ages = self.ages
+        gen = self.generation
+        if keys[i] == key and depths[i] >= 0:
+            slot = i
+        elif keys[i + 1] == key and depths[i + 1] >= 0:
+            slot = i + 1
+        elif depths[i] < 0:
+            slot = i
+        elif depths[i + 1] < 0:
+            slot = i + 1
+        else:
+            stale, stale_next = ages[i] != gen, ages[i + 1] != gen
+            if stale != stale_next:
+                slot = i if stale else i + 1
+            else:
+                slot = i if depths[i] <= depths[i + 1] else i + 1
+        if keys[slot] == key and depths[slot] > depth and ages[slot] == gen:
+            return
+        keys[slot] = key
+        self.values[slot] = value
+        depths[slot] = depth
+        ages[slot] = gen
+
+
+class PathfindingPolicy:
+    """
+    Shortest-path planner: BFS over the occupancy grid from the head to the
+    food. The resulting path is cached and followed cell by cell; it is only
+    recomputed when the food moves, a body cell appears on the remaining
+    path or the snake leaves it. Validating the cache costs one grid lookup
+    per remaining path cell, far less than a fresh search.
+    """
+
+    def __init__(self, buffer: Optional[SearchBuffer] = None):
+        """
+        Initialize with an empty path.
+
+        Args:
+            buffer: Scratch buffers to share with other searches, new if None
+        """
+        self.path: Deque[int] = deque()  # Flat cell indices, next step first
+        self.target: Optional[Position] = None
+        self.replans = 0
+        self.buffer = buffer if buffer is not None else SearchBuffer()
+
+    def choose(self, snake: SnakeLogic, food_pos: Position,
+               all_snakes: List[SnakeLogic]) -> Optional[Direction]:
+        """
+        Get the next step along a shortest path to the food.
+
+        Args:
+            snake: Snake being steered
+            food_pos: Target food position (x, y)
+            all_snakes: Unused; obstacles come from the shared occupancy grid
+
+        Returns:
+            Direction to move in, or None if the food is unreachable
+        """
+        board = snake.board
+        n = board.grid_count
+        hx, hy = snake.get_head_position()
+        head = hy * n + hx
+        path = self.path
+
+        # Drop the step we took since the last call
+        if path and path[0] == head:
+            path.popleft()
+
+        if not self._path_valid(board, head, food_pos):
+            self.replans += 1
+            self.target = food_pos
+            self.path = path = self._search(board, head,
+                                             food_pos[1] * n + food_pos[0])
+            if not path:
+                return None
+        return step_direction(head, path[0], n)
+
+    def _path_valid(self, board: Board, head: int, food_pos: Position) -> bool:
+        """Check whether the cached path still starts at the head and is clear."""
+        path = self.path
+        if not path or food_pos != self.target:
+            return False
+        n = board.grid_count
+        if path[0] not in neighbours(head, n):
+            return False
+        cells = board.cells
+        for i in path:
+            if cells[i] != EMPTY:
+                return False
+        return True
+
+    def _search(self, board: Board, start: int, goal: int) -> Deque[int]:
+        """
+        Breadth-first search over free cells using preallocated buffers.
+
+        Args:
+            board: Occupancy grid to search
+            start: Flat index of the head
+            goal: Flat index of the food
+
+        Returns:
+            Path of flat indices from the first step to the goal, empty if
+            the goal is unreachable
+        """
+        n = board.grid_count
+        size = n * n
+        gen = self.buffer.begin(size)
+        stamp = self.buffer.stamp
+        parent = self.buffer.parent
+        queue = self.buffer.stack  # Each cell is enqueued at most once
+        cells = board.cells
+
+        stamp[start] = gen
+        queue[0] = start
+        head = 0
+        tail = 1
+        found = False
+        while head < tail:
+            i = queue[head]
+            head += 1
+            if i == goal:
+                found = True
+                break
+            x = i % n
+            for j in (i - n if i >= n else -1,
+                      i + n if i + n < size else -1,
+                      i - 1 if x > 0 else -1,
+                      i + 1 if x < n - 1 else -1):
+                if j >= 0 and stamp[j] != gen and cells[j] == EMPTY:
+                    stamp[j] = gen
+                    parent[j] = i
+                    queue[tail] = j
+                    tail += 1
+
+        path: Deque[int] = deque()
+        if not found:
+            return path
+        i = goal
+        while i != start:
+            path.appendleft(i)
+            i = parent[i]
+        return path
+
+
+class FloodFillPolicy:
+    """
+    Move-safety filter based on reachability. Every free neighbour of the
+    head is scored by the size of the region reachable from it (flood fill
+    cut off once the region can hold the whole snake), so the snake does
+    not steer into dead-end pockets. Candidates are tried in preference
+    order: the inner policy's choice first if there is one, then by
+    distance to the food, read from a shared FoodDistanceField when one is
+    given and up to date, Manhattan distance otherwise. Cells the head of a
+    snake with priority borders (Board.contested) go after all the others,
+    since two heads entering one cell both die.
+    """
+
+    def __init__(self, inner=None, buffer: Optional[SearchBuffer] = None,
+                 field: Optional[FoodDistanceField] = None,
+                 area_limit: Optional[int] = None):
+        """
+        Initialize the filter.
+
+        Args:
+            inner: Optional policy whose choice is preferred when it is safe
+            buffer: Scratch buffers to share with other searches, new if None
+            field: Food distances shared with the game's other AI snakes
+            area_limit: Cap on the region size a move needs to count as safe,
+                so a long snake's check costs a bounded number of cells;
+                the snake's length if None
+        """
+        self.inner = inner
+        self.buffer = buffer if buffer is not None else SearchBuffer()
+        self.field = field
+        self.area_limit = area_limit
+
+    def choose(self, snake: SnakeLogic, food_pos: Position,
+               all_snakes: List[SnakeLogic]) -> Optional[Direction]:
+        """
+        Get the preferred move whose reachable region fits the snake, or the
+        move with the largest region if none does.
+
+        Args:
+            snake: Snake being steered
+            food_pos: Target food position (x, y)
+            all_snakes: All snakes in the game, passed on to the inner policy
+
+        Returns:
+            Direction to move in, or None if every neighbour is blocked
+        """
+        board = snake.board
+        n = board.grid_count
+        cells = board.cells
+        hx, hy = snake.get_head_position()
+        head = hy * n + hx
+        fx, fy = food_pos
+
+        candidates = [j for j in neighbours(head, n) if cells[j] == EMPTY]
+        if not candidates:
+            return None
+        field = self.field
+        if field is not None and field.covers(board, food_pos):
+            dist = field.dist
+            candidates.sort(key=lambda j: (dist[j], abs(j % n - fx) + abs(j // n - fy)))
+        else:
+            candidates.sort(key=lambda j: abs(j % n - fx) + abs(j // n - fy))
+        if self.inner is not None:
+            preferred = self.inner.choose(snake, food_pos, all_snakes)
+            if preferred is not None:
+                j = (hy + preferred[1]) * n + hx + preferred[0]
+                if j in candidates:
+                    candidates.remove(j)
+                    candidates.insert(0, j)
+        # Cells a head with priority borders come last: both snakes would die
+        # head-on if it moved there too. The sort is stable, so each group
+        # keeps its order
+        contested = board.contested
+        me = snake.id
+        candidates.sort(key=lambda j: contested(j, me))
+
+        limit = snake.length
+        if self.area_limit is not None and limit > self.area_limit:
+            limit = self.area_limit
+        best = candidates[0]
+        best_area = -1
+        for j in candidates:
+            area = reachable_area(board, j, limit, self.buffer)
+            if area > limit:
+                return step_direction(head, j, n)
+            if area > best_area:
+                best, best_area = j, area
+        return step_direction(head, best, n)
+
+
+def _rect_cycle(succ: array, n: int, x0: int, y0: int, w: int, h: int):
+    """
+    Write a Hamiltonian cycle of a w x h rectangle into a successor array.
+    Walks the first row (or column), then zigzags back through the rest;
+    needs an even side and both sides of at least 2.
+    """
+    if w % 2 == 0:
+        cells = [(x, 0) for x in range(w)]
+        for k, x in enumerate(range(w - 1, -1, -1)):
+            rows = range(1, h) if k % 2 == 0 else range(h - 1, 0, -1)
+            cells.extend((x, y) for y in rows)
+    else:
+        cells = [(0, y) for y in range(h)]
+        for k, y in enumerate(range(h - 1, -1, -1)):
+            cols = range(1, w) if k % 2 == 0 else range(w - 1, 0, -1)
+            cells.extend((x, y) for x in cols)
+    flat = [(y0 + y) * n + x0 + x for x, y in cells]
+    for a, b in zip(flat, flat[1:] + flat[:1]):
+        succ[a] = b
+
+
+def _merge_cycles(succ: array, n: int, first: set, second: set):
+    """
+    Splice two disjoint cycles into one. Looks for an edge a->b of the first
+    and d->c of the second with a~c and b~d adjacent, then reroutes
+    a->c ... d->b. The second cycle is reversed if only the opposite
+    orientation lines up.
+    """
+    for reverse in (False, True):
+        if reverse:
+            pred = {succ[i]: i for i in second}
+            for i in second:
+                succ[i] = pred[i]
+        pred = {succ[i]: i for i in second}
+        for a in first:
+            b = succ[a]
+            for c in neighbours(a, n):
+                if c not in second:
+                    continue
+                d = pred[c]
+                if d in neighbours(b, n):
+                    succ[a] = c
+                    succ[d] = b
+                    first |= second
+                    return
+    raise ValueError('cycles cannot be merged')
+
+
+@lru_cache(maxsize=None)
+def hamiltonian_cycle(n: int) -> Tuple[int, ...]:
+    """
+    Build (once per board size) a cycle through the cells of an n x n board.
+
+    On even boards the cycle covers every cell. No Hamiltonian cycle exists
+    on odd boards, so there it skips the corner (0, 0) and is built to pass
+    (0, 1) -> (1, 1) -> (1, 0), which lets HamiltonianPolicy swap (1, 1) for
+    the corner whenever food lands there.
+
+    Args:
+        n: Number of cells per dimension (at least 2)
+
+    Returns:
+        Flat cell indices in cycle order
+    """
+    succ = array('i', [-1]) * (n * n)
+    if n % 2 == 0:
+        _rect_cycle(succ, n, 0, 0, n, n)
+        start = 0
+    else:
+        # 3x3 block minus the corner, then even-sided strips to its right
+        # and below, spliced in one at a time
+        block = [(1, 0), (2, 0), (2, 1), (2, 2), (1, 2), (0, 2), (0, 1), (1, 1)]
+        flat = [y * n + x for x, y in block]
+        for a, b in zip(flat, flat[1:] + flat[:1]):
+            succ[a] = b
+        covered = set(flat)
+        if n > 3:
+            _rect_cycle(succ, n, 3, 0, n - 3, 3)
+            _merge_cycles(succ, n, covered,
+                          {y * n + x for y in range(3) for x in range(3, n)})
+            _rect_cycle(succ, n, 0, 3, n, n - 3)
+            _merge_cycles(succ, n, covered,
+                          {y * n + x for y in range(3, n) for x in range(n)})
+        start = 1
+
+    order = [start]
+    i = succ[start]
+    while i != start:
+        order.append(i)
+        i = succ[i]
+    return tuple(order)
+
+
+class HamiltonianPolicy:
+    """
+    Perfect-play policy for a lone snake: follow a precomputed Hamiltonian
+    cycle so the body always lies on the cycle segment behind the head, and
+    take shortcuts that jump ahead along the cycle toward the food when
+    enough of the cycle stays free between the new head and the tail.
+    Shortcuts are only taken while the snake covers under half the cycle,
+    after which it follows the cycle strictly and can fill the board.
+
+    On odd boards the cycle misses one cell, so the snake reliably fills
+    every cell but the last one; moving into its own tail is a collision,
+    so the final cell is only taken when the head happens to border it.
+    Front-ends use board_filled() to count that end as a full board.
+    """
+
+    def __init__(self, shortcut_margin: int = 4):
+        """
+        Initialize the policy.
+
+        Args:
+            shortcut_margin: Free cycle cells that must remain between the
+                new head and the tail after a shortcut
+        """
+        self.shortcut_margin = shortcut_margin
+        self._n = 0
+        self.order: List[int] = []
+        self.index = array('i')
+
+    @staticmethod
+    def board_filled(board: Board) -> bool:
+        """
+        Check whether a snake following the cycle has filled the board as
+        far as it can: every cell, or every cell but one on odd boards.
+
+        Args:
+            board: Occupancy grid the snake moves on
+
+        Returns:
+            True if no more than the cells the cycle cannot reach are free
+        """
+        return len(board.free) <= board.grid_count % 2
+
+    def _load_cycle(self, n: int):
+        """Copy the cached cycle for this board size into per-policy arrays."""
+        self._n = n
+        self.order = list(hamiltonian_cycle(n))
+        self.index = array('i', [-1]) * (n * n)
+        for k, i in enumerate(self.order):
+            self.index[i] = k
+
+    def _swap_corner(self, board: Board, food: int):
+        """
+        On odd boards, re-route the cycle through the uncovered one of the
+        corner (0, 0) and the cell (1, 1) when the food sits there and the
+        cell it replaces is free. Both share one cycle slot, so the body
+        keeps its cycle order.
+        """
+        n = self._n
+        index = self.index
+        if n % 2 == 0 or index[food] != -1 or food not in (0, n + 1):
+            return
+        other = n + 1 if food == 0 else 0
+        if board.cells[other] != EMPTY:
+            return
+        k = index[other]
+        self.order[k] = food
+        index[food] = k
+        index[other] = -1
+
+    def choose(self, snake: SnakeLogic, food_pos: Position,
+               all_snakes: List[SnakeLogic]) -> Optional[Direction]:
+        """
+        Get the next cycle step, or a safe shortcut toward the food.
+
+        Args:
+            snake: Snake being steered
+            food_pos: Target food position (x, y)
+            all_snakes: Unused; the policy assumes it is alone on the board
+
+        Returns:
+            Direction to move in, or None if the board has no cycle or the
+            snake has left it
+        """
+        board = snake.board
+        n = board.grid_count
+        if n < 2:
+            return None
+        if n != self._n:
+            self._load_cycle(n)
+        cells = board.cells
+        index = self.index
+        size = len(self.order)
+
+        hx, hy = snake.get_head_position()
+        head = hy * n + hx
+        tx, ty = snake.get_tail_position()
+        tail = ty * n + tx
+        food = food_pos[1] * n + food_pos[0]
+
+        # Last free cell on the board: just eat it
+        if len(board.free) == 1 and food in neighbours(head, n):
+            return step_direction(head, food, n)
+
+        self._swap_corner(board, food)
+        if index[head] == -1 or index[tail] == -1:
+            return None
+
+        base = index[tail]
+        head_rel = (index[head] - base) % size
+        food_rel = (index[food] - base) % size if index[food] != -1 else -1
+        pending = snake.length - len(snake.positions)
+        allow_shortcuts = snake.length * 2 < size
+
+        best = -1
+        best_score = size + 1
+        for j in neighbours(head, n):
+            if cells[j] != EMPTY or index[j] == -1:
+                continue
+            rel = (index[j] - base) % size
+            if rel <= head_rel:
+                continue
+            if rel != head_rel + 1:
+                if not allow_shortcuts:
+                    continue
+                if size - 1 - rel < pending + self.shortcut_margin:
+                    continue
+                if food_rel != -1 and food_rel > head_rel and rel > food_rel:
+                    continue
+            # Cycle distance still to travel to the food
+            score = (food_rel - rel) % size if food_rel != -1 else 0
+            if score < best_score:
+                best, best_score = j, score
+        if best == -1:
+            return None
+        return step_direction(head, best, n)
+
+
+# Policy factories by name, for tools that pick strategies at run time.
+# Each call returns a fresh policy instance (None means the greedy AI).
+def _mcts_policy():
+    """Reproducible MCTS: a fixed simulation count and seed instead of a time budget."""
+    from snake_mcts import MCTSPolicy  # Imported late: snake_mcts builds on this module
+    return MCTSPolicy(budget=None, seed=0)
+
+
+POLICIES = {
+    'greedy': lambda: None,
+    'pathfinding': PathfindingPolicy,
+    'floodfill': FloodFillPolicy,
+    'floodfill-path': lambda: FloodFillPolicy(PathfindingPolicy()),
+    'hamiltonian': HamiltonianPolicy,
+    'mcts': _mcts_policy,
+}
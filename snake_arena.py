@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Arena: hundreds of AI snakes and several food items on one large board.
+
+Pure Python like snake_engine, which it builds on. Every per-tick step
+costs a bounded amount of work per snake, however long the snakes grow:
+collisions are occupancy-grid lookups, food is found through a dict keyed
+by cell, each snake keeps a food target until that food is eaten and then
+finds the nearest one through a coarse spatial index, and the flood-fill
+safety check of every snake is capped at AREA_LIMIT cells. All
+snakes share one search buffer, so memory does not grow with the snake
+count either. Dead snakes respawn at a random free cell; when none is
+found they leave the board and retry on later ticks.
+
+Arena games are not recorded: replays and snapshots hold a single food.
+
+Usage:
+    python snake_arena.py --snakes 300 --ticks 1000
+"""
+import argparse
+import time
+from typing import Dict, List, Optional, Set
+
+from snake_engine import (ComputerSnakeLogic, FoodLogic, GameState, Position, SnakeLogic,
+                          ZobristKeys)
+from snake_ai import FloodFillPolicy, SearchBuffer
+
+ARENA_GRID = 120  # Default board size; fits the window at 4 pixels per cell
+ARENA_SNAKES = 200
+ARENA_FOODS = 40
+AREA_LIMIT = 32  # Cells a snake's flood-fill safety check explores at most
+PLACE_TRIES = 8  # Random cells tried before giving up on a spawn spot
+BUCKET = 8  # Side in cells of the squares food is indexed by for nearest-food searches
+
+
+class Arena(GameState):
+    """
+    Game with many AI snakes and several food items. step() runs a full
+    tick; front-ends can call decide(), advance() and check_food() instead
+    to time the phases separately.
+    """
+
+    def __init__(self, num_snakes: int = ARENA_SNAKES, num_foods: int = ARENA_FOODS,
+                 grid_count: int = ARENA_GRID, seed: Optional[int] = None,
+                 snake_factory=ComputerSnakeLogic, hashing: bool = False):
+        """
+        Create the board, spawn the food and the snakes.
+
+        Args:
+            num_snakes: Number of AI snakes, kept constant by respawning
+            num_foods: Number of food items on the board at once
+            grid_count: Number of cells per board dimension
+            seed: Seed for the game's RNG, a random one if None
+            snake_factory: Builds a snake from its start position and a
+                policy= keyword, e.g. a subclass with display attributes
+            hashing: Keep the board's Zobrist hash up to date on every move
+        """
+        super().__init__(seed=seed, grid_count=grid_count, hashing=hashing)
+        self.foods = [self.food] + [FoodLogic() for _ in range(num_foods - 1)]
+        for food in self.foods:
+            food.rng = self.rng
+            food.board = self.board
+        self.food_at: Dict[int, FoodLogic] = {}  # Flat cell index -> food on it
+        self.buckets_per_row = -(-grid_count // BUCKET)
+        # Flat cell indices of the food in each BUCKET x BUCKET square
+        self.buckets: List[Set[int]] = [set() for _ in range(self.buckets_per_row ** 2)]
+        self.targets: Dict[SnakeLogic, Position] = {}  # Food cell each snake heads for
+        self.waiting: List[SnakeLogic] = []  # Dead snakes off the board until a cell frees up
+        self.spawn_food()
+
+        buffer = SearchBuffer()  # One scratch area for every snake's searches
+        for _ in range(num_snakes):
+            start = self._free_cell()
+            if start is None:
+                break
+            policy = FloodFillPolicy(buffer=buffer, area_limit=AREA_LIMIT)
+            self.add_snake(snake_factory(start, policy=policy))
+
+    def _free_cell(self) -> Optional[Position]:
+        """A random free cell without food on it, or None if none was found."""
+        n = self.grid_count
+        for _ in range(PLACE_TRIES):
+            pos = self.board.random_free_cell(self.rng)
+            if pos is None:
+                return None
+            if pos[1] * n + pos[0] not in self.food_at:
+                return pos
+        return None
+
+    def _place(self, food: FoodLogic) -> bool:
+        """Move one food item to a free cell; it stays put if none is found."""
+        pos = self._free_cell()
+        if pos is None:
+            return False
+        n = self.grid_count
+        x, y = food.position
+        if self.food_at.get(y * n + x) is food:
+            del self.food_at[y * n + x]
+            self._bucket(x, y).discard(y * n + x)
+        food.position = pos
+        x, y = pos
+        self.food_at[y * n + x] = food
+        self._bucket(x, y).add(y * n + x)
+        return True
+
+    def _bucket(self, x: int, y: int) -> Set[int]:
+        """Food index square holding a cell."""
+        return self.buckets[y // BUCKET * self.buckets_per_row + x // BUCKET]
+
+    @property
+    def zobrist(self) -> int:
+        """64-bit Zobrist hash of the snakes and every food item."""
+        board = self.board
+        h = board.hash if board.hashing else board.compute_hash(i for i, _ in self._heads())
+        food_keys = ZobristKeys.for_size(self.grid_count).food
+        for i in self.food_at:
+            h ^= food_keys[i]
+        return h
+
+    def nearest_food(self, pos: Position) -> Optional[Position]:
+        """
+        Find the food closest to a cell by Manhattan distance. Squares of
+        the food index are searched in rings around the cell, stopping once
+        no unsearched square can hold anything closer.
+
+        Args:
+            pos: (x, y) cell to search from
+
+        Returns:
+            Position of the nearest food, or None if none is on the board
+        """
+        n = self.grid_count
+        x, y = pos
+        per_row = self.buckets_per_row
+        buckets = self.buckets
+        bx, by = x // BUCKET, y // BUCKET
+        best = None
+        best_d = 2 * n
+        for r in range(per_row):
+            # Cells in ring r are at least (r - 1) * BUCKET + 1 away
+            if best is not None and best_d <= (r - 1) * BUCKET:
+                break
+            for cy in range(by - r, by + r + 1):
+                if not 0 <= cy < per_row:
+                    continue
+                edge = cy == by - r or cy == by + r
+                for cx in (range(bx - r, bx + r + 1) if edge else (bx - r, bx + r)):
+                    if not 0 <= cx < per_row:
+                        continue
+                    for i in buckets[cy * per_row + cx]:
+                        d = abs(i % n - x) + abs(i // n - y)
+                        if d < best_d:
+                            best, best_d = i, d
+        if best is None:
+            return None
+        return (best % n, best // n)
+
+    def spawn_food(self) -> bool:
+        """
+        Place every food item on a free cell.
+
+        Returns:
+            True if all of them were placed
+        """
+        self.food_at.clear()
+        for bucket in self.buckets:
+            bucket.clear()
+        placed = True
+        for food in self.foods:
+            food.position = (-1, -1)  # Not on the board until placed
+            placed = self._place(food) and placed
+        return placed
+
+    def target(self, snake: SnakeLogic) -> Position:
+        """
+        Food the snake is heading for. A snake keeps its target until that
+        food is eaten, and only then searches for the nearest one.
+
+        Args:
+            snake: Snake to steer
+
+        Returns:
+            (x, y) position of the target food
+        """
+        pos = self.targets.get(snake)
+        n = self.grid_count
+        if pos is None or pos[1] * n + pos[0] not in self.food_at:
+            head = snake.get_head_position()
+            pos = self.nearest_food(head)
+            if pos is None:
+                return head  # No food on the board: just stay safe
+            self.targets[snake] = pos
+        return pos
+
+    def decide(self):
+        """
+        Put waiting snakes back on the board if cells have freed up, then
+        let every snake choose its next direction, so a snake's first move
+        after respawning is steered like any other.
+        """
+        if self.waiting:
+            self._retry_waiting()
+        snakes = self.snakes
+        target = self.target
+        for snake in snakes:
+            snake.ai_move(target(snake), snakes)
+
+    def advance(self) -> List[SnakeLogic]:
+        """
+        Move every snake one cell at once and respawn the ones that collided.
+
+        Returns:
+            Snakes that died (and were respawned or set waiting) this tick
+        """
+        dead = self.move_simultaneous(self.snakes)
+        for snake in dead:
+            self.respawn(snake)
+        return dead
+
+    def respawn(self, snake: SnakeLogic):
+        """
+        Restart a snake with length 1 at a random free cell. If none is
+        found, the snake leaves the board and waits for a later tick rather
+        than being placed on an occupied cell.
+
+        Args:
+            snake: Snake to respawn
+        """
+        self.targets.pop(snake, None)
+        start = self._free_cell()
+        if start is None:
+            snake.clear_from_board()
+            snake.positions.clear()  # Off the board; reset() must not clear it again
+            self.snakes.remove(snake)
+            self.waiting.append(snake)
+            return
+        snake.start_pos = start
+        snake.reset()
+
+    def _retry_waiting(self):
+        """Put waiting snakes back on the board while free cells turn up."""
+        while self.waiting:
+            start = self._free_cell()
+            if start is None:
+                return
+            snake = self.waiting.pop()
+            snake.start_pos = start
+            snake.reset()
+            self.snakes.append(snake)
+
+    def check_food(self) -> List[SnakeLogic]:
+        """
+        Let every snake whose head is on a food item eat it.
+
+        Returns:
+            The snakes that ate this tick
+        """
+        n = self.grid_count
+        food_at = self.food_at
+        eaters = []
+        for snake in self.snakes:
+            x, y = snake.positions[0]
+            food = food_at.get(y * n + x)
+            if food is None:
+                continue
+            snake.length += 1
+            snake.score += 1
+            eaters.append(snake)
+            self._place(food)
+        return eaters
+
+    def step(self) -> List[SnakeLogic]:
+        """
+        Run one full tick: decisions, movement with respawns and food.
+
+        Returns:
+            Snakes that died this tick
+        """
+        self.decide()
+        dead = self.advance()
+        self.check_food()
+        self.tick += 1
+        return dead
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a headless arena and report its speed.')
+    parser.add_argument('--snakes', type=int, default=ARENA_SNAKES)
+    parser.add_argument('--foods', type=int, default=ARENA_FOODS)
+    parser.add_argument('--grid', type=int, default=ARENA_GRID)
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    arena = Arena(args.snakes, args.foods, args.grid, seed=args.seed)
+    deaths = 0
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        deaths += len(arena.step())
+    elapsed = time.perf_counter() - start
+    longest = max((s.length for s in arena.snakes), default=0)
+    print(f"{len(arena.snakes)} snakes, {args.foods} foods on {args.grid}x{args.grid}: "
+          f"{args.ticks / elapsed:.0f} ticks/s ({elapsed / args.ticks * 1e3:.2f} ms/tick)")
+    print(f"{deaths} deaths, longest snake {longest}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Vectorized batch of independent single-snake games backed by NumPy.
+Steps thousands of games per call for AI policy evaluation. Rules match
+snake_engine: walls and every body cell (including the tail that is about
+to move) are solid, and each food grows the snake by one cell.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from snake_engine import DIRECTIONS, GRID_COUNT
+
+# Action i moves in DIRECTIONS[i] (UP, DOWN, LEFT, RIGHT)
+DX = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+DY = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+REVERSE = np.array([DIRECTIONS.index((-dx, -dy)) for dx, dy in DIRECTIONS],
+                   dtype=np.int64)
+
+
+class BatchSnakeEnv:
+    """
+    N independent games stored as arrays instead of Python objects.
+
+    Per game the state is an occupancy row of the board tensor, a ring
+    buffer of body cells with a head pointer and body length (the tail is
+    derived from both), the target length, the food cell and flags. All
+    cells are flat indices (y * grid_count + x). Games that end stay frozen
+    until reset() is called for them.
+    """
+
+    def __init__(self, num_games: int, grid_count: int = GRID_COUNT,
+                 seed: Optional[int] = None):
+        """
+        Allocate and reset all games.
+
+        Args:
+            num_games: Number of games in the batch
+            grid_count: Number of cells per dimension
+            seed: Seed for the batch's NumPy generator
+        """
+        self.num_games = num_games
+        self.grid_count = grid_count
+        self.size = grid_count * grid_count
+        self.rng = np.random.default_rng(seed)
+
+        n, size = num_games, self.size
+        self.board = np.zeros((n, size), dtype=np.uint8)  # 1 where a body lies
+        self.body = np.zeros((n, size), dtype=np.int64)   # Ring buffer of cells
+        self.head_ptr = np.zeros(n, dtype=np.int64)       # Slot of the head
+        self.body_len = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)          # Target length
+        self.score = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)      # Index into DIRECTIONS
+        self.food = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self._rows = np.arange(n)
+        self.reset()
+
+    @property
+    def head(self) -> np.ndarray:
+        """Flat head cell of every game."""
+        return self.body[self._rows, self.head_ptr]
+
+    @property
+    def tail(self) -> np.ndarray:
+        """Flat tail cell of every game."""
+        tail_ptr = (self.head_ptr - self.body_len + 1) % self.size
+        return self.body[self._rows, tail_ptr]
+
+    def reset(self, mask: Optional[np.ndarray] = None):
+        """
+        Reset games to a length-1 snake in the centre with a random heading.
+
+        Args:
+            mask: Boolean array selecting games to reset, all games if None
+        """
+        idx = self._rows if mask is None else np.flatnonzero(mask)
+        if len(idx) == 0:
+            return
+        g = self.grid_count
+        start = (g // 2) * g + g // 2
+        self.board[idx] = 0
+        self.board[idx, start] = 1
+        self.head_ptr[idx] = 0
+        self.body[idx, 0] = start
+        self.body_len[idx] = 1
+        self.length[idx] = 1
+        self.score[idx] = 0
+        self.steps[idx] = 0
+        self.direction[idx] = self.rng.integers(0, 4, len(idx))
+        self.done[idx] = False
+        self.won[idx] = False
+        self._spawn_food(idx)
+
+    def _spawn_food(self, idx: np.ndarray):
+        """Place food on a uniformly random free cell; a full board is a win."""
+        free = self.board[idx] == 0
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        self.food[idx] = keys.argmax(axis=1)
+        full = idx[~free.any(axis=1)]
+        self.won[full] = True
+        self.done[full] = True
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Advance every unfinished game by one tick.
+
+        Args:
+            actions: Integer array of length num_games, each an index into
+                DIRECTIONS; entries for finished games are ignored
+
+        Returns:
+            (rewards, done): +1 for eating, -1 for dying, 0 otherwise, and a
+            copy of the per-game finished flags
+        """
+        rewards = np.zeros(self.num_games, dtype=np.float32)
+        idx = np.flatnonzero(~self.done)
+        if len(idx) == 0:
+            return rewards, self.done.copy()
+
+        g = self.grid_count
+        act = np.asarray(actions, dtype=np.int64)[idx]
+        head = self.body[idx, self.head_ptr[idx]]
+        nx = head % g + DX[act]
+        ny = head // g + DY[act]
+        in_bounds = (nx >= 0) & (nx < g) & (ny >= 0) & (ny < g)
+        new = np.where(in_bounds, ny * g + nx, 0)
+        dead = ~in_bounds | (self.board[idx, new] != 0)
+
+        killed = idx[dead]
+        self.done[killed] = True
+        rewards[killed] = -1.0
+
+        ok = idx[~dead]
+        new = new[~dead]
+        ptr = (self.head_ptr[ok] + 1) % self.size
+        self.head_ptr[ok] = ptr
+        self.body[ok, ptr] = new
+        self.board[ok, new] = 1
+        self.body_len[ok] += 1
+        self.direction[ok] = act[~dead]
+        self.steps[ok] += 1
+
+        # Pop tails of snakes that are not growing
+        shrink = self.body_len[ok] > self.length[ok]
+        pop = ok[shrink]
+        tail_ptr = (self.head_ptr[pop] - self.body_len[pop] + 1) % self.size
+        self.board[pop, self.body[pop, tail_ptr]] = 0
+        self.body_len[pop] -= 1
+
+        ate = ok[new == self.food[ok]]
+        if len(ate):
+            self.length[ate] += 1
+            self.score[ate] += 1
+            rewards[ate] = 1.0
+            self._spawn_food(ate)
+        return rewards, self.done.copy()
+
+    def greedy_actions(self) -> np.ndarray:
+        """
+        Vectorized version of ComputerSnakeLogic's greedy move: the safe,
+        non-reversing neighbour closest to the food by Manhattan distance,
+        keeping the current heading if none is safe.
+
+        Returns:
+            Integer action array of length num_games
+        """
+        g = self.grid_count
+        head = self.head
+        hx = head % g
+        hy = head // g
+        fx = self.food % g
+        fy = self.food // g
+
+        nx = hx[:, None] + DX[None, :]
+        ny = hy[:, None] + DY[None, :]
+        in_bounds = (nx >= 0) & (nx < g) & (ny >= 0) & (ny < g)
+        cell = np.where(in_bounds, ny * g + nx, 0)
+        free = self.board[self._rows[:, None], cell] == 0
+        safe = in_bounds & free
+        safe[self._rows, REVERSE[self.direction]] = False
+
+        dist = np.abs(nx - fx[:, None]) + np.abs(ny - fy[:, None])
+        dist = np.where(safe, dist, np.iinfo(np.int64).max)
+        return np.where(safe.any(axis=1), dist.argmin(axis=1), self.direction)
@@ -0,0 +1,1013 @@
+"""
+Headless Snake game-state engine.
+Pure Python, no pygame: snakes, food, collision, scoring and tick stepping.
+The classic, AI-only and neon front-ends all drive this module, and it can
+be imported on machines without SDL for AI evaluation and regression runs.
+"""
+import random
+import time
+from array import array
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Tuple, Optional
+
+# Directional constants
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Grid constants
+GRID_COUNT = 25  # Number of cells per dimension
+
+Position = Tuple[int, int]
+
+EMPTY = 0  # Occupancy value of a free cell
+MAX_SNAKE_ID = 0xFFFF  # Largest owner id an occupancy cell can hold
+
+ZOBRIST_SEED = 0x5A0B  # Fixed, so equal states hash alike on every board and run
+MASK64 = (1 << 64) - 1
+GOLDEN64 = 0x9E3779B97F4A7C15  # Spreads owner ids into odd 64-bit multipliers
+
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for Zobrist hashing of one board size: a key per
+    cell for body segments, heads and food. A state's hash is the XOR of
+    the keys of everything on the board, so a move updates it with a few
+    XORs instead of rehashing the whole board.
+
+    Body keys also depend on the owner id. Rather than a table per snake,
+    the cell key is multiplied by an odd 64-bit multiplier derived from the
+    id, which keeps two snakes swapping cells from cancelling out. Heads
+    need no owner: the body key of the head cell already carries it.
+
+    Keys are kept in array('Q'), 8 bytes each: a list would hold a 32-byte
+    int object per key, some 190 MB on a 1000x1000 board. Use
+    ZobristKeys.for_size(); keys are generated once per board size, on
+    first use.
+    """
+
+    _cache: Dict[int, 'ZobristKeys'] = {}
+    _owner = array('Q')  # Owner id -> multiplier, shared by every size
+
+    def __init__(self, grid_count: int):
+        """
+        Generate the keys.
+
+        Args:
+            grid_count: Number of cells per dimension
+        """
+        rng = random.Random(ZOBRIST_SEED * 1000 + grid_count)
+        size = grid_count * grid_count
+        self.body = array('Q', rng.randbytes(8 * size))
+        self.head = array('Q', rng.randbytes(8 * size))
+        self.food = array('Q', rng.randbytes(8 * size))
+        if not ZobristKeys._owner:
+            ZobristKeys._owner = array('Q', [(owner * GOLDEN64 & MASK64) | 1
+                                             for owner in range(MAX_SNAKE_ID + 1)])
+        self.owner = ZobristKeys._owner
+
+    @classmethod
+    def for_size(cls, grid_count: int) -> 'ZobristKeys':
+        """
+        Get the shared keys for a board size.
+
+        Args:
+            grid_count: Number of cells per dimension
+
+        Returns:
+            Keys, created on first use
+        """
+        keys = cls._cache.get(grid_count)
+        if keys is None:
+            keys = cls._cache[grid_count] = cls(grid_count)
+        return keys
+
+    def body_key(self, i: int, owner: int) -> int:
+        """Key of a body segment of snake owner at flat cell index i."""
+        return self.body[i] * self.owner[owner] & MASK64
+
+
+class Board:
+    """
+    Occupancy grid with one cell per board square.
+    Each cell holds the id of the snake whose body covers it, or EMPTY.
+    Snakes update it incrementally on head insert and tail pop, so
+    collision and safety checks are a single index lookup.
+
+    Alongside the grid the board keeps a free-cell index: an array of every
+    empty cell plus each cell's slot in that array (-1 when occupied).
+    Occupying a cell swap-removes it, so picking a uniformly random free
+    cell is O(1) however crowded the board is.
+
+    The board also keeps a map of where the heads are, so policies can see
+    which free cells another snake could enter on the same tick (see
+    contested()). With hashing on, it keeps a Zobrist hash (see ZobristKeys)
+    of every occupied cell with its owner and of every snake head, updated
+    by the same calls; otherwise GameState.zobrist computes it on demand.
+    """
+
+    def __init__(self, grid_count: int = GRID_COUNT, hashing: bool = False):
+        """
+        Initialize an empty board.
+
+        Args:
+            grid_count: Number of cells per dimension
+            hashing: Keep the Zobrist hash up to date on every move
+        """
+        self.grid_count = grid_count
+        self.cells = array('H', bytes(2 * grid_count * grid_count))
+        self.free = array('i', range(grid_count * grid_count))
+        self.free_slot = array('i', range(grid_count * grid_count))
+        self.hashing = hashing
+        self.keys = ZobristKeys.for_size(grid_count) if hashing else None
+        if hashing:  # Shortcuts for the per-move updates
+            self.body_keys = self.keys.body
+            self.owner_keys = self.keys.owner
+            self.head_keys = self.keys.head
+        self.hash = 0
+        # Owner id of the snake whose head is on each cell, EMPTY if none
+        self.heads = array('H', bytes(2 * grid_count * grid_count))
+
+    def in_bounds(self, pos: Position) -> bool:
+        """
+        Check whether a position lies on the board.
+
+        Args:
+            pos: (x, y) grid position
+
+        Returns:
+            True if the position is inside the walls
+        """
+        n = self.grid_count
+        return 0 <= pos[0] < n and 0 <= pos[1] < n
+
+    def owner(self, pos: Position) -> int:
+        """
+        Get the id of the snake occupying a cell.
+
+        Args:
+            pos: (x, y) grid position inside the board
+
+        Returns:
+            Owner id, or EMPTY if the cell is free
+        """
+        return self.cells[pos[1] * self.grid_count + pos[0]]
+
+    def is_free(self, pos: Position) -> bool:
+        """
+        Check whether a snake could move into a position.
+
+        Args:
+            pos: (x, y) grid position, may be outside the board
+
+        Returns:
+            True if the position is inside the walls and unoccupied
+        """
+        x, y = pos
+        n = self.grid_count
+        return 0 <= x < n and 0 <= y < n and self.cells[y * n + x] == EMPTY
+
+    def occupy(self, pos: Position, owner: int):
+        """
+        Mark a cell as covered by a snake. Cells that already have an
+        owner keep it (e.g. a snake respawning on top of another).
+
+        Args:
+            pos: (x, y) grid position inside the board
+            owner: Id of the snake covering the cell
+        """
+        i = pos[1] * self.grid_count + pos[0]
+        if self.cells[i] == EMPTY:
+            self.occupy_index(i, owner)
+
+    def vacate(self, pos: Position, owner: int):
+        """
+        Free a cell if it is owned by the given snake.
+
+        Args:
+            pos: (x, y) grid position inside the board
+            owner: Id of the snake leaving the cell
+        """
+        i = pos[1] * self.grid_count + pos[0]
+        if self.cells[i] == owner:
+            self.vacate_index(i)
+
+    def occupy_index(self, i: int, owner: int):
+        """
+        Claim an empty cell by flat index and drop it from the free-cell index.
+
+        Args:
+            i: Flat cell index (y * grid_count + x) of an EMPTY cell
+            owner: Id of the snake covering the cell
+        """
+        self.cells[i] = owner
+        if self.hashing:
+            self.hash ^= self.body_keys[i] * self.owner_keys[owner] & MASK64
+        free = self.free
+        free_slot = self.free_slot
+        slot = free_slot[i]
+        last = free.pop()
+        if last != i:
+            free[slot] = last
+            free_slot[last] = slot
+        free_slot[i] = -1
+
+    def vacate_index(self, i: int):
+        """
+        Release an occupied cell by flat index and add it to the free-cell index.
+
+        Args:
+            i: Flat cell index (y * grid_count + x) of an occupied cell
+        """
+        if self.hashing:
+            self.hash ^= self.body_keys[i] * self.owner_keys[self.cells[i]] & MASK64
+        self.cells[i] = EMPTY
+        self.free_slot[i] = len(self.free)
+        self.free.append(i)
+
+    def move_head(self, old: int, new: int, owner: int):
+        """
+        Move a snake's head in the head map and the hash. Heads are hashed
+        apart from the body cells so that states differing only in which end
+        leads do not collide.
+
+        Args:
+            old: Flat index of the previous head, or -1 if it had none
+            new: Flat index of the new head, or -1 if it leaves the board
+            owner: Id of the snake
+        """
+        heads = self.heads
+        if old >= 0:
+            if self.hashing:
+                self.hash ^= self.head_keys[old]
+            if heads[old] == owner:
+                heads[old] = EMPTY
+        if new >= 0:
+            if self.hashing:
+                self.hash ^= self.head_keys[new]
+            heads[new] = owner
+
+    def contested(self, i: int, owner: int) -> bool:
+        """
+        Check whether a cell borders the head of a snake this one should
+        yield to: that snake could enter the cell on the same tick, and both
+        would die head-on. Snakes yield to lower owner ids only, so of two
+        snakes eyeing one cell exactly one backs off; if both did, two
+        snakes next to the same food could circle it forever.
+
+        Args:
+            i: Flat cell index
+            owner: Id of the snake asking
+
+        Returns:
+            True if the head of a snake with a lower id is next to the cell
+        """
+        n = self.grid_count
+        heads = self.heads
+        x = i % n
+        for j in (i - n if i >= n else -1,
+                  i + n if i + n < n * n else -1,
+                  i - 1 if x > 0 else -1,
+                  i + 1 if x < n - 1 else -1):
+            if j >= 0 and EMPTY != heads[j] < owner:
+                return True
+        return False
+
+    def rehash(self, heads: Iterable[Tuple[int, int]]):
+        """
+        Rebuild the head map, and the hash if the board keeps one, from
+        scratch, e.g. after loading cells in bulk.
+
+        Args:
+            heads: (flat index, owner id) of every snake's head
+        """
+        heads = list(heads)
+        head_map = self.heads = array('H', bytes(2 * len(self.cells)))
+        for i, owner in heads:
+            head_map[i] = owner
+        if self.hashing:
+            self.hash = self.compute_hash(i for i, _ in heads)
+
+    def compute_hash(self, heads: Iterable[int]) -> int:
+        """
+        Hash the body cells and the given heads from scratch, in O(board).
+
+        Args:
+            heads: Flat index of every snake's head
+
+        Returns:
+            The value the incremental hash has when hashing is on
+        """
+        keys = ZobristKeys.for_size(self.grid_count)
+        h = 0
+        for i, owner in enumerate(self.cells):
+            if owner != EMPTY:
+                h ^= keys.body_key(i, owner)
+        for i in heads:
+            h ^= keys.head[i]
+        return h
+
+    def rebuild_free_index(self):
+        """Recompute the free-cell index from cells, e.g. after loading them in bulk."""
+        free = array('i', [i for i, owner in enumerate(self.cells) if owner == EMPTY])
+        free_slot = array('i', [-1]) * len(self.cells)
+        for slot, i in enumerate(free):
+            free_slot[i] = slot
+        self.free = free
+        self.free_slot = free_slot
+
+    def random_free_cell(self, rng) -> Optional[Position]:
+        """
+        Pick a uniformly random unoccupied cell in O(1).
+
+        Args:
+            rng: Random source providing randrange
+
+        Returns:
+            (x, y) grid position, or None if the board is full
+        """
+        free = self.free
+        if not free:
+            return None
+        i = free[rng.randrange(len(free))]
+        return (i % self.grid_count, i // self.grid_count)
+
+
+class SnakeLogic:
+    """
+    Display-free snake: body positions, direction, length and score.
+    Handles movement and collision detection against walls, itself and
+    other snakes.
+
+    The body is a deque ordered head first, so advancing is an O(1)
+    appendleft plus pop; renderers simply iterate over positions.
+    """
+
+    def __init__(self, start_pos: Optional[Position] = None,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize a new snake.
+
+        Args:
+            start_pos: Starting (x, y) grid position, board centre if None
+            rng: Random source for the initial direction, module-level if None
+        """
+        self.start_pos = start_pos
+        self.rng = rng if rng is not None else random
+        self.board = Board()
+        self.id = 1
+        self.positions: Deque[Position] = deque()
+        self.moves = 0  # Successful moves ever made, for renderers tracking changes
+        self.reset()
+
+    def get_head_position(self) -> Position:
+        """
+        Get the current position of the snake's head.
+
+        Returns:
+            Tuple of (x, y) grid coordinates
+        """
+        return self.positions[0]
+
+    def get_tail_position(self) -> Position:
+        """
+        Get the current position of the snake's last segment.
+
+        Returns:
+            Tuple of (x, y) grid coordinates
+        """
+        return self.positions[-1]
+
+    def attach(self, board: Board, snake_id: int):
+        """
+        Move this snake onto a (shared) board under a new owner id and reset it.
+
+        Args:
+            board: Occupancy grid to live on
+            snake_id: Owner id to tag this snake's cells with
+        """
+        self.clear_from_board()
+        self.positions.clear()  # Its cells belong to the old board
+        self.board = board
+        self.id = snake_id
+        self.reset()
+
+    def clear_from_board(self):
+        """Remove this snake's body and head from its occupancy grid."""
+        board = self.board
+        if self.positions and board.in_bounds(self.positions[0]):
+            x, y = self.positions[0]
+            board.move_head(y * board.grid_count + x, -1, self.id)
+        for p in self.positions:
+            if board.in_bounds(p):
+                board.vacate(p, self.id)
+
+    def reset(self):
+        """Reset snake to initial state."""
+        self.clear_from_board()
+        start = self.start_pos
+        if start is None:
+            centre = self.board.grid_count // 2
+            start = (centre, centre)
+        self.length = 1
+        self.positions = deque((start,))
+        self.vacated: Optional[Position] = None  # Cell the tail left on the last move
+        # A snake not yet added to a game sits on a default-sized private
+        # board, which a start cell meant for a larger board may lie outside
+        if self.board.in_bounds(start):
+            self.board.occupy(start, self.id)
+            self.board.move_head(-1, start[1] * self.board.grid_count + start[0], self.id)
+        self.direction = self.rng.choice(DIRECTIONS)
+        self.score = 0
+
+    def update(self) -> bool:
+        """
+        Update snake position (single snake mode).
+
+        Returns:
+            True if move was successful, False if collision occurred
+        """
+        return self.update_with_collision_check([])
+
+    def update_with_collision_check(self, all_snakes: List['SnakeLogic']) -> bool:
+        """
+        Update snake position with full collision checking.
+        Checks for wall collisions, self-collisions, and collisions with other
+        snakes in constant time via the shared occupancy grid.
+
+        Args:
+            all_snakes: Kept for API compatibility; every snake sharing this
+                snake's board is checked regardless
+
+        Returns:
+            True if move was successful, False if collision occurred
+        """
+        cur = self.get_head_position()
+        nx = cur[0] + self.direction[0]
+        ny = cur[1] + self.direction[1]
+        board = self.board
+        n = board.grid_count
+
+        # Check for wall collision
+        if nx < 0 or nx >= n or ny < 0 or ny >= n:
+            return False
+
+        # Check for collision with any body cell, including our own
+        cells = board.cells
+        i = ny * n + nx
+        if cells[i] != EMPTY:
+            return False
+
+        # Move snake
+        positions = self.positions
+        positions.appendleft((nx, ny))
+        self.moves += 1
+        board.occupy_index(i, self.id)
+        j = cur[1] * n + cur[0]
+        if board.hashing:
+            board.hash ^= board.head_keys[j] ^ board.head_keys[i]
+        heads = board.heads
+        if heads[j] == self.id:
+            heads[j] = EMPTY
+        heads[i] = self.id
+        if len(positions) > self.length:
+            tail = positions.pop()
+            self.vacated = tail
+            j = tail[1] * n + tail[0]
+            if cells[j] == self.id:
+                board.vacate_index(j)
+        else:
+            self.vacated = None
+        return True
+
+    def interpolated_ends(self, t: float) -> Tuple[Tuple[float, float],
+                                                  Optional[Tuple[float, float]]]:
+        """
+        Blend the head and the vacated tail cell between the previous and
+        the current move, so renderers can draw smooth motion between ticks
+        without copying the body.
+
+        Args:
+            t: Progress from the previous move (0.0) to the current one (1.0)
+
+        Returns:
+            (head (x, y), vacated tail (x, y) sliding into the current tail,
+            or None if the snake grew or has not moved)
+        """
+        positions = self.positions
+        hx, hy = positions[0]
+        if len(positions) > 1:
+            px, py = positions[1]
+        elif self.vacated is not None:
+            px, py = self.vacated
+        else:
+            px, py = hx, hy
+        head = (px + (hx - px) * t, py + (hy - py) * t)
+        if self.vacated is None:
+            return head, None
+        vx, vy = self.vacated
+        tx, ty = positions[-1]
+        return head, (vx + (tx - vx) * t, vy + (ty - vy) * t)
+
+
+class ComputerSnakeLogic(SnakeLogic):
+    """
+    AI-controlled snake logic with collision avoidance.
+    By default picks the safe neighbour that minimizes Manhattan distance to
+    the food; an optional policy object (see snake_ai) can take over the
+    decision and falls back to that greedy move when it has no answer.
+    """
+
+    def __init__(self, start_pos: Optional[Position] = None,
+                 rng: Optional[random.Random] = None, policy=None):
+        """
+        Initialize an AI snake.
+
+        Args:
+            start_pos: Starting (x, y) grid position, board centre if None
+            rng: Random source for the initial direction, module-level if None
+            policy: Optional object with choose(snake, food_pos, all_snakes)
+                returning a direction or None
+        """
+        self.policy = policy
+        super().__init__(start_pos, rng)
+
+    def ai_move(self, food_pos: Position, all_snakes: List[SnakeLogic]):
+        """
+        Choose a new direction toward food while avoiding collisions.
+
+        Args:
+            food_pos: Target food position (x, y)
+            all_snakes: All snakes in the game, passed on to the policy;
+                obstacles come from the shared occupancy grid
+        """
+        if self.policy is not None:
+            move = self.policy.choose(self, food_pos, all_snakes)
+            if move is not None:
+                self.direction = move
+                return
+
+        head_x, head_y = self.get_head_position()
+        food_x, food_y = food_pos
+        cells = self.board.cells
+        n = self.board.grid_count
+
+        candidates = []
+        for move in DIRECTIONS:
+            # Don't reverse direction (would cause instant self-collision)
+            if move == (-self.direction[0], -self.direction[1]):
+                continue
+            nx, ny = head_x + move[0], head_y + move[1]
+            if nx < 0 or nx >= n or ny < 0 or ny >= n:
+                continue
+            # Check collision with other snakes and self
+            if cells[ny * n + nx] != EMPTY:
+                continue
+            candidates.append(move)
+
+        if not candidates:
+            # No safe moves available, keep current direction
+            return
+
+        # Cells a head with priority could also enter risk a head-on death: last resort
+        contested = self.board.contested
+        self.direction = min(candidates, key=lambda m: (
+            contested((head_y + m[1]) * n + head_x + m[0], self.id),
+            abs(head_x + m[0] - food_x) + abs(head_y + m[1] - food_y)
+        ))
+
+
+class FoodLogic:
+    """Display-free food item that snakes can eat to grow."""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Initialize food at the origin.
+
+        Args:
+            rng: Random source for spawning, module-level if None
+        """
+        self.position = (0, 0)
+        self.rng = rng if rng is not None else random
+        self.board: Optional[Board] = None
+
+    def randomize_position(self, snakes: Optional[List[SnakeLogic]] = None) -> bool:
+        """
+        Move the food to a uniformly random unoccupied cell in O(1) using the
+        board's free-cell index.
+
+        Args:
+            snakes: Optional list of snakes to avoid; only used to find their
+                shared board when the food has not been given one
+
+        Returns:
+            True if the food was placed, False if the board is full (the
+            position is left unchanged)
+        """
+        board = self.board
+        if board is None and snakes:
+            board = snakes[0].board
+        if board is None:
+            self.position = (self.rng.randrange(GRID_COUNT),
+                             self.rng.randrange(GRID_COUNT))
+            return True
+
+        pos = board.random_free_cell(self.rng)
+        if pos is None:
+            return False
+        self.position = pos
+        return True
+
+
+class FixedTimestep:
+    """
+    Fixed-rate simulation clock. Elapsed wall time from the render loop is
+    added to an accumulator and converted into whole simulation ticks, so
+    game speed no longer depends on how long a frame took to draw. The
+    leftover fraction (alpha) tells renderers how far the simulation is
+    toward its next tick.
+
+    In turbo mode the tick rate is uncapped: every frame runs as many ticks
+    as fit in a fixed time budget before rendering once.
+    """
+
+    def __init__(self, rate: float, max_ticks_per_frame: int = 5,
+                 turbo_budget: float = 0.025):
+        """
+        Initialize the clock.
+
+        Args:
+            rate: Simulation ticks per second
+            max_ticks_per_frame: Catch-up limit after a long stall; extra
+                time beyond it is dropped rather than simulated
+            turbo_budget: Seconds of simulation per frame in turbo mode
+        """
+        self.step = 1.0 / rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.turbo_budget = turbo_budget
+        self.turbo = False
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of the way from the last tick to the next (0.0 - 1.0)."""
+        return 1.0 if self.turbo else self.accumulator / self.step
+
+    def reset(self):
+        """Discard accumulated time, e.g. after a pause or restart."""
+        self.accumulator = 0.0
+
+    def ticks(self, dt: float) -> Iterator[int]:
+        """
+        Yield once per simulation tick due for this frame. Time is
+        accounted for up front, so callers may break out early.
+
+        Args:
+            dt: Wall-clock seconds since the previous frame
+
+        Yields:
+            Index of the tick within this frame
+        """
+        if self.turbo:
+            self.accumulator = 0.0
+            deadline = time.perf_counter() + self.turbo_budget
+            count = 0
+            while time.perf_counter() < deadline:
+                yield count
+                count += 1
+            return
+
+        self.accumulator += dt
+        count = int(self.accumulator / self.step)
+        if count > self.max_ticks_per_frame:
+            count = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= count * self.step
+        yield from range(count)
+
+
+class GameState:
+    """
+    One game: its snakes, the shared occupancy grid, the food item, a seeded
+    RNG and the tick counter.
+    Front-ends call the individual phases (move_simultaneous or move_snakes,
+    check_food) on their own timers; headless callers can simply call step()
+    in a loop.
+
+    Every state-changing call is also reported to an optional recorder
+    (see snake_replay), which is enough to replay the game exactly from
+    its seed.
+
+    The zobrist property identifies the position (bodies, heads and food)
+    for transposition tables; see snake_ai.TranspositionTable. Pass
+    hashing=True when it is read often: the hash is then updated with a few
+    XORs on each move instead of recomputed in O(board) on each read.
+    """
+
+    def __init__(self, seed: Optional[int] = None,
+                 food: Optional[FoodLogic] = None, grid_count: int = GRID_COUNT,
+                 hashing: bool = False):
+        """
+        Initialize an empty game.
+
+        Args:
+            seed: Seed for the game's private RNG, a random one if None
+            food: Food object to use (e.g. a renderable subclass), new if None
+            grid_count: Number of cells per dimension of the board
+            hashing: Keep the Zobrist hash up to date on every move
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.grid_count = grid_count
+        self.board = Board(grid_count, hashing)
+        self.snakes: List[SnakeLogic] = []
+        self._next_id = 1
+        self.food = food if food is not None else FoodLogic()
+        self.food.rng = self.rng
+        self.food.board = self.board
+        self.tick = 0
+        self.won = False  # Set when food cannot spawn because the board is full
+        self.recorder = None  # Optional snake_replay.ReplayRecorder
+
+    def add_snake(self, snake: SnakeLogic) -> SnakeLogic:
+        """
+        Add a snake to the game, attach it to the shared board under a fresh
+        owner id and reset it from the game's RNG so that a seeded game is
+        fully deterministic.
+
+        Args:
+            snake: Snake to add
+
+        Returns:
+            The same snake, for chaining
+        """
+        snake.rng = self.rng
+        snake.attach(self.board, self._allocate_id())
+        self.snakes.append(snake)
+        if self.recorder is not None:
+            self.recorder.add_snake(snake)
+        return snake
+
+    def remove_snake(self, snake: SnakeLogic):
+        """
+        Remove a snake from the game and free its cells on the board.
+
+        Args:
+            snake: Snake to remove
+        """
+        if self.recorder is not None:
+            self.recorder.remove_snake(snake)
+        self.snakes.remove(snake)
+        snake.clear_from_board()
+
+    def reset_snake(self, snake: SnakeLogic):
+        """
+        Respawn a snake of this game at its start position. Use this rather
+        than snake.reset() so the respawn is recorded.
+
+        Args:
+            snake: Snake to reset
+        """
+        snake.reset()
+        if self.recorder is not None:
+            self.recorder.reset_snake(snake)
+
+    def _allocate_id(self) -> int:
+        """Return an owner id not used by any snake currently in the game."""
+        in_use = {snake.id for snake in self.snakes}
+        snake_id = self._next_id
+        while snake_id in in_use:
+            snake_id = snake_id % MAX_SNAKE_ID + 1
+        self._next_id = snake_id % MAX_SNAKE_ID + 1
+        return snake_id
+
+    def spawn_food(self) -> bool:
+        """
+        Move the food to a free cell. If none is left the board is full,
+        which ends the game as a win (self.won).
+
+        Returns:
+            True if the food was placed
+        """
+        if self.recorder is not None:
+            self.recorder.spawn_food()
+        return self._place_food()
+
+    def _place_food(self) -> bool:
+        """Unrecorded body of spawn_food, also used when food is eaten."""
+        self.won = not self.food.randomize_position(self.snakes)
+        return not self.won
+
+    @property
+    def zobrist(self) -> int:
+        """
+        64-bit Zobrist hash of the position: every snake's body cells and
+        head, which a hashing board keeps up to date on each move, and the
+        food. Directions, scores and pending growth are not part of it.
+        """
+        board = self.board
+        h = board.hash if board.hashing else board.compute_hash(i for i, _ in self._heads())
+        x, y = self.food.position
+        n = self.grid_count
+        if 0 <= x < n and 0 <= y < n:
+            return h ^ ZobristKeys.for_size(n).food[y * n + x]
+        return h
+
+    def rehash(self):
+        """Rebuild the board's head map and hash after snakes or cells were loaded in bulk."""
+        self.board.rehash(self._heads())
+
+    def _heads(self) -> Iterator[Tuple[int, int]]:
+        """(flat index, owner id) of the head of every snake on the board."""
+        n = self.grid_count
+        return ((s.positions[0][1] * n + s.positions[0][0], s.id)
+                for s in self.snakes if s.positions)
+
+    def move_snakes(self, movers: List[SnakeLogic]) -> List[SnakeLogic]:
+        """
+        Advance the given snakes one cell each, in list order: a snake sees
+        the moves of the snakes before it. See move_simultaneous() for an
+        order-independent step.
+
+        Args:
+            movers: Snakes to move this tick
+
+        Returns:
+            Snakes that collided (still in the game; callers decide removal)
+        """
+        if self.recorder is not None:
+            self.recorder.move_snakes(movers)
+        dead = []
+        for snake in movers:
+            if not snake.update_with_collision_check(self.snakes):
+                dead.append(snake)
+        return dead
+
+    def move_simultaneous(self, movers: List[SnakeLogic]) -> List[SnakeLogic]:
+        """
+        Advance the given snakes one cell each as a single simultaneous
+        step, so the outcome does not depend on the order of the list.
+
+        Every intended head is computed first. A move fails if it leaves the
+        board, reverses into the snake's own neck, targets the same cell as
+        another mover (head-on, all of them die; AI policies steer clear of
+        such cells via Board.contested), swaps cells with a one-cell snake,
+        or enters an occupied cell. Entering a tail cell is allowed when its
+        snake moves away this tick, so snakes chasing each other's tails in a
+        ring all move; if that snake dies instead, its tail stays and the
+        entering snake dies too. Survivors then vacate their tails and occupy
+        their new heads.
+
+        Args:
+            movers: Snakes to move this tick
+
+        Returns:
+            Snakes that collided, in list order (still in the game and
+            unmoved; callers decide removal)
+        """
+        if self.recorder is not None:
+            self.recorder.move_simultaneous(movers)
+        board = self.board
+        n = board.grid_count
+        cells = board.cells
+
+        # Intended head of every mover, and the cells tails will leave
+        targets: Dict[SnakeLogic, int] = {}
+        claims: Dict[int, int] = {}
+        tails: Dict[int, SnakeLogic] = {}
+        for snake in movers:
+            positions = snake.positions
+            x, y = positions[0]
+            nx = x + snake.direction[0]
+            ny = y + snake.direction[1]
+            if 0 <= nx < n and 0 <= ny < n:
+                t = ny * n + nx
+                claims[t] = claims.get(t, 0) + 1
+            else:
+                t = -1
+            targets[snake] = t
+            if len(positions) >= snake.length:
+                tx, ty = positions[-1]
+                j = ty * n + tx
+                if cells[j] == snake.id:
+                    tails[j] = snake
+
+        dead = set()
+        entering: Dict[SnakeLogic, SnakeLogic] = {}  # Tail owner -> snake moving into its tail
+        for snake, t in targets.items():
+            if t < 0 or claims[t] > 1:
+                dead.add(snake)
+                continue
+            positions = snake.positions
+            if len(positions) > 1:
+                nx, ny = positions[1]
+                if t == ny * n + nx:
+                    dead.add(snake)  # Reversing into its own neck
+                    continue
+            if cells[t] == EMPTY:
+                continue
+            owner = tails.get(t)
+            if owner is None:
+                dead.add(snake)
+            elif owner is not snake:
+                hx, hy = positions[0]
+                ox, oy = owner.positions[0]
+                if oy * n + ox == t and targets.get(owner) == hy * n + hx:
+                    # A one-cell snake and this one swapping cells would pass
+                    # through each other
+                    dead.add(snake)
+                else:
+                    entering[owner] = snake
+
+        # A snake that dies does not move, so whoever entered its tail dies as well
+        pending = list(dead)
+        while pending:
+            snake = entering.pop(pending.pop(), None)
+            if snake is not None and snake not in dead:
+                dead.add(snake)
+                pending.append(snake)
+
+        survivors = [snake for snake in movers if snake not in dead]
+        for snake in survivors:
+            positions = snake.positions
+            if len(positions) >= snake.length:
+                tail = positions.pop()
+                snake.vacated = tail
+                j = tail[1] * n + tail[0]
+                if cells[j] == snake.id:
+                    board.vacate_index(j)
+            else:
+                snake.vacated = None
+        hashing = board.hashing
+        heads = board.heads
+        for snake in survivors:
+            t = targets[snake]
+            hx, hy = snake.positions[0] if snake.positions else snake.vacated
+            snake.positions.appendleft((t % n, t // n))
+            snake.moves += 1
+            board.occupy_index(t, snake.id)
+            j = hy * n + hx
+            if hashing:
+                board.hash ^= board.head_keys[j] ^ board.head_keys[t]
+            if heads[j] == snake.id:
+                heads[j] = EMPTY
+            heads[t] = snake.id
+        return [snake for snake in movers if snake in dead]
+
+    def check_food(self) -> Optional[SnakeLogic]:
+        """
+        Let the first snake whose head is on the food eat it.
+
+        Returns:
+            The snake that ate, or None
+        """
+        if self.recorder is not None:
+            self.recorder.check_food()
+        food_pos = self.food.position
+        for snake in self.snakes:
+            if snake.get_head_position() == food_pos:
+                snake.length += 1
+                snake.score += 1
+                self._place_food()
+                return snake
+        return None
+
+    def step(self) -> List[SnakeLogic]:
+        """
+        Run one full headless tick: AI decisions, simultaneous movement,
+        removal of collided snakes and food.
+
+        Returns:
+            Snakes that died this tick
+        """
+        food_pos = self.food.position
+        for snake in self.snakes:
+            if isinstance(snake, ComputerSnakeLogic):
+                snake.ai_move(food_pos, self.snakes)
+        dead = self.move_simultaneous(self.snakes)
+        for snake in dead:
+            self.remove_snake(snake)
+        self.check_food()
+        self.tick += 1
+        return dead
+
+    def run(self, max_ticks: int) -> int:
+        """
+        Step until every snake is dead, the board is full or max_ticks is
+        reached.
+
+        Args:
+            max_ticks: Upper bound on ticks to simulate
+
+        Returns:
+            Number of ticks simulated
+        """
+        start = self.tick
+        while self.snakes and not self.won and self.tick - start < max_ticks:
+            self.step()
+        return self.tick - start
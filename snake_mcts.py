@@ -0,0 +1,548 @@
+"""
+Monte Carlo tree search policy for engine snakes.
+
+Each decision runs as many simulations as fit in a hard time budget: a
+few milliseconds per move, so it never stalls the frame loop. The tree
+holds only the searching snake's own moves (open loop); the other snakes
+are sampled on every simulation with the same quick heuristic the
+rollouts use, so the search plans against a range of plausible opponents
+rather than a single guess.
+
+Simulations do not touch the engine's snakes. They run on a RolloutState:
+an occupancy grid that also records, per cell, how many moves its snake
+had made when it entered it. A snake's body is simply the last `length`
+cells it entered, so a move writes one cell and never has to pop a tail.
+Every simulation shares the root's grid, logs the cells it writes and
+undoes them when it ends, and the grid itself is kept from one decision
+to the next, so neither a simulation nor a decision costs O(board).
+"""
+import math
+import random
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from snake_engine import DIRECTIONS, EMPTY, Position, SnakeLogic
+from snake_ai import (UNREACHED, Direction, FoodDistanceField, SearchBuffer,
+                      neighbours, reachable_area)
+
+MCTS_BUDGET = 0.005  # Seconds of search per move
+MCTS_ITERATIONS = 150  # Simulations per move when searching without a time budget
+SAFE_AREA_LIMIT = 256  # Cells the flood fill checking first moves explores at most
+FIELD_CELLS = 2_000  # Cells the policy's own food field search visits, about a millisecond
+HORIZON = 12  # Moves each simulation looks ahead
+EXPLORATION = 0.7  # UCT exploration constant; rewards lie in [0, 1]
+ROLLOUT_EPSILON = 0.15  # Chance a heuristic rollout move is random rather than greedy
+OPPONENT_EPSILON = 0.05  # The same for the other snakes, whose AIs rarely err
+FOOD_TRIES = 16  # Random cells tried when a rollout respawns the food
+FOOD_DISCOUNT = 0.85  # Value of food eaten one move later relative to now
+
+REVERSE = (1, 0, 3, 2)  # Index in DIRECTIONS of each direction's opposite
+WALL = -2  # Target of a move that leaves the board
+
+
+class RolloutState:
+    """
+    Game state for simulations, with snakes numbered by slot.
+
+    owner[i] is 1 + the slot of the last snake to enter cell i (0 if none)
+    and stamp[i] that snake's clock when it did. A snake's clock counts its
+    moves, so cell i belongs to its body while clock - stamp[i] < length;
+    dead snakes' cells count as free.
+
+    Copies share the grid arrays and log the cells they write, newest
+    last, in journal; undo() puts those cells back.
+    """
+
+    __slots__ = ('n', 'owner', 'stamp', 'heads', 'dirs', 'lengths', 'clocks',
+                 'alive', 'food', 'eater', 'rng', 'dist', 'cells', 'journal')
+
+    @classmethod
+    def capture(cls, grid_count: int, snakes: List[SnakeLogic], food_pos: Position,
+                rng: random.Random, dist: Optional[array] = None,
+                previous: Optional['RolloutState'] = None) -> 'RolloutState':
+        """
+        Build a state from engine snakes.
+
+        Args:
+            grid_count: Number of cells per board dimension
+            snakes: Snakes in the game; their list index becomes their slot
+            food_pos: Food position (x, y)
+            rng: Random source for food respawns in the simulations
+            dist: Breadth-first distances to this food (UNREACHED where
+                unknown), shared by every copy until the food moves
+            previous: Earlier capture whose copies were all undone; its
+                grid is cleared cell by cell and reused if the size matches
+
+        Returns:
+            The new state
+        """
+        state = cls.__new__(cls)
+        n = grid_count
+        state.n = n
+        if previous is not None and previous.n == n:
+            owner = state.owner = previous.owner
+            stamp = state.stamp = previous.stamp
+            for i in previous.cells:
+                owner[i] = 0
+        else:
+            owner = state.owner = array('H', bytes(2 * n * n))
+            stamp = state.stamp = array('i', bytes(4 * n * n))
+        cells = state.cells = []  # Cells written here, for the next capture to clear
+        state.journal = None
+        state.heads = []
+        state.dirs = []
+        state.lengths = []
+        state.clocks = []
+        state.alive = []
+        for s, snake in enumerate(snakes):
+            # Tail first, so the head wins a cell shared with a respawned snake
+            for age in range(len(snake.positions) - 1, -1, -1):
+                x, y = snake.positions[age]
+                owner[y * n + x] = s + 1
+                stamp[y * n + x] = -age
+                cells.append(y * n + x)
+            x, y = snake.positions[0]
+            state.heads.append(y * n + x)
+            state.dirs.append(DIRECTIONS.index(snake.direction))
+            state.lengths.append(snake.length)
+            state.clocks.append(0)
+            state.alive.append(True)
+        x, y = food_pos
+        state.food = y * n + x if 0 <= x < n and 0 <= y < n else -1
+        state.eater = -1
+        state.rng = rng
+        state.dist = dist
+        return state
+
+    def copy(self) -> 'RolloutState':
+        """
+        Copy to simulate on. It writes to this state's grid, so undo() it
+        before using this state or making another copy.
+        """
+        state = RolloutState.__new__(RolloutState)
+        state.n = self.n
+        state.owner = self.owner
+        state.stamp = self.stamp
+        state.cells = self.cells
+        state.journal = []
+        state.heads = self.heads[:]
+        state.dirs = self.dirs[:]
+        state.lengths = self.lengths[:]
+        state.clocks = self.clocks[:]
+        state.alive = self.alive[:]
+        state.food = self.food
+        state.eater = -1
+        state.rng = self.rng
+        state.dist = self.dist
+        return state
+
+    def undo(self):
+        """Restore the grid cells this copy wrote, newest first."""
+        journal = self.journal
+        owner = self.owner
+        stamp = self.stamp
+        for k in range(len(journal) - 3, -1, -3):
+            i = journal[k]
+            owner[i] = journal[k + 1]
+            stamp[i] = journal[k + 2]
+        journal.clear()
+
+    def distance(self, i: int) -> int:
+        """
+        Moves from a cell to the food: the breadth-first distance where it
+        is known, Manhattan distance otherwise.
+
+        Args:
+            i: Flat cell index
+
+        Returns:
+            Distance, 0 if there is no food on the board
+        """
+        food = self.food
+        if food < 0:
+            return 0
+        dist = self.dist
+        if dist is not None:
+            d = dist[i]
+            if d != UNREACHED:
+                return d
+        n = self.n
+        return abs(i % n - food % n) + abs(i // n - food // n)
+
+    def open_moves(self, s: int) -> List[int]:
+        """
+        Moves of a snake onto cells that are on the board and not covered
+        by a body after this step. Its own reverse move is excluded.
+
+        Args:
+            s: Slot of the snake to move
+
+        Returns:
+            Indices into DIRECTIONS
+        """
+        n = self.n
+        owner = self.owner
+        stamp = self.stamp
+        alive = self.alive
+        clocks = self.clocks
+        lengths = self.lengths
+        h = self.heads[s]
+        x, y = h % n, h // n
+        reverse = REVERSE[self.dirs[s]]
+        moves = []
+        for d in range(4):
+            if d == reverse:
+                continue
+            dx, dy = DIRECTIONS[d]
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < n and 0 <= ny < n):
+                continue
+            i = ny * n + nx
+            o = owner[i] - 1
+            if o >= 0 and alive[o] and clocks[o] - stamp[i] + 1 < lengths[o]:
+                continue
+            moves.append(d)
+        return moves
+
+    def heuristic_move(self, s: int, epsilon: float) -> int:
+        """
+        Rollout policy: an open move (see open_moves), greedy toward the
+        food or, with probability epsilon, random.
+
+        Args:
+            s: Slot of the snake to move
+            epsilon: Chance of a random open move
+
+        Returns:
+            Index into DIRECTIONS; the current direction if all are blocked
+        """
+        options = self.open_moves(s)
+        if not options:
+            return self.dirs[s]
+        if epsilon and self.rng.random() < epsilon:
+            return self.rng.choice(options)
+        n = self.n
+        h = self.heads[s]
+        distance = self.distance
+        best = -1
+        best_d = UNREACHED
+        for d in options:
+            dx, dy = DIRECTIONS[d]
+            dist = distance(h + dy * n + dx)
+            if dist < best_d:
+                best, best_d = d, dist
+        return best
+
+    def step(self, choices: List[int]) -> List[int]:
+        """
+        Move every live snake one cell at once, then let one eat.
+        Collisions follow GameState.move_simultaneous, except that a snake
+        whose tail cell was entered is assumed to move even if it dies.
+
+        Args:
+            choices: Index into DIRECTIONS per slot (ignored for dead snakes)
+
+        Returns:
+            Slots that died this step
+        """
+        n = self.n
+        owner = self.owner
+        stamp = self.stamp
+        heads = self.heads
+        alive = self.alive
+        clocks = self.clocks
+        lengths = self.lengths
+        dirs = self.dirs
+        count = len(heads)
+
+        targets = [-1] * count
+        claims: Dict[int, int] = {}
+        for s in range(count):
+            if not alive[s]:
+                continue
+            d = choices[s]
+            dirs[s] = d
+            dx, dy = DIRECTIONS[d]
+            h = heads[s]
+            x, y = h % n + dx, h // n + dy
+            if 0 <= x < n and 0 <= y < n:
+                t = y * n + x
+                targets[s] = t
+                claims[t] = claims.get(t, 0) + 1
+            else:
+                targets[s] = WALL
+
+        dead = []
+        for s in range(count):
+            t = targets[s]
+            if t == -1:
+                continue
+            if t == WALL or claims[t] > 1:
+                dead.append(s)
+                continue
+            o = owner[t] - 1
+            if o >= 0 and alive[o]:
+                if clocks[o] - stamp[t] + 1 < lengths[o]:
+                    dead.append(s)  # Still covered after its owner moves
+                elif o != s and heads[o] == t and targets[o] == heads[s]:
+                    dead.append(s)  # Swapping cells with a one-cell snake
+
+        for s in dead:
+            alive[s] = False
+        journal = self.journal
+        for s in range(count):
+            if alive[s]:
+                t = targets[s]
+                if journal is not None:
+                    journal.extend((t, owner[t], stamp[t]))
+                clock = clocks[s] + 1
+                clocks[s] = clock
+                heads[s] = t
+                owner[t] = s + 1
+                stamp[t] = clock
+
+        self.eater = -1
+        food = self.food
+        if food >= 0:
+            for s in range(count):
+                if alive[s] and heads[s] == food:
+                    lengths[s] += 1
+                    self.eater = s
+                    self._respawn_food()
+                    break
+        return dead
+
+    def _respawn_food(self):
+        """Move the food to a random free cell, or off the board if none was found."""
+        n = self.n
+        owner = self.owner
+        randrange = self.rng.randrange
+        self.food = -1
+        self.dist = None
+        for _ in range(FOOD_TRIES):
+            i = randrange(n * n)
+            o = owner[i] - 1
+            if o < 0 or not self.alive[o] or self.clocks[o] - self.stamp[i] >= self.lengths[o]:
+                self.food = i
+                return
+
+
+class _Node:
+    """Open-loop tree node: statistics of one sequence of own moves."""
+
+    __slots__ = ('visits', 'total', 'children', 'untried')
+
+    def __init__(self):
+        self.visits = 0
+        self.total = 0.0
+        self.children: Dict[int, '_Node'] = {}
+        # Moves not expanded yet, filled in on the first visit
+        self.untried: Optional[List[int]] = None
+
+
+class MCTSPolicy:
+    """
+    Monte Carlo tree search over the snake's own next moves. Simulations
+    descend the tree by UCT, add one node, then play the rest of the
+    horizon out with heuristic (or uniformly random) moves for every
+    snake. A simulation scores 0 for dying at once, up to 0.3 for dying
+    late, and from 0.5 upward for surviving, with more for food eaten
+    early and for ending closer to the food. The move visited most is
+    played.
+
+    Food distances come from a FoodDistanceField, so rollouts and scores
+    follow real paths around bodies rather than straight lines. The
+    horizon is too short to see a pocket the snake cannot fill, so first
+    moves are checked with the same capped flood fill FloodFillPolicy
+    uses, and only moves whose region fits the snake (or area_limit
+    cells) are searched when there are any.
+
+    The search stops at the deadline, even mid-rollout, and gives up
+    without a move if the setup before the first simulation already used
+    the budget up; with iterations set and no budget it runs a fixed
+    number of simulations instead, which with a seed makes it
+    reproducible.
+    """
+
+    def __init__(self, budget: Optional[float] = MCTS_BUDGET,
+                 iterations: Optional[int] = None, horizon: int = HORIZON,
+                 rollout: str = 'heuristic', seed: Optional[int] = None,
+                 buffer: Optional[SearchBuffer] = None,
+                 field: Optional[FoodDistanceField] = None,
+                 area_limit: int = SAFE_AREA_LIMIT):
+        """
+        Initialize the search.
+
+        Args:
+            budget: Seconds to search per move, or None for no time limit
+            iterations: Cap on simulations per move; MCTS_ITERATIONS when
+                budget is None
+            horizon: Moves each simulation looks ahead
+            rollout: 'heuristic' (greedy toward food with some noise) or
+                'random' (uniform over safe moves)
+            seed: Seed for the search's own RNG (never the game's, so replays
+                stay in sync), random if None
+            buffer: Scratch buffers to share with other searches, new if None
+            field: Food distances shared with the game's other AI snakes and
+                updated by the front-end; the policy keeps its own, capped
+                at FIELD_CELLS cells, if None
+            area_limit: Cells the flood fill checking first moves explores
+                at most
+        """
+        if budget is None and iterations is None:
+            iterations = MCTS_ITERATIONS
+        self.budget = budget
+        self.iterations = iterations
+        self.horizon = horizon
+        self.epsilon = 1.0 if rollout == 'random' else ROLLOUT_EPSILON
+        self.opponent_epsilon = 1.0 if rollout == 'random' else OPPONENT_EPSILON
+        self.rng = random.Random(seed)
+        self.buffer = buffer if buffer is not None else SearchBuffer()
+        self.shared_field = field is not None
+        self.field = field if field is not None else FoodDistanceField(max_cells=FIELD_CELLS)
+        self.area_limit = area_limit
+        self.state: Optional[RolloutState] = None  # Last root state, its grid reused
+        self.simulations = 0  # Simulations run for the last decision
+
+    def choose(self, snake: SnakeLogic, food_pos: Position,
+               all_snakes: List[SnakeLogic]) -> Optional[Direction]:
+        """
+        Search for the best move.
+
+        Args:
+            snake: Snake being steered
+            food_pos: Target food position (x, y)
+            all_snakes: All snakes in the game
+
+        Returns:
+            Direction to move in, or None if not even one simulation fit
+        """
+        clock = time.perf_counter
+        deadline = clock() + self.budget if self.budget is not None else math.inf
+        limit = self.iterations if self.iterations is not None else math.inf
+        if snake not in all_snakes:
+            all_snakes = list(all_snakes) + [snake]
+        me = all_snakes.index(snake)
+        board = snake.board
+        field = self.field
+        self.simulations = 0
+        # The setup steps below visit up to FIELD_CELLS, the snakes' length
+        # and area_limit cells; none starts once the budget is spent
+        if not self.shared_field:
+            field.update(board, food_pos, [snake])
+            if clock() >= deadline:
+                return None
+        dist = field.dist if field.covers(board, food_pos) else None
+        root_state = self.state = RolloutState.capture(
+            board.grid_count, all_snakes, food_pos, self.rng, dist, self.state)
+        if clock() >= deadline:
+            return None
+        root = _Node()
+        root.untried = self._safe_moves(snake) or self._moves(root_state, me)
+        self.rng.shuffle(root.untried)
+
+        sims = 0
+        while sims < limit and clock() < deadline:
+            state = root_state.copy()
+            self._simulate(root, state, me, deadline)
+            state.undo()
+            sims += 1
+        self.simulations = sims
+        if not root.children:
+            return None
+        best = max(root.children.items(),
+                   key=lambda kv: (kv[1].visits, kv[1].total))[0]
+        return DIRECTIONS[best]
+
+    def _safe_moves(self, snake: SnakeLogic) -> List[int]:
+        """Moves (as indices into DIRECTIONS) onto a free cell whose region fits the snake."""
+        board = snake.board
+        n = board.grid_count
+        cells = board.cells
+        hx, hy = snake.get_head_position()
+        head = hy * n + hx
+        limit = min(snake.length, self.area_limit)
+        safe = []
+        for j in neighbours(head, n):
+            if cells[j] == EMPTY and reachable_area(board, j, limit, self.buffer) > limit:
+                safe.append(DIRECTIONS.index((j % n - hx, j // n - hy)))
+        return safe
+
+    def _simulate(self, root: _Node, state: RolloutState, me: int, deadline: float):
+        """Run one simulation from the root and back its value up the path."""
+        horizon = self.horizon
+        epsilon = self.epsilon
+        opponent_epsilon = self.opponent_epsilon
+        clock = time.perf_counter
+        alive = state.alive
+        count = len(alive)
+        node = root
+        path = [root]
+        start = state.distance(state.heads[me])
+        food_value = 0.0
+        depth = 0
+        expanded = False
+        value = None
+
+        while depth < horizon:
+            if not expanded:
+                if node.untried is None:
+                    node.untried = self._moves(state, me)
+                if node.untried:
+                    d = node.untried.pop()
+                    child = node.children[d] = _Node()
+                    expanded = True
+                else:
+                    d = self._select(node)
+                    child = node.children[d]
+                node = child
+                path.append(node)
+            elif clock() > deadline:
+                break
+            else:
+                d = state.heuristic_move(me, epsilon)
+
+            choices = [state.heuristic_move(s, opponent_epsilon) if s != me and alive[s] else d
+                       for s in range(count)]
+            state.step(choices)
+            depth += 1
+            if not alive[me]:
+                value = 0.3 * (depth - 1) / horizon
+                break
+            if state.eater == me:
+                food_value += 0.3 * FOOD_DISCOUNT ** (depth - 1)
+
+        if value is None:
+            if food_value:
+                closeness = 1.0
+            else:
+                # Progress toward the food over the simulation, in [0, 1]
+                progress = start - state.distance(state.heads[me])
+                closeness = min(max((progress + horizon) / (2 * horizon), 0.0), 1.0)
+            value = 0.5 + min(food_value, 0.3) + 0.2 * closeness
+        for node in path:
+            node.visits += 1
+            node.total += value
+
+    def _moves(self, state: RolloutState, me: int) -> List[int]:
+        """
+        Moves to expand a node with in random order: the open ones, or all
+        but the reverse if every one is blocked, so death is still scored.
+        """
+        moves = state.open_moves(me) or [d for d in range(4)
+                                          if d != REVERSE[state.dirs[me]]]
+        self.rng.shuffle(moves)
+        return moves
+
+    @staticmethod
+    def _select(node: _Node) -> int:
+        """Child move with the highest UCT score."""
+        log_n = math.log(node.visits)
+        best = -1
+        best_score = -1.0
+        for d, child in node.children.items():
+            score = child.total / child.visits + EXPLORATION * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best, best_score = d, score
+        return best
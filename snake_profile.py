@@ -0,0 +1,201 @@
+"""
+Per-frame timing instrumentation for the pygame front-ends.
+
+Game loops call begin_frame() at the top, lap(phase) after each phase
+(input, AI, movement, drawing, ...) and end_frame() last. Laps with the
+same name add up within a frame, so phases repeated inside the fixed
+timestep loop are charged once per frame. The last HISTORY frames are always
+kept for the overlay (F3). A trace (F4 starts and stops it) keeps every
+frame and is written as CSV and JSON for offline analysis.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from snake_text import render_text
+
+HISTORY = 120  # Frames kept for the overlay histogram
+OVERLAY_REFRESH = 10  # Frames between overlay redraws
+OVERLAY_WIDTH = 210
+HISTOGRAM_HEIGHT = 40
+TRACE_DIR = 'traces'
+
+# (frame seconds, {phase: seconds}, draw calls)
+FrameRecord = Tuple[float, Dict[str, float], int]
+
+
+class FrameProfiler:
+    """Times the phases of a game loop and renders a small stats overlay."""
+
+    def __init__(self, name: str, target_fps: int, history: int = HISTORY):
+        """
+        Initialize the profiler.
+
+        Args:
+            name: Mode name, used in trace file names
+            target_fps: Frame rate the loop aims for; sets the histogram's budget line
+            history: Number of recent frames kept for the overlay
+        """
+        self.name = name
+        self.budget = 1.0 / target_fps
+        self.visible = False
+        self.tracing = False
+        self.frames: deque = deque(maxlen=history)
+        self.trace: List[FrameRecord] = []
+        self.phase_names: List[str] = []  # In order of first appearance
+        self._phases: Dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+        self._overlay: Optional[pygame.Surface] = None
+        self._overlay_age = 0
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        React to the profiler's keys: F3 toggles the overlay, F4 starts a
+        trace or stops and saves it.
+
+        Args:
+            event: Pygame event from the game loop
+
+        Returns:
+            True if the event was consumed
+        """
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.visible = not self.visible
+            self._overlay = None
+        elif event.key == pygame.K_F4:
+            if self.tracing:
+                path = self.save_trace()
+                print(f"Profile trace written to {path}.csv / .json")
+            else:
+                self.trace = []
+            self.tracing = not self.tracing
+        else:
+            return False
+        return True
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        self._start = self._last = time.perf_counter()
+        self._phases = {}
+
+    def lap(self, phase: str):
+        """
+        Charge the time since the previous lap to a phase.
+
+        Args:
+            phase: Phase name, e.g. 'input', 'ai', 'draw'
+        """
+        now = time.perf_counter()
+        phases = self._phases
+        if phase not in phases:
+            phases[phase] = 0.0
+            if phase not in self.phase_names:
+                self.phase_names.append(phase)
+        phases[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self, draw_calls: int = 0):
+        """
+        Finish the frame and store its timings.
+
+        Args:
+            draw_calls: Number of draw operations issued this frame
+        """
+        record = (time.perf_counter() - self._start, self._phases, draw_calls)
+        self.frames.append(record)
+        if self.tracing:
+            self.trace.append(record)
+
+    def draw_overlay(self, surface: pygame.Surface) -> Optional[pygame.Rect]:
+        """
+        Blit the stats overlay in the top-right corner if it is visible.
+
+        Args:
+            surface: Screen surface to draw on
+
+        Returns:
+            The rect covered, or None when hidden
+        """
+        if not self.visible or not self.frames:
+            return None
+        self._overlay_age += 1
+        if self._overlay is None or self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay = self._build_overlay()
+            self._overlay_age = 0
+        return surface.blit(self._overlay,
+                            (surface.get_width() - OVERLAY_WIDTH - 5, 5))
+
+    def _build_overlay(self) -> pygame.Surface:
+        """Render averages, per-phase times and the frame-time histogram."""
+        frames = self.frames
+        count = len(frames)
+        average = sum(f[0] for f in frames) / count
+        worst = max(f[0] for f in frames)
+        lines = [f'frame {average * 1000:5.2f} ms ({1 / average:5.1f} fps)',
+                 f'worst {worst * 1000:5.2f} ms  draws {frames[-1][2]}']
+        if self.tracing:
+            lines.append(f'TRACING {len(self.trace)} frames')
+        for name in self.phase_names:
+            ms = sum(f[1].get(name, 0.0) for f in frames) / count * 1000
+            lines.append(f'{name:<10}{ms:6.2f} ms')
+
+        line_height = 16
+        height = len(lines) * line_height + HISTOGRAM_HEIGHT + 12
+        panel = pygame.Surface((OVERLAY_WIDTH, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            panel.blit(render_text(line, 20, (230, 230, 230)), (6, 4 + i * line_height))
+
+        # Histogram: one bar per frame, the frame budget at half height
+        base = height - 4
+        scale = HISTOGRAM_HEIGHT / 2 / self.budget
+        bar = max(1, OVERLAY_WIDTH // frames.maxlen)
+        for i, (total, _, _) in enumerate(frames):
+            h = min(HISTOGRAM_HEIGHT, max(1, int(total * scale)))
+            color = (80, 220, 80) if total <= self.budget * 1.05 else (240, 70, 70)
+            panel.fill(color, (i * bar, base - h, bar, h))
+        budget_y = base - HISTOGRAM_HEIGHT // 2
+        pygame.draw.line(panel, (200, 200, 80), (0, budget_y), (OVERLAY_WIDTH, budget_y))
+        return panel
+
+    def save_trace(self, path: Optional[str] = None) -> str:
+        """
+        Write the recorded trace as CSV and JSON.
+
+        Args:
+            path: File path without extension, a timestamped name in
+                TRACE_DIR if None
+
+        Returns:
+            The path used, without extension
+        """
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR,
+                                f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        names = self.phase_names
+        with open(path + '.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'frame_ms', *(f'{n}_ms' for n in names), 'draw_calls'])
+            for i, (total, phases, draws) in enumerate(self.trace):
+                writer.writerow([i, f'{total * 1000:.4f}',
+                                 *(f'{phases.get(n, 0.0) * 1000:.4f}' for n in names),
+                                 draws])
+        with open(path + '.json', 'w') as f:
+            json.dump({
+                'mode': self.name,
+                'target_frame_ms': self.budget * 1000,
+                'phases': names,
+                'frames': [{'frame_ms': total * 1000,
+                            'phases_ms': {n: ms * 1000 for n, ms in phases.items()},
+                            'draw_calls': draws}
+                           for total, phases, draws in self.trace],
+            }, f, indent=1)
+        return path
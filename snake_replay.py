@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Deterministic game recording and playback.
+
+A replay is a game's RNG seed plus the sequence of state-changing GameState
+calls: snakes added, removed or reset, food spawned, moves and food checks.
+A snake's direction is only logged when it changes. The engine is
+deterministic for a given seed, so re-issuing those calls rebuilds the game
+exactly, and AI policies are not needed to replay it.
+
+File layout (little endian):
+    header   b'SNKR', version u8, grid count u16, seed u64
+    records  opcode u8 followed by its payload:
+        TICK    delta u16                game.tick advanced by delta
+        ADD     id u16, x u16, y u16     0xFFFF, 0xFFFF for the board centre
+        REMOVE  id u16
+        RESET   id u16
+        FOOD    -                        spawn_food()
+        TURN    id u16, direction u8     index into DIRECTIONS
+        MOVE    count u16, ids u16 * count
+        CHECK   -                        check_food()
+        END     tick u32, checksum u32   appended by ReplayRecorder.save()
+        MOVEALL count u16, ids u16 * count   move_simultaneous(); version 2
+
+A single-player game costs about five bytes per move.
+
+Usage:
+    python snake_replay.py replays/ai_mode-20240101-120000.snkr
+"""
+import argparse
+import os
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from struct import Struct
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from snake_engine import DIRECTIONS, GameState, Position, SnakeLogic
+
+MAGIC = b'SNKR'
+VERSION = 2
+READABLE_VERSIONS = (1, 2)  # Version 1 logs simply never contain MOVEALL
+SNAPSHOT_INTERVAL = 300  # Ticks between playback snapshots used for seeking
+
+(OP_TICK, OP_ADD, OP_REMOVE, OP_RESET, OP_FOOD, OP_TURN, OP_MOVE, OP_CHECK, OP_END,
+ OP_MOVE_ALL) = range(1, 11)
+
+HEADER = Struct('<4sBHQ')
+TICK = Struct('<BH')
+ADD = Struct('<BHHH')
+SNAKE_OP = Struct('<BH')  # REMOVE, RESET
+TURN = Struct('<BHB')
+MOVE = Struct('<BH')  # MOVE, MOVEALL
+END = Struct('<BII')
+U16 = Struct('<H')
+NO_POS = 0xFFFF
+
+
+@lru_cache(maxsize=None)
+def _ids(count: int) -> Struct:
+    """Struct for a MOVE record's list of snake ids."""
+    return Struct(f'<{count}H')
+
+
+def state_checksum(game: GameState) -> int:
+    """
+    CRC32 over the board, food, tick and every snake's length and score.
+
+    Args:
+        game: Game to fingerprint
+
+    Returns:
+        32-bit checksum
+    """
+    crc = zlib.crc32(game.board.cells.tobytes())
+    fx, fy = game.food.position
+    stats = [game.tick, fx, fy]
+    for snake in game.snakes:
+        stats.extend((snake.id, snake.length, snake.score))
+    return zlib.crc32(array('q', stats).tobytes(), crc)
+
+
+def record_path(directory: str, mode: str) -> str:
+    """
+    Build a timestamped replay file name, creating the directory if needed.
+
+    Args:
+        directory: Folder to store replays in
+        mode: Game mode name used as the file name prefix
+
+    Returns:
+        Path of the form directory/mode-YYYYmmdd-HHMMSS.snkr
+    """
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{mode}-{time.strftime('%Y%m%d-%H%M%S')}.snkr")
+
+
+class ReplayRecorder:
+    """
+    Collects a game's replay log in memory. Attach it before any snake is
+    added; GameState then reports every state change to it.
+    """
+
+    def __init__(self, game: GameState, path: Optional[str] = None):
+        """
+        Start recording a game.
+
+        Args:
+            game: Freshly created game with no snakes yet
+            path: Default file for save()
+        """
+        if game.snakes:
+            raise ValueError('attach the recorder before adding snakes')
+        if not 0 <= game.seed < 1 << 64:
+            raise ValueError('replays need an integer seed in [0, 2**64)')
+        self.game = game
+        self.path = path
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, game.board.grid_count, game.seed))
+        self.tick = game.tick
+        self.directions: Dict[int, int] = {}  # Last logged direction per snake id
+        game.recorder = self
+
+    def _sync_tick(self):
+        """Log how far game.tick has advanced since the last record."""
+        delta = self.game.tick - self.tick
+        while delta > 0:
+            step = min(delta, 0xFFFF)
+            self.data += TICK.pack(OP_TICK, step)
+            delta -= step
+        self.tick = self.game.tick
+
+    def add_snake(self, snake: SnakeLogic):
+        """Log a snake joining the game with its id and start cell."""
+        self._sync_tick()
+        x, y = snake.start_pos if snake.start_pos is not None else (NO_POS, NO_POS)
+        self.data += ADD.pack(OP_ADD, snake.id, x, y)
+        self.directions[snake.id] = DIRECTIONS.index(snake.direction)
+
+    def remove_snake(self, snake: SnakeLogic):
+        """Log a snake leaving the game."""
+        self._sync_tick()
+        self.data += SNAKE_OP.pack(OP_REMOVE, snake.id)
+        del self.directions[snake.id]
+
+    def reset_snake(self, snake: SnakeLogic):
+        """Log a snake respawning at its start cell."""
+        self._sync_tick()
+        self.data += SNAKE_OP.pack(OP_RESET, snake.id)
+        self.directions[snake.id] = DIRECTIONS.index(snake.direction)
+
+    def spawn_food(self):
+        """Log a food respawn; the position follows from the game's RNG."""
+        self._sync_tick()
+        self.data.append(OP_FOOD)
+
+    def check_food(self):
+        """Log a food check."""
+        self._sync_tick()
+        self.data.append(OP_CHECK)
+
+    def move_snakes(self, movers: List[SnakeLogic]):
+        """Log a sequential move of the given snakes."""
+        self._log_moves(OP_MOVE, movers)
+
+    def move_simultaneous(self, movers: List[SnakeLogic]):
+        """Log a simultaneous move of the given snakes."""
+        self._log_moves(OP_MOVE_ALL, movers)
+
+    def _log_moves(self, op: int, movers: List[SnakeLogic]):
+        """Log changed directions, then a move record listing the movers."""
+        self._sync_tick()
+        data = self.data
+        directions = self.directions
+        for snake in movers:
+            d = DIRECTIONS.index(snake.direction)
+            if directions[snake.id] != d:
+                directions[snake.id] = d
+                data += TURN.pack(OP_TURN, snake.id, d)
+        data += MOVE.pack(op, len(movers))
+        data += _ids(len(movers)).pack(*[snake.id for snake in movers])
+
+    def getvalue(self) -> bytes:
+        """Return the log so far, closed with an END record for the current state."""
+        self._sync_tick()
+        return bytes(self.data) + END.pack(OP_END, self.game.tick,
+                                           state_checksum(self.game))
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the log so far to disk. Recording continues afterwards, so a
+        session can be saved again after every game over.
+
+        Args:
+            path: Target file, self.path if None
+        """
+        with open(path or self.path, 'wb') as f:
+            f.write(self.getvalue())
+
+
+class Snapshot(NamedTuple):
+    """Complete game state at a tick boundary, plus where the log resumes."""
+    tick: int
+    offset: int
+    rng_state: tuple
+    cells: array
+    free: array
+    free_slot: array
+    # (id, start_pos, positions, length, direction, score, vacated) per snake
+    snakes: Tuple[tuple, ...]
+    food: Position
+    won: bool
+    next_id: int
+
+
+class ReplayPlayer:
+    """
+    Rebuilds a recorded game one tick at a time. Snapshots are taken every
+    snapshot_interval ticks during playback, so seek() restores the nearest
+    snapshot and replays at most one interval of log.
+    """
+
+    def __init__(self, data: bytes,
+                 snake_factory: Callable[[Optional[Position]], SnakeLogic] = SnakeLogic,
+                 snapshot_interval: int = SNAPSHOT_INTERVAL):
+        """
+        Parse the header and apply the log up to the first tick.
+
+        Args:
+            data: Replay file contents
+            snake_factory: Builds a snake from its start position, e.g. a
+                renderable subclass
+            snapshot_interval: Ticks between seek snapshots
+        """
+        self.data = memoryview(data)
+        magic, version, self.grid_count, self.seed = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError('not a snake replay')
+        if version not in READABLE_VERSIONS:
+            raise ValueError(f'unsupported replay version {version}')
+        self.snake_factory = snake_factory
+        self.snapshot_interval = snapshot_interval
+        self.game = GameState(seed=self.seed, grid_count=self.grid_count)
+        self.snakes: Dict[int, SnakeLogic] = {}
+        self.log_tick = 0  # Tick of the last TICK record applied
+        self.offset = HEADER.size
+        self.end: Optional[Tuple[int, int]] = None  # (tick, checksum) once reached
+        self._apply_records()
+        self.snapshots: List[Snapshot] = [self._snapshot()]
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'ReplayPlayer':
+        """Load a replay file; keyword arguments go to the constructor."""
+        with open(path, 'rb') as f:
+            return cls(f.read(), **kwargs)
+
+    @property
+    def finished(self) -> bool:
+        """True once the log is exhausted."""
+        return self.end is not None or self.offset >= len(self.data)
+
+    def _apply_records(self):
+        """Apply records up to the next TICK record or the end of the log."""
+        data, game, snakes = self.data, self.game, self.snakes
+        offset, size = self.offset, len(data)
+        while offset < size:
+            op = data[offset]
+            if op == OP_TICK:
+                break
+            elif op == OP_MOVE or op == OP_MOVE_ALL:
+                _, count = MOVE.unpack_from(data, offset)
+                offset += MOVE.size
+                ids = _ids(count).unpack_from(data, offset)
+                offset += 2 * count
+                movers = [snakes[i] for i in ids]
+                if op == OP_MOVE:
+                    game.move_snakes(movers)
+                else:
+                    game.move_simultaneous(movers)
+            elif op == OP_TURN:
+                _, snake_id, d = TURN.unpack_from(data, offset)
+                offset += TURN.size
+                snakes[snake_id].direction = DIRECTIONS[d]
+            elif op == OP_CHECK:
+                offset += 1
+                game.check_food()
+            elif op == OP_FOOD:
+                offset += 1
+                game.spawn_food()
+            elif op == OP_ADD:
+                _, snake_id, x, y = ADD.unpack_from(data, offset)
+                offset += ADD.size
+                snake = self.snake_factory(None if x == NO_POS else (x, y))
+                game.add_snake(snake)
+                if snake.id != snake_id:
+                    raise ValueError(f'replay diverged: snake {snake_id} got id {snake.id}')
+                snakes[snake_id] = snake
+            elif op == OP_REMOVE:
+                _, snake_id = SNAKE_OP.unpack_from(data, offset)
+                offset += SNAKE_OP.size
+                game.remove_snake(snakes.pop(snake_id))
+            elif op == OP_RESET:
+                _, snake_id = SNAKE_OP.unpack_from(data, offset)
+                offset += SNAKE_OP.size
+                game.reset_snake(snakes[snake_id])
+            elif op == OP_END:
+                _, tick, checksum = END.unpack_from(data, offset)
+                self.end = (tick, checksum)
+                break
+            else:
+                raise ValueError(f'bad replay opcode {op} at offset {offset}')
+        self.offset = offset
+
+    def next_tick(self) -> Optional[int]:
+        """Tick the next advance() will reach, or None at the end of the log."""
+        if self.finished or self.data[self.offset] != OP_TICK:
+            return None
+        return self.log_tick + U16.unpack_from(self.data, self.offset + 1)[0]
+
+    def advance(self) -> bool:
+        """
+        Apply the next tick's worth of records.
+
+        Returns:
+            False if the log was already exhausted
+        """
+        target = self.next_tick()
+        if target is None:
+            return False
+        self.game.tick = self.log_tick  # Undo a seek() into a quiet stretch
+        if self.log_tick >= self.snapshots[-1].tick + self.snapshot_interval:
+            self.snapshots.append(self._snapshot())
+        self.game.tick = self.log_tick = target
+        self.offset += TICK.size
+        self._apply_records()
+        return True
+
+    def run(self) -> int:
+        """
+        Play to the end of the log as fast as possible.
+
+        Returns:
+            Number of ticks advanced
+        """
+        start = self.game.tick
+        while self.advance():
+            pass
+        return self.game.tick - start
+
+    def seek(self, tick: int):
+        """
+        Move playback to the given tick, or to the end of the log if it
+        lies beyond. Ticks without records are valid stops: the state is
+        that of the last recorded tick with game.tick set to the target.
+
+        Args:
+            tick: Target tick
+        """
+        snapshots = self.snapshots
+        i = bisect_right([s.tick for s in snapshots], tick) - 1
+        snap = snapshots[max(i, 0)]
+        if tick < self.game.tick or snap.tick > self.game.tick:
+            self._restore(snap)
+        while True:
+            target = self.next_tick()
+            if target is None or target > tick:
+                break
+            self.advance()
+        if target is not None:
+            self.game.tick = max(tick, self.log_tick)
+
+    def verify(self) -> bool:
+        """
+        Play to the end and compare the final state with the recorded
+        checksum.
+
+        Returns:
+            True if playback reproduced the recorded game
+        """
+        self.run()
+        if self.end is None:
+            raise ValueError('replay has no END record (truncated file?)')
+        return self.end == (self.game.tick, state_checksum(self.game))
+
+    def _snapshot(self) -> Snapshot:
+        """Capture the game state at the current tick and log offset."""
+        game, board = self.game, self.game.board
+        return Snapshot(
+            game.tick, self.offset, game.rng.getstate(),
+            array('H', board.cells), array('i', board.free), array('i', board.free_slot),
+            tuple((s.id, s.start_pos, tuple(s.positions), s.length, s.direction,
+                   s.score, s.vacated) for s in game.snakes),
+            game.food.position, game.won, game._next_id)
+
+    def _restore(self, snap: Snapshot):
+        """Rebuild the game from a snapshot, with fresh snake objects."""
+        game, board = self.game, self.game.board
+        game.tick = self.log_tick = snap.tick
+        game.rng.setstate(snap.rng_state)
+        board.cells[:] = snap.cells
+        board.free[:] = snap.free
+        board.free_slot[:] = snap.free_slot
+        game.snakes = []
+        self.snakes = {}
+        for snake_id, start, positions, length, direction, score, vacated in snap.snakes:
+            snake = self.snake_factory(start)
+            snake.board = board
+            snake.rng = game.rng
+            snake.id = snake_id
+            snake.positions = deque(positions)
+            snake.length = length
+            snake.direction = direction
+            snake.score = score
+            snake.vacated = vacated
+            game.snakes.append(snake)
+            self.snakes[snake_id] = snake
+        game.rehash()
+        game.food.position = snap.food
+        game.won = snap.won
+        game._next_id = snap.next_id
+        self.offset = snap.offset
+        self.end = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded game headless and verify it.')
+    parser.add_argument('replay', help='replay file (.snkr)')
+    args = parser.parse_args()
+
+    player = ReplayPlayer.from_file(args.replay)
+    start = time.perf_counter()
+    ok = player.verify()
+    elapsed = time.perf_counter() - start
+    ticks = player.game.tick
+    size = len(player.data)
+    print(f"{ticks} ticks, {size} bytes ({size / max(ticks, 1):.2f} bytes/tick), "
+          f"replayed in {elapsed:.3f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    for snake in player.game.snakes:
+        print(f"  snake {snake.id}: length {snake.length}, score {snake.score}")
+    print('checksum OK' if ok else 'checksum MISMATCH: playback diverged from the recording')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
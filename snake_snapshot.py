@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Versioned binary snapshots of game states for checkpoints and AI datasets.
+
+A snapshot file holds any number of packed states followed by an offset
+index, so it can be written as a stream and opened with mmap. Reading a
+state creates no per-cell Python objects: the occupancy grid and the snake
+bodies are memoryviews straight into the mapped file, and they can be
+handed to numpy.frombuffer or array.frombytes as they are.
+
+File layout (little endian; the zero-copy views need a little-endian host):
+    header   b'SNKS', version u16, reserved u16
+    states   one record per state, each 4-byte aligned:
+        tick u32, grid count u16, snake count u16, food x u16, food y u16,
+        won u8, reserved u8 * 3
+        per snake: id u16, direction u8, reserved u8, length u32,
+                   score u32, body length u32
+        grid     grid count * grid count u16 owner ids, padded to 4 bytes
+        bodies   u32 flat cell indices (y * grid count + x), head first,
+                 one run per snake in table order
+    index    u64 offset of every state
+    footer   state count u64, index offset u64
+
+Usage:
+    python snake_snapshot.py states.snks
+"""
+import argparse
+import mmap
+import sys
+import time
+from array import array
+from collections import deque
+from struct import Struct
+from typing import Iterator, List, Optional, Tuple
+
+from snake_engine import DIRECTIONS, MAX_SNAKE_ID, GameState, SnakeLogic
+
+MAGIC = b'SNKS'
+VERSION = 1
+
+FILE_HEADER = Struct('<4sHH')
+STATE = Struct('<IHHHHB3x')
+SNAKE = Struct('<HBxIII')
+FOOTER = Struct('<QQ')
+
+if sys.byteorder != 'little':
+    raise ImportError('snake_snapshot maps files directly and needs a little-endian host')
+
+
+def pack_state(game: GameState) -> bytes:
+    """
+    Pack one game state into a snapshot record.
+
+    Args:
+        game: Game to capture
+
+    Returns:
+        Record bytes, a multiple of 4 long
+    """
+    board = game.board
+    n = board.grid_count
+    fx, fy = game.food.position
+    parts = [STATE.pack(game.tick, n, len(game.snakes), fx, fy, game.won)]
+    bodies = array('I')
+    for snake in game.snakes:
+        parts.append(SNAKE.pack(snake.id, DIRECTIONS.index(snake.direction),
+                                snake.length, snake.score, len(snake.positions)))
+        bodies.extend([y * n + x for x, y in snake.positions])
+    parts.append(board.cells.tobytes())
+    if (n * n) % 2:
+        parts.append(b'\0\0')
+    parts.append(bodies.tobytes())
+    return b''.join(parts)
+
+
+class SnapshotWriter:
+    """
+    Streams packed states into a snapshot file. Use as a context manager
+    or call close(), which writes the offset index.
+    """
+
+    def __init__(self, path: str):
+        """
+        Create (or truncate) a snapshot file.
+
+        Args:
+            path: File to write
+        """
+        self.file = open(path, 'wb')
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, 0))
+        self.offsets = array('Q')
+        self.position = FILE_HEADER.size
+
+    def write(self, game: GameState):
+        """
+        Append the current state of a game.
+
+        Args:
+            game: Game to capture
+        """
+        self.write_record(pack_state(game))
+
+    def write_record(self, record: bytes):
+        """Append an already packed record, e.g. built in a worker process."""
+        self.offsets.append(self.position)
+        self.file.write(record)
+        self.position += len(record)
+
+    def close(self):
+        """Write the index and footer and close the file."""
+        self.file.write(self.offsets.tobytes())
+        self.file.write(FOOTER.pack(len(self.offsets), self.position))
+        self.file.close()
+
+    def __enter__(self) -> 'SnapshotWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StateView:
+    """
+    Read-only view of one packed state. The fixed header is decoded up
+    front; the grid and bodies are memoryviews into the underlying buffer.
+    """
+
+    __slots__ = ('buf', 'offset', 'tick', 'grid_count', 'num_snakes', 'food',
+                 'won', '_grid_at', '_bodies_at', '_starts')
+
+    def __init__(self, buf: memoryview, offset: int):
+        """
+        Decode a state's header.
+
+        Args:
+            buf: Buffer holding the record
+            offset: Byte offset of the record in buf
+        """
+        self.buf = buf
+        self.offset = offset
+        tick, n, count, fx, fy, won = STATE.unpack_from(buf, offset)
+        self.tick = tick
+        self.grid_count = n
+        self.num_snakes = count
+        self.food = (fx, fy)
+        self.won = bool(won)
+        self._grid_at = offset + STATE.size + count * SNAKE.size
+        self._bodies_at = self._grid_at + (n * n * 2 + 3) // 4 * 4
+        self._starts: Optional[List[int]] = None  # Body offsets, found on first use
+
+    @property
+    def cells(self) -> memoryview:
+        """Occupancy grid as u16 owner ids, row-major."""
+        n = self.grid_count
+        return self.buf[self._grid_at:self._grid_at + n * n * 2].cast('H')
+
+    def snake(self, i: int) -> Tuple[int, Tuple[int, int], int, int]:
+        """
+        Metadata of the i-th snake.
+
+        Returns:
+            (id, direction, length, score)
+        """
+        snake_id, d, length, score, _ = SNAKE.unpack_from(
+            self.buf, self.offset + STATE.size + i * SNAKE.size)
+        return snake_id, DIRECTIONS[d], length, score
+
+    def body(self, i: int) -> memoryview:
+        """Flat cell indices of the i-th snake's body, head first."""
+        starts = self._starts
+        if starts is None:
+            # One pass over the snake table: byte offset of every body run,
+            # plus the end of the last one
+            starts = self._starts = [self._bodies_at]
+            table = self.offset + STATE.size
+            for j in range(self.num_snakes):
+                size = SNAKE.unpack_from(self.buf, table + j * SNAKE.size)[4]
+                starts.append(starts[-1] + 4 * size)
+        return self.buf[starts[i]:starts[i + 1]].cast('I')
+
+    def to_game(self, snake_factory=SnakeLogic) -> GameState:
+        """
+        Rebuild a playable GameState from this snapshot.
+
+        Args:
+            snake_factory: Builds a snake from its start position
+
+        Returns:
+            New game in the captured state (with a fresh RNG)
+        """
+        n = self.grid_count
+        game = GameState(grid_count=n)
+        board = game.board
+        board.cells = array('H', self.cells)
+        board.rebuild_free_index()
+        for i in range(self.num_snakes):
+            snake_id, direction, length, score = self.snake(i)
+            snake = snake_factory(None)
+            snake.board = board
+            snake.rng = game.rng
+            snake.id = snake_id
+            snake.positions = deque((c % n, c // n) for c in self.body(i))
+            snake.length = length
+            snake.score = score
+            snake.direction = direction
+            snake.vacated = None
+            game.snakes.append(snake)
+        game.rehash()
+        # Wrapped like GameState._allocate_id, so a snake holding the last id
+        # does not leave an id no cell can store
+        game._next_id = max((s.id for s in game.snakes), default=0) % MAX_SNAKE_ID + 1
+        game.food.position = self.food
+        game.tick = self.tick
+        game.won = self.won
+        return game
+
+
+class SnapshotFile:
+    """Memory-mapped snapshot file; indexing yields StateView objects."""
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file and validate its header.
+
+        Args:
+            path: File to open
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buf = memoryview(self._mmap)
+        magic, version, _ = FILE_HEADER.unpack_from(self.buf)
+        if magic != MAGIC:
+            raise ValueError('not a snake snapshot file')
+        if version != VERSION:
+            raise ValueError(f'unsupported snapshot version {version}')
+        count, index_at = FOOTER.unpack_from(self.buf, len(self.buf) - FOOTER.size)
+        self.offsets = self.buf[index_at:index_at + 8 * count].cast('Q')
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, i: int) -> StateView:
+        return StateView(self.buf, self.offsets[i])
+
+    def __iter__(self) -> Iterator[StateView]:
+        buf = self.buf
+        for offset in self.offsets:
+            yield StateView(buf, offset)
+
+    def close(self):
+        """Release the mapping; cells/body views handed out must be dropped first."""
+        self.offsets.release()
+        self.buf.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'SnapshotFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a snapshot file.')
+    parser.add_argument('snapshots', help='snapshot file (.snks)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with SnapshotFile(args.snapshots) as states:
+        count = len(states)
+        total_length = 0
+        snakes = 0
+        for state in states:
+            for i in range(state.num_snakes):
+                total_length += state.snake(i)[2]
+            snakes += state.num_snakes
+    elapsed = time.perf_counter() - start
+    print(f"{count} states, {snakes} snakes, average length "
+          f"{total_length / max(snakes, 1):.1f}")
+    print(f"scanned in {elapsed:.3f}s ({count / max(elapsed, 1e-9):.0f} states/s)")
+
+
+if __name__ == '__main__':
+    main()
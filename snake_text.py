@@ -0,0 +1,83 @@
+"""
+Cached text rendering for the pygame front-ends.
+Fonts are created once per size and each (text, size, color) surface is
+rendered once, so static labels cost a dictionary lookup per frame and
+changing HUD values (score, length) are only re-rendered when they change.
+Requires pygame to be initialized before the first call.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+import pygame
+import pygame.freetype
+
+Color = Tuple[int, ...]
+
+TEXT_CACHE_SIZE = 256  # Rendered strings kept, least recently used dropped
+
+# Offsets of the soft copies that make up the neon text glow
+GLOW_OFFSETS = [(-1, -1), (1, -1), (-1, 1), (1, 1),
+                (-2, 0), (2, 0), (0, -2), (0, 2)]
+GLOW_PAD = 2  # Largest glow offset; the padding around glow text surfaces
+GLOW_ALPHA = 60
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> pygame.font.Font:
+    """
+    Return the default pygame font at the given size.
+
+    Args:
+        size: Font size in points
+
+    Returns:
+        Shared Font instance
+    """
+    return pygame.font.Font(None, size)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text: str, size: int, color: Color) -> pygame.Surface:
+    """
+    Render antialiased text with the default font.
+
+    Args:
+        text: String to render
+        size: Font size in points
+        color: RGB text color
+
+    Returns:
+        Cached text surface; callers must not draw on it
+    """
+    return get_font(size).render(text, True, color)
+
+
+@lru_cache(maxsize=None)
+def get_freetype_font() -> pygame.freetype.Font:
+    """Return the shared default freetype font, initializing freetype if needed."""
+    pygame.freetype.init()
+    return pygame.freetype.Font(None, 36)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_glow_text(text: str, size: int, color: Color) -> pygame.Surface:
+    """
+    Pre-composite neon text: eight faint offset copies under the solid text.
+
+    Args:
+        text: String to render
+        size: Font size in points
+        color: RGB text color
+
+    Returns:
+        Cached SRCALPHA surface padded by GLOW_PAD on every side
+    """
+    font = get_freetype_font()
+    rect = font.get_rect(text, size=size)
+    surf = pygame.Surface((rect.width + 2 * GLOW_PAD, rect.height + 2 * GLOW_PAD),
+                          pygame.SRCALPHA)
+    glow = (*color[:3], GLOW_ALPHA)
+    for ox, oy in GLOW_OFFSETS:
+        font.render_to(surf, (GLOW_PAD + ox, GLOW_PAD + oy), text, glow, size=size)
+    font.render_to(surf, (GLOW_PAD, GLOW_PAD), text, color, size=size)
+    return surf
@@ -0,0 +1,132 @@
+"""
+Camera for drawing boards of any size in a fixed-size window.
+Cells are scaled down to fit the window, but never below MIN_CELL_SIZE
+pixels. A board that still does not fit is shown through a scrolling
+window that follows a target cell, usually a snake's head. Renderers map
+cells to pixels through the viewport and skip cells outside it, so drawing
+cost depends on what is visible rather than on the board size.
+"""
+from typing import Optional, Tuple
+
+import pygame
+
+MIN_CELL_SIZE = 4  # Smallest cell in pixels before the camera starts scrolling
+FOLLOW_MARGIN = 0.25  # Recentre once the target is this close to an edge (fraction of view)
+
+
+class Viewport:
+    """Maps grid cells to screen pixels and scrolls to follow a target."""
+
+    def __init__(self, grid_count: int, width: int, height: int,
+                 cell_size: Optional[int] = None):
+        """
+        Fit a board into a window.
+
+        Args:
+            grid_count: Number of cells per board dimension
+            width, height: Window size in pixels
+            cell_size: Fixed cell size in pixels, fitted to the window if None
+        """
+        if cell_size is None:
+            cell_size = max(MIN_CELL_SIZE, min(width, height) // grid_count)
+        self.grid_count = grid_count
+        self.cell = cell_size
+        self.cols = min(grid_count, -(-width // cell_size))  # Cells visible, rounded up
+        self.rows = min(grid_count, -(-height // cell_size))
+        self.x0 = 0  # Top-left visible cell
+        self.y0 = 0
+
+    @property
+    def scrolls(self) -> bool:
+        """True if the board is larger than the window."""
+        return self.cols < self.grid_count or self.rows < self.grid_count
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """Pixel position of the window's top-left corner on the full board."""
+        return self.x0 * self.cell, self.y0 * self.cell
+
+    def follow(self, pos: Tuple[float, float]) -> bool:
+        """
+        Recentre on a cell once it gets within FOLLOW_MARGIN of an edge.
+        Jumping rather than scrolling every move keeps full redraws rare.
+
+        Args:
+            pos: (x, y) grid position to keep in view
+
+        Returns:
+            True if the camera moved
+        """
+        if not self.scrolls:
+            return False
+        x, y = pos
+        x0 = self._recentre(x, self.x0, self.cols)
+        y0 = self._recentre(y, self.y0, self.rows)
+        if (x0, y0) == (self.x0, self.y0):
+            return False
+        self.x0, self.y0 = x0, y0
+        return True
+
+    def pan(self, dx: int, dy: int) -> bool:
+        """
+        Scroll by a number of cells, stopping at the board edges.
+
+        Args:
+            dx, dy: Cells to move the window by
+
+        Returns:
+            True if the camera moved
+        """
+        x0 = max(0, min(self.grid_count - self.cols, self.x0 + dx))
+        y0 = max(0, min(self.grid_count - self.rows, self.y0 + dy))
+        if (x0, y0) == (self.x0, self.y0):
+            return False
+        self.x0, self.y0 = x0, y0
+        return True
+
+    def _recentre(self, v: float, start: int, span: int) -> int:
+        """New first visible cell along one axis."""
+        margin = int(span * FOLLOW_MARGIN)
+        if start + margin <= v < start + span - margin:
+            return start
+        return max(0, min(self.grid_count - span, int(v) - span // 2))
+
+    def visible(self, x: float, y: float) -> bool:
+        """
+        Check whether any part of a cell is inside the window.
+
+        Args:
+            x, y: (Possibly fractional) grid coordinates
+        """
+        return (self.x0 - 1 < x < self.x0 + self.cols
+                and self.y0 - 1 < y < self.y0 + self.rows)
+
+    def cell_rect(self, x: float, y: float) -> pygame.Rect:
+        """
+        Screen rect of a (possibly fractional) grid position.
+
+        Args:
+            x, y: Grid coordinates
+
+        Returns:
+            Rect in window pixels
+        """
+        c = self.cell
+        return pygame.Rect(round((x - self.x0) * c), round((y - self.y0) * c), c, c)
+
+    def cells_in(self, rect: pygame.Rect) -> Tuple[range, range]:
+        """
+        Grid columns and rows overlapping a screen rect.
+
+        Args:
+            rect: Rect in window pixels
+
+        Returns:
+            (x range, y range) of board cells
+        """
+        c = self.cell
+        n = self.grid_count
+        return (range(max(0, self.x0 + rect.left // c),
+                      min(n, self.x0 + (rect.right - 1) // c + 1)),
+                range(max(0, self.y0 + rect.top // c),
+                      min(n, self.y0 + (rect.bottom - 1) // c + 1)))
@@ -0,0 +1,33 @@
+"""
+Arena bookkeeping for snakes that leave the board and come back.
+"""
+import unittest
+
+from snake_arena import Arena
+
+
+class WaitingTest(unittest.TestCase):
+    """Snakes parked off the board rejoin before the decisions of a tick."""
+
+    def test_rejoining_snake_is_steered(self):
+        arena = Arena(num_snakes=4, num_foods=1, grid_count=12, seed=0)
+        parked = arena.snakes[0]
+        parked.clear_from_board()
+        parked.positions.clear()
+        arena.snakes.remove(parked)
+        arena.waiting.append(parked)
+
+        steered = []
+        for snake in arena.snakes + arena.waiting:
+            def ai_move(food_pos, all_snakes, snake=snake, move=snake.ai_move):
+                steered.append(snake)
+                move(food_pos, all_snakes)
+            snake.ai_move = ai_move
+        arena.decide()
+        self.assertEqual(arena.waiting, [])
+        self.assertIn(parked, arena.snakes)
+        self.assertCountEqual(steered, arena.snakes)
+
+
+if __name__ == '__main__':
+    unittest.main()
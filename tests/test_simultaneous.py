@@ -0,0 +1,82 @@
+"""
+Rules of GameState.move_simultaneous for snakes that meet, and how the AI
+policies steer clear of head-on collisions.
+"""
+import unittest
+
+from snake_engine import DOWN, LEFT, RIGHT, UP, ComputerSnakeLogic, GameState, SnakeLogic
+from snake_ai import FloodFillPolicy
+
+
+class HeadOnTest(unittest.TestCase):
+    """Two heads entering one cell both die; policies yield to lower ids."""
+
+    def setUp(self):
+        self.game = GameState(seed=0, grid_count=7)
+
+    def test_head_on_kills_both(self):
+        a = self.game.add_snake(SnakeLogic((1, 3)))
+        b = self.game.add_snake(SnakeLogic((3, 3)))
+        a.direction, b.direction = RIGHT, LEFT
+        self.assertEqual(self.game.move_simultaneous([a, b]), [a, b])
+
+    def _face_off(self, policy):
+        """Snake 1 and a snake 2 steered by policy, both next to the food."""
+        first = self.game.add_snake(ComputerSnakeLogic((1, 3), policy=policy))
+        second = self.game.add_snake(ComputerSnakeLogic((3, 3), policy=policy))
+        first.direction, second.direction = RIGHT, LEFT
+        self.game.food.position = (2, 3)
+        for snake in (first, second):
+            snake.ai_move((2, 3), self.game.snakes)
+        return first, second
+
+    def _check_yield(self, first, second):
+        self.assertEqual(first.direction, RIGHT)  # Lower id: takes the food
+        self.assertNotEqual(second.direction, LEFT)  # Higher id: backs off
+        self.assertEqual(self.game.move_simultaneous(self.game.snakes), [])
+        self.assertEqual(self.game.check_food(), first)
+
+    def test_flood_fill_yields_to_lower_id(self):
+        self._check_yield(*self._face_off(FloodFillPolicy()))
+
+    def test_greedy_yields_to_lower_id(self):
+        self._check_yield(*self._face_off(None))
+
+    def test_contested_only_counts_lower_ids(self):
+        self._face_off(None)
+        board = self.game.board
+        food = 3 * board.grid_count + 2
+        self.assertFalse(board.contested(food, 1))
+        self.assertTrue(board.contested(food, 2))
+
+
+class SwapTest(unittest.TestCase):
+    """Only a one-cell snake can swap cells with another; rings rotate."""
+
+    def setUp(self):
+        self.game = GameState(seed=0, grid_count=5)
+
+    def test_one_cell_snakes_swapping_die(self):
+        a = self.game.add_snake(SnakeLogic((1, 1)))
+        b = self.game.add_snake(SnakeLogic((2, 1)))
+        a.direction, b.direction = RIGHT, LEFT
+        self.assertEqual(self.game.move_simultaneous([a, b]), [a, b])
+
+    def test_ring_rotates(self):
+        # a fills (1, 1); b runs (1, 2) <- (2, 2) <- (2, 1), so each head
+        # enters the other's tail
+        a = self.game.add_snake(SnakeLogic((1, 1)))
+        b = self.game.add_snake(SnakeLogic((2, 1)))
+        b.length = 3
+        b.direction = DOWN
+        self.assertTrue(b.update())
+        b.direction = LEFT
+        self.assertTrue(b.update())
+        a.direction, b.direction = RIGHT, UP
+        self.assertEqual(self.game.move_simultaneous([a, b]), [])
+        self.assertEqual(list(a.positions), [(2, 1)])
+        self.assertEqual(list(b.positions), [(1, 1), (1, 2), (2, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
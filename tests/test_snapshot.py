@@ -0,0 +1,45 @@
+"""
+Round trips of game states through snake_snapshot records.
+"""
+import unittest
+
+from snake_engine import MAX_SNAKE_ID, GameState, SnakeLogic
+from snake_snapshot import StateView, pack_state
+
+
+def round_trip(game: GameState) -> GameState:
+    """Pack a game into a record and rebuild it from a view of the bytes."""
+    return StateView(memoryview(pack_state(game)), 0).to_game()
+
+
+class RoundTripTest(unittest.TestCase):
+    """Rebuilt games match the packed ones and keep playing."""
+
+    def test_bodies_and_metadata(self):
+        game = GameState(seed=0, grid_count=9)
+        for start in ((1, 1), (4, 4), (7, 2)):
+            game.add_snake(SnakeLogic(start))
+        for snake, length in zip(game.snakes, (3, 1, 5)):
+            snake.length = length
+            for _ in range(length):
+                snake.update()
+        game.spawn_food()
+        copy = round_trip(game)
+        self.assertEqual([list(s.positions) for s in copy.snakes],
+                         [list(s.positions) for s in game.snakes])
+        self.assertEqual([s.id for s in copy.snakes], [s.id for s in game.snakes])
+        self.assertEqual(copy.board.cells, game.board.cells)
+        self.assertEqual(copy.food.position, game.food.position)
+
+    def test_last_snake_id_wraps(self):
+        game = GameState(seed=0, grid_count=9)
+        game._next_id = MAX_SNAKE_ID
+        game.add_snake(SnakeLogic((4, 4)))
+        copy = round_trip(game)
+        self.assertEqual(copy.snakes[0].id, MAX_SNAKE_ID)
+        snake = copy.add_snake(SnakeLogic((1, 1)))
+        self.assertEqual(snake.id, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
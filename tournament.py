@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Headless AI tournament runner.
+Plays round-robin ai_mode-style matches between AI policies across a
+process pool and reports win rate, average length, survival ticks and
+decision throughput per policy. Every game has a deterministic seed, so a
+run can be reproduced exactly.
+
+Usage:
+    python tournament.py --games 200 --policies greedy floodfill pathfinding
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Sequence, Tuple
+
+from snake_engine import GRID_COUNT, GameState, ComputerSnakeLogic
+from snake_ai import POLICIES
+
+# Policies left out unless named: mcts runs 150 simulations per move, which
+# would make a default run take many times longer than all the others
+SLOW_POLICIES = {'mcts'}
+
+
+def seats(n: int) -> List[Tuple[int, int]]:
+    """Starting cells for up to four seats on an n x n board, mirroring ai_mode's spawn points."""
+    return [(5, 5), (n - 6, 5), (5, n - 6), (n - 6, n - 6)]
+
+
+# (policy, won, drawn, final length, survival ticks, decision seconds, decisions)
+SeatResult = Tuple[str, bool, bool, int, int, float, int]
+
+
+def play_match(task: Tuple[Sequence[str], int, int, int]) -> List[SeatResult]:
+    """
+    Play one headless match between the given policies.
+
+    The last snake standing wins. Survivors keep playing until they die,
+    the board is full or max_ticks is reached, so length and survival
+    figures are not cut short by the opponents' deaths. If the last snakes
+    die on the same tick, or several are still alive at the end with equal
+    length, the match is a draw; otherwise the longest survivor wins.
+
+    Args:
+        task: (policy names in seat order, game seed, max ticks, board size)
+
+    Returns:
+        One result tuple per seat
+    """
+    names, seed, max_ticks, grid_count = task
+    game = GameState(seed=seed, grid_count=grid_count)
+    snakes = []
+    for name, start in zip(names, seats(grid_count)):
+        snakes.append(game.add_snake(
+            ComputerSnakeLogic(start, policy=POLICIES[name]())))
+    game.spawn_food()
+
+    death_tick = {snake: None for snake in snakes}
+    think = {snake: 0.0 for snake in snakes}
+    decisions = {snake: 0 for snake in snakes}
+    clock = time.perf_counter
+    while game.snakes and not game.won and game.tick < max_ticks:
+        food_pos = game.food.position
+        for snake in game.snakes:
+            start = clock()
+            snake.ai_move(food_pos, game.snakes)
+            think[snake] += clock() - start
+            decisions[snake] += 1
+        for snake in game.move_simultaneous(game.snakes):
+            game.remove_snake(snake)
+            death_tick[snake] = game.tick
+        game.check_food()
+        game.tick += 1
+
+    alive = game.snakes
+    if alive:
+        best = max(snake.length for snake in alive)
+        winners = [snake for snake in alive if snake.length == best]
+    else:
+        last = max(death_tick.values())
+        winners = [snake for snake in snakes if death_tick[snake] == last]
+    drawn = len(winners) != 1
+
+    results = []
+    for name, snake in zip(names, snakes):
+        ticks = death_tick[snake] if death_tick[snake] is not None else game.tick
+        results.append((name, snake in winners and not drawn,
+                        snake in winners and drawn, snake.length, ticks,
+                        think[snake], decisions[snake]))
+    return results
+
+
+def build_tasks(policies: Sequence[str], games: int, players: int, seed: int,
+                max_ticks: int, grid_count: int = GRID_COUNT
+                ) -> List[Tuple[Tuple[str, ...], int, int, int]]:
+    """
+    Build the round-robin schedule. Seating is rotated from game to game so
+    no policy keeps the same spawn point, and game k of the run always uses
+    seed + k.
+
+    Args:
+        policies: Policy names taking part
+        games: Games per pairing
+        players: Snakes per match
+        seed: Base seed
+        max_ticks: Tick limit per match
+        grid_count: Board size in cells
+
+    Returns:
+        List of play_match tasks
+    """
+    tasks = []
+    for group in itertools.combinations(policies, players):
+        for g in range(games):
+            shift = g % players
+            seating = group[shift:] + group[:shift]
+            tasks.append((seating, seed + len(tasks), max_ticks, grid_count))
+    return tasks
+
+
+def summarize(results: List[List[SeatResult]]) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate per-seat results by policy.
+
+    Args:
+        results: Output of play_match for every game
+
+    Returns:
+        Mapping of policy name to its statistics
+    """
+    stats: Dict[str, Dict[str, float]] = {}
+    for match in results:
+        for name, won, drawn, length, ticks, seconds, decisions in match:
+            s = stats.setdefault(name, dict(games=0, wins=0, draws=0, length=0,
+                                            ticks=0, seconds=0.0, decisions=0))
+            s['games'] += 1
+            s['wins'] += won
+            s['draws'] += drawn
+            s['length'] += length
+            s['ticks'] += ticks
+            s['seconds'] += seconds
+            s['decisions'] += decisions
+    return stats
+
+
+def print_report(stats: Dict[str, Dict[str, float]], wall_time: float, total_ticks: int):
+    """
+    Print a table of per-policy statistics sorted by win rate. The
+    decisions/s column counts a policy's decisions per second of its own
+    thinking time; the closing line gives match ticks per wall-clock second.
+    """
+    print(f"{'policy':<16}{'games':>7}{'win %':>8}{'draw %':>8}"
+          f"{'avg len':>9}{'avg ticks':>11}{'decisions/s':>13}")
+    ranked = sorted(stats.items(), key=lambda kv: kv[1]['wins'] / kv[1]['games'],
+                    reverse=True)
+    for name, s in ranked:
+        games = s['games']
+        rate = s['decisions'] / s['seconds'] if s['seconds'] else float('inf')
+        print(f"{name:<16}{games:>7}{100 * s['wins'] / games:>8.1f}"
+              f"{100 * s['draws'] / games:>8.1f}{s['length'] / games:>9.1f}"
+              f"{s['ticks'] / games:>11.1f}{rate:>13.0f}")
+    print(f"\n{total_ticks} match ticks in {wall_time:.1f}s "
+          f"({total_ticks / wall_time:.0f} ticks/s overall)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a headless AI tournament.')
+    parser.add_argument('--policies', nargs='+',
+                        default=sorted(POLICIES.keys() - SLOW_POLICIES),
+                        choices=sorted(POLICIES),
+                        help='policies to compare (default: all but mcts)')
+    parser.add_argument('--games', type=int, default=100,
+                        help='games per pairing (default: 100)')
+    parser.add_argument('--players', type=int, default=2, choices=[2, 3, 4],
+                        help='snakes per match (default: 2)')
+    parser.add_argument('--max-ticks', type=int, default=5000,
+                        help='tick limit per match (default: 5000)')
+    parser.add_argument('--seed', type=int, default=0, help='base seed (default: 0)')
+    parser.add_argument('--grid', type=int, default=GRID_COUNT,
+                        help=f'board size in cells (default: {GRID_COUNT})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    if len(args.policies) < args.players:
+        print(f"ERROR: need at least {args.players} policies")
+        sys.exit(1)
+
+    if args.grid < 12:
+        print("ERROR: --grid must be at least 12 to fit the spawn points")
+        sys.exit(1)
+
+    tasks = build_tasks(args.policies, args.games, args.players,
+                        args.seed, args.max_ticks, args.grid)
+    print(f"Running {len(tasks)} matches on {args.workers} worker(s)...")
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = pool.map(play_match, tasks, chunksize=max(1, len(tasks) // (4 * args.workers)))
+    wall_time = time.perf_counter() - start
+
+    total_ticks = sum(max(seat[4] for seat in match) for match in results)
+    print_report(summarize(results), wall_time, total_ticks)
+
+
+if __name__ == '__main__':
+    main()